@@ -1,16 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Response, Form
-from fastapi.responses import StreamingResponse
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import Session, sessionmaker
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    File,
+    UploadFile,
+    Request,
+    Response,
+    Form,
+)
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import text
+from sqlalchemy.orm import Session
 from typing import List, Optional
+from pydantic import TypeAdapter
+import numpy as np
 import pandas as pd
 import io
+import itertools
 import json
+import math
 import datetime
 import sqlite3
 import ast
+import copy
 import operator
 import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from urllib.parse import unquote
+from concurrent.futures import ThreadPoolExecutor
 
 from . import crud, project_db, schemas, models
 from .database import SessionLocal
@@ -104,80 +126,270 @@ def _try_parse_float(value) -> Optional[float]:
         return None
 
 
-def _safe_eval_numeric_expr(expr: str, variables: dict) -> Optional[float]:
-    """Safely evaluate a numeric expression using only arithmetic + variables.
+FORMULA_CACHE_SIZE = 2048
 
-    Supported:
-      - numbers (int/float)
-      - variables: NAME
-      - operators: + - * / // % ** and unary + -
-      - parentheses
+# formula text -> (evaluate(variables) -> Optional[float], free variable names,
+#                  validated expression node or None, constant value or None)
+_formula_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_formula_cache_lock = threading.Lock()
+
+
+def _never_evaluates(variables) -> None:
+    return None
+
+
+def _compile_numeric_expr(expr: str) -> tuple:
+    """Validate a formula once and build closures that evaluate it.
+
+    Same rules as `_safe_eval_numeric_expr`: anything outside numbers, names and
+    the `_ALLOWED_BINOPS`/`_ALLOWED_UNARYOPS` operators can never produce a value,
+    so such formulas compile to a function that always returns None.
     """
 
     expr = (expr or "").strip()
     if expr.startswith("="):
         expr = expr[1:].strip()
     if not expr:
-        return None
+        return _never_evaluates, (), None, None
 
     direct = _try_parse_float(expr)
     if direct is not None:
-        return direct
+        return (lambda variables: direct), (), None, direct
 
     try:
         tree = ast.parse(expr, mode="eval")
     except Exception:
-        return None
+        return _never_evaluates, (), None, None
 
-    def _eval(node):
-        if isinstance(node, ast.Expression):
-            return _eval(node.body)
+    names = []
 
+    def _build(node):
         if isinstance(node, ast.Constant):
-            if isinstance(node.value, (int, float)):
-                return float(node.value)
-            return None
-
-        if isinstance(node, ast.Num):  # py<3.8
-            return float(node.n)
+            if not isinstance(node.value, (int, float)):
+                return None
+            value = float(node.value)
+            return lambda variables: value
 
         if isinstance(node, ast.Name):
             name = node.id
-            if name not in variables:
-                return None
-            val = variables.get(name)
-            return _try_parse_float(val)
+            if name not in names:
+                names.append(name)
+
+            def _name(variables):
+                if name not in variables:
+                    return None
+                return _try_parse_float(variables.get(name))
+
+            return _name
 
         if isinstance(node, ast.UnaryOp):
             op = _ALLOWED_UNARYOPS.get(type(node.op))
-            if not op:
-                return None
-            v = _eval(node.operand)
-            if v is None:
+            operand = _build(node.operand) if op else None
+            if operand is None:
                 return None
-            return float(op(v))
+
+            def _unary(variables):
+                v = operand(variables)
+                if v is None:
+                    return None
+                return float(op(v))
+
+            return _unary
 
         if isinstance(node, ast.BinOp):
             op = _ALLOWED_BINOPS.get(type(node.op))
-            if not op:
-                return None
-            left = _eval(node.left)
-            right = _eval(node.right)
-            if left is None or right is None:
-                return None
-            try:
-                return float(op(left, right))
-            except Exception:
+            left = _build(node.left) if op else None
+            right = _build(node.right) if left else None
+            if right is None:
                 return None
 
-        return None
+            def _binop(variables):
+                lv = left(variables)
+                rv = right(variables)
+                if lv is None or rv is None:
+                    return None
+                try:
+                    return float(op(lv, rv))
+                except Exception:
+                    return None
+
+            return _binop
 
-    result = _eval(tree)
-    if result is None:
-        return None
-    if isinstance(result, float) and (result != result):
         return None
-    return float(result)
+
+    body = _build(tree.body)
+    if body is None:
+        return _never_evaluates, (), None, None
+
+    def _evaluate(variables):
+        result = body(variables)
+        if result is None or result != result:
+            return None
+        return result
+
+    return _evaluate, tuple(names), tree.body, None
+
+
+def _compiled_numeric_expr(expr: str) -> tuple:
+    """`_compile_numeric_expr` through a bounded LRU keyed by formula text."""
+    key = expr or ""
+    with _formula_cache_lock:
+        compiled = _formula_cache.get(key)
+        if compiled is not None:
+            _formula_cache.move_to_end(key)
+            return compiled
+
+    compiled = _compile_numeric_expr(key)
+    with _formula_cache_lock:
+        _formula_cache[key] = compiled
+        _formula_cache.move_to_end(key)
+        while len(_formula_cache) > FORMULA_CACHE_SIZE:
+            _formula_cache.popitem(last=False)
+    return compiled
+
+
+def _safe_eval_numeric_expr(expr: str, variables: dict) -> Optional[float]:
+    """Safely evaluate a numeric expression using only arithmetic + variables.
+
+    Supported:
+      - numbers (int/float)
+      - variables: NAME
+      - operators: + - * / // % ** and unary + -
+      - parentheses
+
+    The formula is parsed and validated once per text (`_compiled_numeric_expr`).
+    """
+
+    return _compiled_numeric_expr(expr)[0](variables)
+
+
+# 벡터화되는 연산. 나머지(**)는 파이썬 연산을 원소별로 적용해 예외/결과를 스칼라와 맞춘다.
+_BATCH_BINOPS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.FloorDiv: np.floor_divide,
+    ast.Mod: np.remainder,
+}
+_BATCH_ZERO_DIVISION_BINOPS = (ast.Div, ast.FloorDiv, ast.Mod)
+
+
+def _batch_variable_column(raw_values, size: int):
+    # 숫자/숫자 문자열은 NumPy 변환이 _try_parse_float 와 같다 (bytes 만 다름)
+    kinds = set(map(type, raw_values))
+    if not kinds & {bytes, bytearray}:
+        try:
+            values = np.array(raw_values, dtype=np.float64)
+        except (TypeError, ValueError):
+            values = None
+        if values is not None and values.shape == (size,):
+            if type(None) not in kinds:
+                return values, np.ones(size, dtype=bool)
+            ok = np.fromiter(
+                map(operator.is_not, raw_values, itertools.repeat(None)),
+                dtype=bool,
+                count=size,
+            )
+            return values, ok
+
+    parsed = [_try_parse_float(v) for v in raw_values]
+    ok = np.fromiter((v is not None for v in parsed), dtype=bool, count=size)
+    values = np.fromiter(
+        (v if v is not None else np.nan for v in parsed), dtype=np.float64, count=size
+    )
+    return values, ok
+
+
+def _batch_eval_node(node, columns: dict, size: int):
+    """(values, ok) for a node validated by `_compile_numeric_expr`."""
+    if isinstance(node, ast.Constant):
+        return np.full(size, float(node.value)), np.ones(size, dtype=bool)
+
+    if isinstance(node, ast.Name):
+        return columns[node.id]
+
+    if isinstance(node, ast.UnaryOp):
+        values, ok = _batch_eval_node(node.operand, columns, size)
+        op = _ALLOWED_UNARYOPS[type(node.op)]
+        return op(values), ok
+
+    op_type = type(node.op)
+    left, left_ok = _batch_eval_node(node.left, columns, size)
+    right, right_ok = _batch_eval_node(node.right, columns, size)
+    ok = left_ok & right_ok
+    np_op = _BATCH_BINOPS.get(op_type)
+    if np_op is not None:
+        if op_type in _BATCH_ZERO_DIVISION_BINOPS:
+            ok &= right != 0
+        with np.errstate(all="ignore"):
+            return np_op(left, right), ok
+
+    # 음수의 분수 거듭제곱(complex), 0의 음수 거듭제곱, overflow 는 스칼라처럼 None
+    op = _ALLOWED_BINOPS[op_type]
+    values = np.full(size, np.nan)
+    left_list = left.tolist()
+    right_list = right.tolist()
+    for i in np.flatnonzero(ok).tolist():
+        try:
+            values[i] = float(op(left_list[i], right_list[i]))
+        except Exception:
+            ok[i] = False
+    return values, ok
+
+
+def _eval_numeric_expr_batch(expr: str, columns: dict, size: int):
+    """Evaluate one formula for `size` rows of variables with NumPy.
+
+    `columns` maps a variable name to `size` raw values (None or missing name =
+    variable not set). Returns (values, ok): where ok[i] is True, values[i] equals
+    `_safe_eval_numeric_expr(expr, row i)`; where it is False that call returns None
+    and values[i] is NaN.
+    """
+
+    _evaluate, names, node, direct = _compiled_numeric_expr(expr)
+    if direct is not None:
+        return np.full(size, direct), np.ones(size, dtype=bool)
+    if node is None:
+        return np.full(size, np.nan), np.zeros(size, dtype=bool)
+
+    empty_column = (np.full(size, np.nan), np.zeros(size, dtype=bool))
+    parsed_columns = {
+        name: (
+            _batch_variable_column(columns[name], size)
+            if columns.get(name) is not None
+            else empty_column
+        )
+        for name in names
+    }
+    values, ok = _batch_eval_node(node, parsed_columns, size)
+    values = np.asarray(values, dtype=np.float64)
+    ok = ok & ~np.isnan(values)
+    values[~ok] = np.nan
+    return values, ok
+
+
+def _eval_numeric_exprs(items) -> List[Optional[float]]:
+    """`_safe_eval_numeric_expr` over [(formula, variables), ...], batched per formula text."""
+    indexes_by_formula = {}
+    for index, expr in enumerate(map(operator.itemgetter(0), items)):
+        indexes_by_formula.setdefault(expr, []).append(index)
+    all_values = np.full(len(items), np.nan)
+    all_ok = np.zeros(len(items), dtype=bool)
+    for expr, indexes in indexes_by_formula.items():
+        names = _compiled_numeric_expr(expr)[1]
+        group_variables = [items[i][1] for i in indexes]
+        columns = {
+            name: list(map(operator.methodcaller("get", name), group_variables))
+            for name in names
+        }
+        values, ok = _eval_numeric_expr_batch(expr, columns, len(indexes))
+        all_values[indexes] = values
+        all_ok[indexes] = ok
+    return [
+        value if is_ok else None
+        for value, is_ok in zip(all_values.tolist(), all_ok.tolist())
+    ]
 
 
 def get_project_db_session(project_identifier: str):
@@ -185,20 +397,12 @@ def get_project_db_session(project_identifier: str):
         db_path = project_db.resolve_project_db_path(project_identifier)
     except (FileNotFoundError, ValueError) as exc:
         raise HTTPException(status_code=404, detail=str(exc))
-    project_db.ensure_extra_tables(db_path)
-    project_engine = create_engine(
-        f"sqlite:///{db_path.as_posix()}",
-        connect_args={"check_same_thread": False},
-    )
-    ProjectSessionLocal = sessionmaker(
-        autocommit=False, autoflush=False, bind=project_engine
-    )
+    ProjectSessionLocal = project_db.get_project_sessionmaker(db_path)
     db = ProjectSessionLocal()
     try:
         yield db
     finally:
         db.close()
-        project_engine.dispose()
 
 
 router = APIRouter()
@@ -262,17 +466,184 @@ def create_work_master(
     return crud.create_work_master(db=db, work_master=work_master)
 
 
+WORK_MASTER_LIST_MAX_LIMIT = 5000
+
+# 목록 응답 필드 = work_masters 컬럼 + standard_items. fields 미지정 시 전체(기존 응답과 동일)
+_WORK_MASTER_LIST_COLUMNS = tuple(
+    field
+    for field in schemas.WorkMasterListRow.model_fields
+    if field != "standard_items"
+)
+_WORK_MASTER_LIST_FIELDS = _WORK_MASTER_LIST_COLUMNS + ("standard_items",)
+
+
+def _parse_work_master_fields(fields: Optional[str]) -> List[str]:
+    if fields is None or not str(fields).strip():
+        return list(_WORK_MASTER_LIST_FIELDS)
+    requested = [f.strip() for f in str(fields).split(",") if f.strip()]
+    unknown = [f for f in requested if f not in _WORK_MASTER_LIST_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    # id는 커서 계산에 필요하므로 항상 포함
+    selected = ["id"] + [f for f in requested if f != "id"]
+    return list(dict.fromkeys(selected))
+
+
+def _standard_items_by_work_master_id(db: Session, work_master_ids) -> dict:
+    out = {}
+    for chunk in _chunked(list(work_master_ids)):
+        placeholders = ", ".join(f":id{i}" for i in range(len(chunk)))
+        rows = db.execute(
+            text(
+                f"""
+                SELECT a.work_master_id, si.id, si.name, si.type, si.parent_id, si.derive_from
+                FROM standard_item_work_master_association a
+                JOIN standard_items si ON si.id = a.standard_item_id
+                WHERE a.work_master_id IN ({placeholders})
+                ORDER BY a.rowid
+                """
+            ),
+            {f"id{i}": wm_id for i, wm_id in enumerate(chunk)},
+        ).all()
+        for wm_id, si_id, name, si_type, parent_id, derive_from in rows:
+            out.setdefault(int(wm_id), []).append(
+                {
+                    "id": si_id,
+                    "name": name,
+                    "type": si_type,
+                    "parent_id": parent_id,
+                    "derive_from": derive_from,
+                }
+            )
+    return out
+
+
+def _list_work_masters(
+    db: Session,
+    response: Response,
+    skip: int,
+    limit: Optional[int],
+    search: Optional[str],
+    cursor: Optional[int],
+    fields: Optional[str],
+    filters: dict,
+) -> List[dict]:
+    """
+    WorkMaster 목록 (id 오름차순, search 가 있으면 검색 순위순).
+
+    - cursor: 이전 페이지의 X-Next-Cursor 값. 지정하면 id > cursor 로 이어서 조회(skip 무시).
+    - fields: 반환할 필드 콤마 목록 (예: fields=id,work_master_code,gauge,uom1).
+      standard_items 가 없으면 연결 표준항목 조회를 생략한다.
+    - filters: discipline / cat_*_code / new_old_code 일치 조건.
+    - 응답 헤더(search 없을 때): X-Total-Count (필터 기준 전체 건수), X-Next-Cursor (다음 페이지가 있을 때만).
+    """
+    selected = _parse_work_master_fields(fields)
+    columns = [f for f in selected if f != "standard_items"]
+    filters = {
+        column: value
+        for column, value in ((k, _coerce_str(v)) for k, v in filters.items())
+        if value is not None
+    }
+    if limit is not None:
+        limit = max(1, min(int(limit), WORK_MASTER_LIST_MAX_LIMIT))
+
+    if search:
+        if cursor is not None:
+            raise HTTPException(
+                status_code=400, detail="search 와 cursor 는 함께 사용할 수 없습니다."
+            )
+        work_masters = crud.get_work_masters(
+            db, skip=skip, limit=limit, search=search, filters=filters
+        )
+        output = [{col: getattr(wm, col) for col in columns} for wm in work_masters]
+    else:
+        conditions = [f"{column} = :{column}" for column in filters]
+        params = dict(filters)
+        filter_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        page_conditions = list(conditions)
+        page_params = dict(params)
+        if cursor is not None:
+            page_conditions.append("id > :cursor")
+            page_params["cursor"] = int(cursor)
+            if limit is None:
+                limit = WORK_MASTER_LIST_MAX_LIMIT
+            page_sql = "LIMIT :limit"
+        else:
+            page_params["offset"] = max(0, int(skip or 0))
+            page_sql = "LIMIT :limit OFFSET :offset"
+        page_params["limit"] = -1 if limit is None else limit
+        page_where_sql = (
+            f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+        )
+
+        output = [
+            dict(row)
+            for row in db.execute(
+                text(
+                    f"""
+                SELECT {', '.join(f"{col} AS {col}" for col in columns)}
+                FROM work_masters
+                {page_where_sql}
+                ORDER BY id
+                {page_sql}
+                """
+                ),
+                page_params,
+            ).mappings()
+        ]
+
+        total = int(
+            db.execute(
+                text(f"SELECT COUNT(*) FROM work_masters {filter_sql}"), params
+            ).scalar()
+            or 0
+        )
+        response.headers["X-Total-Count"] = str(total)
+        if limit is not None and len(output) == limit:
+            response.headers["X-Next-Cursor"] = str(output[-1]["id"])
+
+    if "standard_items" in selected:
+        standard_items = _standard_items_by_work_master_id(
+            db, [row["id"] for row in output]
+        )
+        for row in output:
+            row["standard_items"] = standard_items.get(row["id"], [])
+    return output
+
+
 @router.get(
-    "/work-masters/", response_model=List[schemas.WorkMaster], tags=["Work Masters"]
+    "/work-masters/",
+    response_model=List[schemas.WorkMasterListRow],
+    response_model_exclude_unset=True,
+    tags=["Work Masters"],
 )
 def read_work_masters(
+    response: Response,
     skip: int = 0,
     limit: int = None,
     search: Optional[str] = None,
+    cursor: Optional[int] = None,
+    fields: Optional[str] = None,
+    discipline: Optional[str] = None,
+    cat_large_code: Optional[str] = None,
+    cat_mid_code: Optional[str] = None,
+    cat_small_code: Optional[str] = None,
+    new_old_code: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
-    work_masters = crud.get_work_masters(db, skip=skip, limit=limit, search=search)
-    return work_masters
+    filters = {
+        "discipline": discipline,
+        "cat_large_code": cat_large_code,
+        "cat_mid_code": cat_mid_code,
+        "cat_small_code": cat_small_code,
+        "new_old_code": new_old_code,
+    }
+    return _list_work_masters(
+        db, response, skip, limit, search, cursor, fields, filters
+    )
 
 
 @router.get(
@@ -290,6 +661,243 @@ def read_work_master(
     return db_work_master
 
 
+# ===================
+#  xlsx import readers
+# ===================
+def _xlsx_fast_engine() -> Optional[str]:
+    """"calamine" when python-calamine is installed, else None."""
+
+    try:
+        import python_calamine  # noqa: F401
+    except Exception:
+        return None
+    return "calamine"
+
+
+def _read_xlsx_sheet_values(
+    xlsx_bytes: bytes, sheet_name: Optional[str] = None, data_only: bool = True
+) -> Optional[list]:
+    """Row value tuples of a sheet (default: the first), read with openpyxl
+    read_only/values_only streaming; None when the sheet does not exist.
+
+    Rows start at row 1 and are only as wide as their last non-empty cell; missing
+    rows come through empty.
+    """
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(
+        io.BytesIO(xlsx_bytes), read_only=True, data_only=data_only, keep_links=False
+    )
+    try:
+        if sheet_name is None:
+            ws = wb.worksheets[0]
+        elif sheet_name in wb.sheetnames:
+            ws = wb[sheet_name]
+        else:
+            return None
+        # don't trust the stored <dimension>; read every row/cell actually present
+        ws.reset_dimensions()
+        return list(ws.iter_rows(values_only=True))
+    finally:
+        wb.close()
+
+
+def _read_xlsx_calamine_values(xlsx_bytes: bytes) -> list:
+    """Row values of the first sheet read with python-calamine, as openpyxl yields them.
+
+    Date-only cells become datetimes and durations stay `datetime.timedelta`
+    (pandas' calamine engine turns them into Timestamp/Timedelta, whose str()
+    differs from read_excel's default openpyxl engine, e.g. "0 days 05:00:00").
+    """
+
+    from python_calamine import CalamineWorkbook
+
+    workbook = CalamineWorkbook.from_filelike(io.BytesIO(xlsx_bytes))
+    rows = workbook.get_sheet_by_index(0).to_python(skip_empty_area=False)
+    for row in rows:
+        for index, value in enumerate(row):
+            if isinstance(value, datetime.date) and not isinstance(
+                value, datetime.datetime
+            ):
+                row[index] = datetime.datetime(value.year, value.month, value.day)
+    return rows
+
+
+_XLSX_ERROR_CODES = frozenset(
+    ("#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#N/A")
+)
+
+
+def _pandas_excel_cell(value):
+    # same conversion as pandas' openpyxl engine (_convert_cell)
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        as_int = int(value) if math.isfinite(value) else None
+        return as_int if as_int == value else float(value)
+    if isinstance(value, str) and value in _XLSX_ERROR_CODES:
+        return float("nan")
+    return value
+
+
+def _read_excel_str_frame(
+    contents: bytes, header: int, engine: Optional[str] = None
+) -> "pd.DataFrame":
+    """Equivalent of pd.read_excel(contents, header=header, dtype=str) for sheet 0.
+
+    Reads the cells with python-calamine when available, otherwise streams the sheet
+    with openpyxl values_only; either way the rows go through pandas' TextParser,
+    which applies the same header/NA/str handling as read_excel.
+    """
+
+    from pandas.io.parsers import TextParser
+
+    engine = engine or _xlsx_fast_engine() or "openpyxl"
+    if engine == "calamine":
+        rows = _read_xlsx_calamine_values(contents)
+    else:
+        rows = _read_xlsx_sheet_values(contents)
+    data = []
+    last_row_with_data = -1
+    for row_number, row in enumerate(rows):
+        values = [_pandas_excel_cell(v) for v in row]
+        while values and values[-1] == "":
+            values.pop()
+        if values:
+            last_row_with_data = row_number
+        data.append(values)
+    data = data[: last_row_with_data + 1]
+    if not data:
+        return pd.DataFrame()
+    max_width = max(len(values) for values in data)
+    data = [values + [""] * (max_width - len(values)) for values in data]
+    return TextParser(data, header=header, dtype=str, skip_blank_lines=False).read()
+
+
+_WORK_MASTER_UPLOAD_FIELDS = list(schemas.WorkMasterCreate.model_fields.keys())
+
+
+def _upsert_work_masters_from_excel(
+    db: Session, contents: bytes, resolve_calc_results: bool = False
+) -> dict:
+    """Upsert WorkMaster rows from an uploaded master sheet by work_master_code.
+
+    Existing rows are loaded once (lowest id per code, as the per-row lookup did),
+    diffed against the sheet with pandas, and written with one executemany INSERT and
+    one executemany UPDATE in a single transaction. A code repeated in the sheet is
+    applied once with its last row's values. Fully blank rows are dropped; rows with
+    data but no work_master_code are skipped and reported by sheet row number. With
+    resolve_calc_results (project DBs), code-only calc_result rows for the created
+    codes are resolved in the same transaction.
+    """
+
+    timing = {}
+    started = time.perf_counter()
+    header_row = 3
+    # 4번째 행(header=3)을 컬럼명으로 읽고, 모든 데이터를 문자열(str)로 강제 변환
+    try:
+        df = _read_excel_str_frame(contents, header=header_row)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid .xlsx file: {e}")
+    # 엑셀 컬럼 개수와 모델 필드 개수가 다를 수 있으므로 모델 필드 개수만큼만 순서대로 매핑
+    num_columns_to_use = min(len(df.columns), len(_WORK_MASTER_UPLOAD_FIELDS))
+    df = df.iloc[:, :num_columns_to_use]
+    df.columns = _WORK_MASTER_UPLOAD_FIELDS[:num_columns_to_use]
+    timing["read_ms"] = round((time.perf_counter() - started) * 1000.0, 1)
+
+    started = time.perf_counter()
+    columns = list(df.columns)
+    if "work_master_code" not in columns:
+        raise HTTPException(
+            status_code=400, detail="Excel에 work_master_code 컬럼이 없습니다."
+        )
+    df = df.astype(object).where(df.notna(), None)
+    # 빈 행은 버리고, 값은 있는데 코드가 없는 행은 건너뛴 뒤 엑셀 행 번호로 알려준다
+    df = df[df.notna().any(axis=1)]
+    missing_code = df["work_master_code"].isna()
+    # 데이터 첫 행 = header 다음 행 (엑셀 행 번호는 1부터)
+    skipped_rows = [int(i) + header_row + 2 for i in df.index[missing_code]]
+    df = df[~missing_code].reset_index(drop=True)
+
+    # last row per code wins, in order of first appearance
+    codes_in_order = df["work_master_code"].drop_duplicates(keep="first")
+    df = (
+        df.drop_duplicates("work_master_code", keep="last")
+        .set_index("work_master_code")
+        .reindex(codes_in_order.to_numpy())
+        .reset_index()
+    )
+
+    value_columns = [c for c in columns if c != "work_master_code"]
+    select_cols = ", ".join(["id", "work_master_code", *value_columns])
+    existing = pd.DataFrame(
+        db.execute(
+            text(
+                f"SELECT {select_cols} FROM work_masters "
+                "WHERE id IN (SELECT MIN(id) FROM work_masters "
+                "WHERE work_master_code IS NOT NULL GROUP BY work_master_code)"
+            )
+        ).all(),
+        columns=["id", "work_master_code", *value_columns],
+        dtype=object,
+    )
+    merged = df.merge(
+        existing, on="work_master_code", how="left", suffixes=("", "__db")
+    )
+    is_new = merged["id"].isna()
+    incoming = merged[value_columns]
+    current = merged[[f"{c}__db" for c in value_columns]].set_axis(
+        value_columns, axis=1
+    )
+    same = (incoming.eq(current) | (incoming.isna() & current.isna())).all(axis=1)
+    to_create = merged.loc[is_new, columns]
+    to_update = merged.loc[~is_new & ~same, ["id", *value_columns]]
+    timing["diff_ms"] = round((time.perf_counter() - started) * 1000.0, 1)
+
+    started = time.perf_counter()
+    try:
+        if not to_create.empty:
+            db.execute(
+                text(
+                    f"INSERT INTO work_masters ({', '.join(columns)}) "
+                    f"VALUES ({', '.join(':' + c for c in columns)})"
+                ),
+                to_create.to_dict(orient="records"),
+            )
+        if not to_update.empty and value_columns:
+            to_update = to_update.assign(id=to_update["id"].astype(int))
+            db.execute(
+                text(
+                    "UPDATE work_masters SET "
+                    + ", ".join(f"{c} = :{c}" for c in value_columns)
+                    + " WHERE id = :id"
+                ),
+                to_update.to_dict(orient="records"),
+            )
+        if resolve_calc_results and not to_create.empty:
+            _backfill_calc_result_work_master_ids(
+                db, to_create["work_master_code"].tolist()
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    timing["write_ms"] = round((time.perf_counter() - started) * 1000.0, 1)
+
+    return {
+        "message": "Work Masters uploaded successfully",
+        "created": int(len(to_create.index)),
+        "updated": int(len(to_update.index)),
+        "unchanged": int((~is_new & same).sum()),
+        "skipped": len(skipped_rows),
+        "skipped_rows": skipped_rows,
+        "timing_ms": timing,
+    }
+
+
 @router.post(
     "/work-masters/upload",
     summary="Upload and upsert Work Masters from Excel",
@@ -303,46 +911,11 @@ async def upload_work_masters(
             status_code=400, detail="Invalid file type. Please upload an .xlsx file."
         )
 
-    created_count = 0
-    updated_count = 0
-
     try:
         contents = await file.read()
-        # 1. 4번째 행(header=3)을 컬럼명으로 읽고, 모든 데이터를 문자열(str)로 강제 변환합니다.
-        df = pd.read_excel(io.BytesIO(contents), header=3, dtype=str)
-
-        # 2. Pydantic 모델에 정의된 필드 이름을 순서대로 가져옵니다.
-        model_fields = list(schemas.WorkMasterCreate.model_fields.keys())
-
-        # 3. 엑셀 컬럼 개수와 모델 필드 개수가 다를 경우를 대비해, 모델 필드 개수만큼만 사용합니다.
-        num_columns_to_use = min(len(df.columns), len(model_fields))
-        df = df.iloc[:, :num_columns_to_use]
-        df.columns = model_fields[:num_columns_to_use]
-
-        for _, row in df.iterrows():
-            # NaN 값을 None으로 변환하여 Pydantic 유효성 검사 통과
-            row_data = row.where(pd.notna(row), None).to_dict()
-            work_master_in = schemas.WorkMasterCreate(
-                **row_data
-            )  # 순서대로 매핑된 데이터로 객체 생성
-            db_work_master = crud.get_work_master_by_work_master_code(
-                db, code=work_master_in.work_master_code
-            )
-
-            if db_work_master:
-                crud.update_work_master(
-                    db, db_work_master=db_work_master, work_master_in=work_master_in
-                )
-                updated_count += 1
-            else:
-                crud.create_work_master(db, work_master=work_master_in)
-                created_count += 1
-
-        return {
-            "message": "Work Masters uploaded successfully",
-            "created": created_count,
-            "updated": updated_count,
-        }
+        return _upsert_work_masters_from_excel(db, contents)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"An error occurred while processing the file: {e}"
@@ -372,17 +945,35 @@ def update_work_master(
 
 @router.get(
     "/project/{project_identifier}/work-masters/",
-    response_model=List[schemas.WorkMaster],
+    response_model=List[schemas.WorkMasterListRow],
+    response_model_exclude_unset=True,
     tags=["Project Data"],
 )
 def read_project_work_masters(
     project_identifier: str,
+    response: Response,
     skip: int = 0,
     limit: int = None,
     search: Optional[str] = None,
+    cursor: Optional[int] = None,
+    fields: Optional[str] = None,
+    discipline: Optional[str] = None,
+    cat_large_code: Optional[str] = None,
+    cat_mid_code: Optional[str] = None,
+    cat_small_code: Optional[str] = None,
+    new_old_code: Optional[str] = None,
     db: Session = Depends(get_project_db_session),
 ):
-    return crud.get_work_masters(db, skip=skip, limit=limit, search=search)
+    filters = {
+        "discipline": discipline,
+        "cat_large_code": cat_large_code,
+        "cat_mid_code": cat_mid_code,
+        "cat_small_code": cat_small_code,
+        "new_old_code": new_old_code,
+    }
+    return _list_work_masters(
+        db, response, skip, limit, search, cursor, fields, filters
+    )
 
 
 @router.post(
@@ -403,7 +994,15 @@ def create_project_work_master(
             status_code=400,
             detail=f"WorkMaster with code '{work_master.work_master_code}' already exists",
         )
-    return crud.create_work_master(db=db, work_master=work_master)
+    try:
+        created = crud.create_work_master(db, work_master, commit=False)
+        _backfill_calc_result_work_master_ids(db, [created.work_master_code])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.refresh(created)
+    return created
 
 
 # ===================
@@ -523,38 +1122,13 @@ async def upload_project_work_masters(
             status_code=400, detail="Invalid file type. Please upload an .xlsx file."
         )
 
-    created_count = 0
-    updated_count = 0
-
     try:
         contents = await file.read()
-        df = pd.read_excel(io.BytesIO(contents), header=3, dtype=str)
-        model_fields = list(schemas.WorkMasterCreate.model_fields.keys())
-        num_columns_to_use = min(len(df.columns), len(model_fields))
-        df = df.iloc[:, :num_columns_to_use]
-        df.columns = model_fields[:num_columns_to_use]
-
-        for _, row in df.iterrows():
-            row_data = row.where(pd.notna(row), None).to_dict()
-            work_master_in = schemas.WorkMasterCreate(**row_data)
-            db_work_master = crud.get_work_master_by_work_master_code(
-                db, code=work_master_in.work_master_code
-            )
-
-            if db_work_master:
-                crud.update_work_master(
-                    db, db_work_master=db_work_master, work_master_in=work_master_in
-                )
-                updated_count += 1
-            else:
-                crud.create_work_master(db, work_master=work_master_in)
-                created_count += 1
-
-        return {
-            "message": "Work Masters uploaded successfully",
-            "created": created_count,
-            "updated": updated_count,
-        }
+        return _upsert_work_masters_from_excel(
+            db, contents, resolve_calc_results=True
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"An error occurred while processing the file: {e}"
@@ -566,27 +1140,26 @@ def import_project_report_wm_excel_bytes(
     xlsx_bytes: bytes,
     db: Session,
 ):
-    from openpyxl import load_workbook
-
     def norm(value) -> str:
         return str(value).strip() if value is not None else ""
 
+    def cell(values, col):
+        return values[col - 1] if col and col <= len(values) else None
+
     try:
-        wb = load_workbook(io.BytesIO(xlsx_bytes), data_only=False)
+        # data_only=False keeps formula text as typed in the sheet
+        rows = _read_xlsx_sheet_values(xlsx_bytes, "Report_WM", data_only=False)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid .xlsx file: {e}")
 
-    if "Report_WM" not in wb.sheetnames:
+    if rows is None:
         raise HTTPException(
             status_code=400, detail="Excel에 'Report_WM' 시트가 없습니다."
         )
-
-    ws = wb["Report_WM"]
-    max_col = int(ws.max_column or 0)
-    if max_col <= 0:
+    if not rows:
         raise HTTPException(status_code=400, detail="Report_WM 시트가 비어 있습니다.")
 
-    headers = [ws.cell(row=1, column=c).value for c in range(1, max_col + 1)]
+    headers = rows[0]
     header_to_col = {norm(h): idx + 1 for idx, h in enumerate(headers) if norm(h)}
 
     col_wm_code = header_to_col.get("WM Code")
@@ -611,54 +1184,49 @@ def import_project_report_wm_excel_bytes(
     updated_other = 0
     missing = []
 
-    max_row = int(ws.max_row or 1)
-    for r in range(2, max_row + 1):
-        wm_code = norm(ws.cell(row=r, column=col_wm_code).value)
+    # Preload matching keys once (same expressions as the per-row lookups used).
+    wm_id_by_code_gauge = {}
+    wm_ids_by_code = {}
+    for wm_id, code, gauge_key in db.execute(
+        text(
+            "SELECT id, work_master_code, UPPER(COALESCE(TRIM(gauge), '')) "
+            "FROM work_masters ORDER BY id"
+        )
+    ):
+        wm_id_by_code_gauge.setdefault((code, gauge_key), int(wm_id))
+        wm_ids_by_code.setdefault(code, []).append(int(wm_id))
+    # Fallback: if gauge-based match fails, match by code only when unique.
+    unique_wm_id_by_code = {
+        code: ids[0] for code, ids in wm_ids_by_code.items() if len(ids) == 1
+    }
+
+    spec_params = []
+    other_params = []
+    now = datetime.datetime.utcnow().isoformat()
+    for values in rows[1:]:
+        wm_code = norm(cell(values, col_wm_code))
         if not wm_code:
             continue
 
         gauge_norm = ""
         if col_gauge:
-            gauge_norm = norm(ws.cell(row=r, column=col_gauge).value).upper()
+            gauge_norm = norm(cell(values, col_gauge)).upper()
 
         spec_value = None
         if col_spec:
-            v = ws.cell(row=r, column=col_spec).value
+            v = cell(values, col_spec)
             spec_value = "" if v is None else str(v)
 
         other_value = None
         if col_other:
-            v = ws.cell(row=r, column=col_other).value
+            v = cell(values, col_other)
             other_value = "" if v is None else str(v)
 
         processed += 1
 
-        row = db.execute(
-            text(
-                """
-                SELECT id
-                FROM work_masters
-                WHERE work_master_code = :code
-                  AND UPPER(COALESCE(TRIM(gauge), '')) = :gauge
-                ORDER BY id
-                LIMIT 1
-                """
-            ),
-            {"code": wm_code, "gauge": gauge_norm},
-        ).fetchone()
-
-        work_master_id = int(row[0]) if row else None
-
-        # Fallback: if gauge-based match fails, match by code only when unique.
+        work_master_id = wm_id_by_code_gauge.get((wm_code, gauge_norm))
         if work_master_id is None:
-            rows = db.execute(
-                text(
-                    "SELECT id FROM work_masters WHERE work_master_code = :code ORDER BY id"
-                ),
-                {"code": wm_code},
-            ).fetchall()
-            if rows and len(rows) == 1:
-                work_master_id = int(rows[0][0])
+            work_master_id = unique_wm_id_by_code.get(wm_code)
 
         if work_master_id is None:
             if len(missing) < 50:
@@ -666,43 +1234,39 @@ def import_project_report_wm_excel_bytes(
             continue
 
         matched += 1
-        now = datetime.datetime.utcnow().isoformat()
 
         if col_spec is not None and spec_value is not None:
-            db.execute(
-                text("UPDATE work_masters SET add_spec = :spec WHERE id = :id"),
-                {"spec": spec_value, "id": work_master_id},
-            )
+            spec_params.append({"spec": spec_value, "id": work_master_id})
             updated_spec += 1
 
         if col_other is not None and other_value is not None:
-            current = db.execute(
-                text(
-                    "SELECT use_yn FROM work_master_precheck WHERE work_master_id = :id"
-                ),
-                {"id": work_master_id},
-            ).fetchone()
-            use_val = 1 if (current is not None and bool(current[0])) else 0
-            db.execute(
-                text(
-                    """
-                    INSERT INTO work_master_precheck (work_master_id, use_yn, other_opinion, updated_at)
-                    VALUES (:id, :use_yn, :other, :updated_at)
-                    ON CONFLICT(work_master_id)
-                    DO UPDATE SET
-                      other_opinion = excluded.other_opinion,
-                      updated_at = excluded.updated_at
-                    """
-                ),
-                {
-                    "id": work_master_id,
-                    "use_yn": use_val,
-                    "other": other_value,
-                    "updated_at": now,
-                },
+            other_params.append(
+                {"id": work_master_id, "other": other_value, "updated_at": now}
             )
             updated_other += 1
 
+    # executemany keeps the sheet order, so a WM listed twice ends with its last row.
+    if spec_params:
+        db.execute(
+            text("UPDATE work_masters SET add_spec = :spec WHERE id = :id"),
+            spec_params,
+        )
+    if other_params:
+        # use_yn only applies on insert, where there is no previous value (→ 0).
+        db.execute(
+            text(
+                """
+                INSERT INTO work_master_precheck (work_master_id, use_yn, other_opinion, updated_at)
+                VALUES (:id, 0, :other, :updated_at)
+                ON CONFLICT(work_master_id)
+                DO UPDATE SET
+                  other_opinion = excluded.other_opinion,
+                  updated_at = excluded.updated_at
+                """
+            ),
+            other_params,
+        )
+
     db.commit()
     return {
         "processed_rows": processed,
@@ -817,28 +1381,160 @@ def remove_project_work_master_gauge(
 # ===================
 #  WorkMaster Cart
 # ===================
-def _normalize_cart_payload(raw_payload):
-    def _ensure_list(value):
-        return value if isinstance(value, list) else []
+def _cart_fetchall(conn, sql: str, params: Optional[dict] = None) -> list:
+    # Session(요청) 또는 sqlite3 연결(Excel 내보내기 워커) 모두 지원
+    if isinstance(conn, Session):
+        return conn.execute(text(sql), params or {}).fetchall()
+    return conn.execute(sql, params or {}).fetchall()
 
-    revit_types = raw_payload.get("revitTypes") or raw_payload.get("revit_types") or []
-    assignment_ids = (
-        raw_payload.get("assignmentIds") or raw_payload.get("assignment_ids") or []
-    )
-    standard_item_ids = (
-        raw_payload.get("standardItemIds") or raw_payload.get("standard_item_ids") or []
+
+def _load_cart_entries(conn, entry_ids=None, keys=None) -> list:
+    """(id, created_at raw, normalized payload) per cart entry, newest first.
+
+    Lists are read from the cart_entry_* link tables in position order, so the
+    shape matches `project_db.normalize_cart_payload` without parsing JSON.
+    `entry_ids` limits the entries (None = all); `keys` limits which lists are
+    read (and present), None reads all four.
+    """
+
+    if entry_ids is not None:
+        out = []
+        for chunk in _chunked(sorted({int(v) for v in entry_ids})):
+            out.extend(_load_cart_entries_where(conn, chunk, keys))
+        out.sort(key=lambda entry: entry[0], reverse=True)
+        return out
+    return _load_cart_entries_where(conn, None, keys)
+
+
+def _load_cart_entries_where(conn, entry_ids: Optional[list], keys) -> list:
+    params = {}
+    entry_where_sql = ""
+    link_where_sql = ""
+    if entry_ids is not None:
+        if not entry_ids:
+            return []
+        placeholders = ", ".join(f":id{i}" for i in range(len(entry_ids)))
+        params = {f"id{i}": eid for i, eid in enumerate(entry_ids)}
+        entry_where_sql = f"WHERE id IN ({placeholders})"
+        link_where_sql = f"WHERE cart_entry_id IN ({placeholders})"
+
+    entries = _cart_fetchall(
+        conn,
+        f"SELECT id, formula, created_at FROM workmaster_cart_entries {entry_where_sql} ORDER BY id DESC",
+        params,
     )
-    building_names = (
-        raw_payload.get("buildingNames") or raw_payload.get("building_names") or []
+    if not entries:
+        return []
+    # 링크 테이블은 (cart_entry_id, position) 순으로 저장되어 있어 정렬 비용 없이 엔트리별로 묶인다
+    lists_by_key = {}
+    for key, table, column, _type in project_db.CART_ENTRY_LINK_TABLES:
+        if keys is not None and key not in keys:
+            continue
+        values_by_entry = {}
+        current_eid = None
+        current = None
+        for eid, value in _cart_fetchall(
+            conn,
+            f"SELECT cart_entry_id, {column} FROM {table} {link_where_sql} ORDER BY cart_entry_id, position",
+            params,
+        ):
+            if eid != current_eid:
+                current_eid = eid
+                current = values_by_entry[eid] = []
+            current.append(value)
+        lists_by_key[key] = values_by_entry
+
+    out = []
+    for eid, formula, created_raw in entries:
+        normalized = {key: values.get(eid, []) for key, values in lists_by_key.items()}
+        normalized["formula"] = formula
+        out.append((int(eid), created_raw, normalized))
+    return out
+
+
+def _parse_cart_created_at(created_raw) -> datetime.datetime:
+    try:
+        return (
+            datetime.datetime.fromisoformat(created_raw)
+            if created_raw
+            else datetime.datetime.utcnow()
+        )
+    except ValueError:
+        return datetime.datetime.utcnow()
+
+
+def _insert_cart_entry(db: Session, normalized: dict, created_at_iso: str) -> int:
+    """Insert one cart entry + link rows (no commit); returns the new id."""
+
+    db.execute(
+        text(
+            "INSERT INTO workmaster_cart_entries (payload, formula, created_at) "
+            "VALUES (:payload, :formula, :created_at)"
+        ),
+        {
+            "payload": project_db.CART_ENTRY_EMPTY_PAYLOAD,
+            "formula": normalized["formula"],
+            "created_at": created_at_iso,
+        },
     )
-    formula = raw_payload.get("formula")
-    return {
-        "revit_types": _ensure_list(revit_types),
-        "assignment_ids": _ensure_list(assignment_ids),
-        "standard_item_ids": _ensure_list(standard_item_ids),
-        "building_names": _ensure_list(building_names),
-        "formula": formula,
-    }
+    new_id = int(db.execute(text("SELECT last_insert_rowid()")).scalar())
+    _insert_cart_entry_links(db, new_id, normalized)
+    return new_id
+
+
+def _update_cart_entry_formulas(db: Session, formula_by_id: dict) -> list:
+    """Apply {entry id: formula} (no commit); returns the updated (id, created raw, normalized)."""
+
+    loaded = _load_cart_entries(db, entry_ids=formula_by_id.keys())
+    for entry_id, _created_raw, normalized in loaded:
+        normalized["formula"] = formula_by_id[entry_id]
+    if loaded:
+        db.execute(
+            text("UPDATE workmaster_cart_entries SET formula = :formula WHERE id = :entry_id"),
+            [
+                {"formula": normalized["formula"], "entry_id": entry_id}
+                for entry_id, _created_raw, normalized in loaded
+            ],
+        )
+    return loaded
+
+
+def _delete_cart_entries(db: Session, entry_ids) -> int:
+    """Delete cart entries + link rows (no commit); returns the number of entries deleted."""
+
+    deleted = 0
+    for chunk in _chunked(sorted({int(v) for v in entry_ids})):
+        placeholders = ", ".join(f":id{i}" for i in range(len(chunk)))
+        params = {f"id{i}": eid for i, eid in enumerate(chunk)}
+        for _key, table, _column, _type in project_db.CART_ENTRY_LINK_TABLES:
+            db.execute(
+                text(f"DELETE FROM {table} WHERE cart_entry_id IN ({placeholders})"),
+                params,
+            )
+        result = db.execute(
+            text(f"DELETE FROM workmaster_cart_entries WHERE id IN ({placeholders})"),
+            params,
+        )
+        deleted += int(result.rowcount or 0)
+    return deleted
+
+
+def _insert_cart_entry_links(db: Session, entry_id: int, normalized: dict) -> None:
+    rows_by_table = project_db.cart_entry_link_rows(entry_id, normalized)
+    for _key, table, column, _type in project_db.CART_ENTRY_LINK_TABLES:
+        rows = rows_by_table[table]
+        if not rows:
+            continue
+        db.execute(
+            text(
+                f"INSERT INTO {table} (cart_entry_id, position, {column}) "
+                "VALUES (:cart_entry_id, :position, :value)"
+            ),
+            [
+                {"cart_entry_id": eid, "position": position, "value": value}
+                for eid, position, value in rows
+            ],
+        )
 
 
 @router.get(
@@ -850,35 +1546,14 @@ def read_project_workmaster_cart(
     project_identifier: str,
     db: Session = Depends(get_project_db_session),
 ):
-    rows = db.execute(
-        text(
-            "SELECT id, payload, created_at FROM workmaster_cart_entries ORDER BY id DESC"
-        )
-    ).fetchall()
-    entries: List[schemas.WorkMasterCartEntry] = []
-    for row in rows:
-        try:
-            payload = json.loads(row[1] or "{}")
-        except json.JSONDecodeError:
-            payload = {}
-        normalized = _normalize_cart_payload(payload)
-        created_raw = row[2]
-        try:
-            created_at = (
-                datetime.datetime.fromisoformat(created_raw)
-                if created_raw
-                else datetime.datetime.utcnow()
-            )
-        except ValueError:
-            created_at = datetime.datetime.utcnow()
-        entries.append(
-            schemas.WorkMasterCartEntry(
-                id=row[0],
-                created_at=created_at,
-                **normalized,
-            )
+    return [
+        schemas.WorkMasterCartEntry(
+            id=entry_id,
+            created_at=_parse_cart_created_at(created_raw),
+            **normalized,
         )
-    return entries
+        for entry_id, created_raw, normalized in _load_cart_entries(db)
+    ]
 
 
 @router.post(
@@ -891,16 +1566,10 @@ def create_project_workmaster_cart_entry(
     payload: schemas.WorkMasterCartEntryCreate,
     db: Session = Depends(get_project_db_session),
 ):
-    normalized = _normalize_cart_payload(payload.model_dump())
+    normalized = project_db.normalize_cart_payload(payload.model_dump())
     now_iso = datetime.datetime.utcnow().isoformat()
-    db.execute(
-        text(
-            "INSERT INTO workmaster_cart_entries (payload, created_at) VALUES (:payload, :created_at)"
-        ),
-        {"payload": json.dumps(normalized, ensure_ascii=False), "created_at": now_iso},
-    )
+    new_id = _insert_cart_entry(db, normalized, now_iso)
     db.commit()
-    new_id = db.execute(text("SELECT last_insert_rowid()")).scalar()
     created_at = datetime.datetime.fromisoformat(now_iso)
     return schemas.WorkMasterCartEntry(id=new_id, created_at=created_at, **normalized)
 
@@ -916,38 +1585,16 @@ def update_project_workmaster_cart_entry(
     payload: schemas.WorkMasterCartEntryUpdate,
     db: Session = Depends(get_project_db_session),
 ):
-    row = db.execute(
-        text(
-            "SELECT payload, created_at FROM workmaster_cart_entries WHERE id = :entry_id"
-        ),
-        {"entry_id": entry_id},
-    ).fetchone()
-    if not row:
+    loaded = _load_cart_entries(db, entry_ids=[entry_id])
+    if not loaded:
         raise HTTPException(status_code=404, detail="Cart entry not found")
-    try:
-        current_payload = json.loads(row[0] or "{}")
-    except json.JSONDecodeError:
-        current_payload = {}
     if payload.formula is not None:
-        current_payload["formula"] = payload.formula
-    normalized = _normalize_cart_payload(current_payload)
-    db.execute(
-        text(
-            "UPDATE workmaster_cart_entries SET payload = :payload WHERE id = :entry_id"
-        ),
-        {"payload": json.dumps(normalized, ensure_ascii=False), "entry_id": entry_id},
+        loaded = _update_cart_entry_formulas(db, {entry_id: payload.formula})
+        db.commit()
+    _, created_raw, normalized = loaded[0]
+    return schemas.WorkMasterCartEntry(
+        id=entry_id, created_at=_parse_cart_created_at(created_raw), **normalized
     )
-    db.commit()
-    created_raw = row[1]
-    try:
-        created_at = (
-            datetime.datetime.fromisoformat(created_raw)
-            if created_raw
-            else datetime.datetime.utcnow()
-        )
-    except ValueError:
-        created_at = datetime.datetime.utcnow()
-    return schemas.WorkMasterCartEntry(id=entry_id, created_at=created_at, **normalized)
 
 
 @router.delete(
@@ -959,16 +1606,85 @@ def delete_project_workmaster_cart_entry(
     entry_id: int,
     db: Session = Depends(get_project_db_session),
 ):
-    result = db.execute(
-        text("DELETE FROM workmaster_cart_entries WHERE id = :entry_id"),
-        {"entry_id": entry_id},
-    )
+    deleted = _delete_cart_entries(db, [entry_id])
     db.commit()
-    if result.rowcount == 0:
+    if deleted == 0:
         raise HTTPException(status_code=404, detail="Cart entry not found")
     return {"ok": True}
 
 
+@router.post(
+    "/project/{project_identifier}/workmaster-cart/batch",
+    response_model=schemas.WorkMasterCartBatchResponse,
+    tags=["Project Data"],
+)
+def batch_project_workmaster_cart(
+    project_identifier: str,
+    payload: schemas.WorkMasterCartBatchRequest,
+    db: Session = Depends(get_project_db_session),
+):
+    """
+    장바구니 생성/수정/삭제를 한 트랜잭션으로 적용 (삭제 → 수정 → 생성 순).
+
+    - 없는 id 삭제는 건너뛰고(deleted 에 미포함), 없는 id 수정은 404 로 전체를 되돌린다.
+    - created_ids / created 는 요청의 creates 순서와 같다.
+    """
+    try:
+        deleted = _delete_cart_entries(db, payload.deletes) if payload.deletes else 0
+
+        updated = []
+        formula_by_id = {
+            update.id: update.formula
+            for update in payload.updates
+            if update.formula is not None
+        }
+        if payload.updates:
+            update_ids = {update.id for update in payload.updates}
+            if formula_by_id:
+                updated = _update_cart_entry_formulas(db, formula_by_id)
+            found = {entry_id for entry_id, _, _ in updated}
+            missing = update_ids - found
+            if missing:
+                found.update(
+                    entry_id
+                    for entry_id, _, _ in _load_cart_entries(
+                        db, entry_ids=missing, keys=()
+                    )
+                )
+            if update_ids - found:
+                raise HTTPException(status_code=404, detail="Cart entry not found")
+
+        now_iso = datetime.datetime.utcnow().isoformat()
+        created_at = datetime.datetime.fromisoformat(now_iso)
+        created = []
+        for create in payload.creates:
+            normalized = project_db.normalize_cart_payload(create.model_dump())
+            new_id = _insert_cart_entry(db, normalized, now_iso)
+            created.append(
+                schemas.WorkMasterCartEntry(
+                    id=new_id, created_at=created_at, **normalized
+                )
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return schemas.WorkMasterCartBatchResponse(
+        created_ids=[entry.id for entry in created],
+        created=created,
+        updated=[
+            schemas.WorkMasterCartEntry(
+                id=entry_id,
+                created_at=_parse_cart_created_at(created_raw),
+                **normalized,
+            )
+            for entry_id, created_raw, normalized in updated
+        ],
+        deleted=deleted,
+    )
+
+
 # ===================
 #   StandardItem
 # ===================
@@ -1161,569 +1877,732 @@ def get_project_work_master_selection_summary(
     return {"rows": rows}
 
 
-@router.get(
-    "/project/{project_identifier}/export/dynamo-json",
-    response_model=schemas.DynamoProjectExportPayload,
-    response_model_by_alias=True,
-    tags=["Project Data"],
-)
-def export_project_db_for_dynamo(
-    project_identifier: str,
-    response: Response,
-    db: Session = Depends(get_project_db_session),
-):
-    """Dynamo 테스트를 위한 프로젝트 DB JSON 추출 엔드포인트.
+# ===================
+#  Dynamo export
+# ===================
+_SQLITE_IN_CHUNK_SIZE = 900
 
-    - 추후에는 "파일 다운로드" 대신 Dynamo가 직접 참조하는 라우터로 사용 가능
+
+def _coerce_int(value) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        if value.isdigit():
+            return int(value)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _chunked(values, size: int = _SQLITE_IN_CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _ancestor_path(node_id, parent_by_id: dict, known_only: bool) -> list:
+    """Root-first id path for node_id (cycle-safe).
+
+    known_only=False keeps an id that is missing from parent_by_id as the topmost
+    element (StandardItem walk); known_only=True stops before it (FamilyListItem walk).
     """
 
-    buildings = crud.list_buildings(db)
-    cart_entries = read_project_workmaster_cart(
-        project_identifier=project_identifier, db=db
-    )
+    path = []
+    cursor = node_id
+    seen = set()
+    while cursor and cursor not in seen:
+        seen.add(cursor)
+        if known_only and cursor not in parent_by_id:
+            break
+        path.append(cursor)
+        cursor = parent_by_id.get(cursor)
+    path.reverse()
+    return path
+
+
+def _parse_standard_type_from_family(level2_meta):
+    if not level2_meta:
+        return (None, None)
+    seq = level2_meta.get("sequence_number")
+    name = level2_meta.get("name")
+    if seq:
+        seq = str(seq).strip() or None
+    if name:
+        name = str(name).strip() or None
+    if seq or name:
+        return (seq, name)
+
+    combined = str(level2_meta.get("name") or "").strip()
+    if not combined:
+        return (None, None)
+    import re
+
+    m = re.match(r"^\s*([0-9]+(?:\.[0-9]+)*)\s+(.+?)\s*$", combined)
+    if m:
+        return (m.group(1), m.group(2))
+    m = re.match(r"^\s*([0-9]+)\.(.+?)\s*$", combined)
+    if m:
+        return (m.group(1), m.group(2).strip())
+    return (None, combined)
+
+
+def _category_label_from_family_root(root_meta) -> Optional[str]:
+    if not root_meta:
+        return None
+    seq = root_meta.get("sequence_number")
+    name = root_meta.get("name")
+    if seq and name:
+        return f"{str(seq).strip()}.{str(name).strip()}"
+    return str(name).strip() if name else None
+
 
-    pjt_abbr = None
+def _read_project_pjt_abbr(db: Session) -> Optional[str]:
     try:
         pjt_abbr_row = db.execute(
             text("SELECT pjt_abbr FROM project_metadata ORDER BY id LIMIT 1")
         ).fetchone()
         if pjt_abbr_row and pjt_abbr_row[0]:
-            pjt_abbr = str(pjt_abbr_row[0]).strip() or None
-    except Exception:
-        pjt_abbr = None
-
-    try:
-        now = datetime.datetime.now()
-        stamp = now.strftime("%Y%m%d_%H%M%S")
-        safe_abbr = (pjt_abbr or project_identifier or "project").strip()
-        safe_abbr = (
-            safe_abbr.replace("\\", "_")
-            .replace("/", "_")
-            .replace(":", "_")
-            .replace("*", "_")
-            .replace("?", "_")
-            .replace('"', "_")
-            .replace("<", "_")
-            .replace(">", "_")
-            .replace("|", "_")
-        )
-        filename = f"Bnote_{safe_abbr}_{stamp}.json"
-        response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+            return str(pjt_abbr_row[0]).strip() or None
     except Exception:
         pass
+    return None
 
-    assignment_ids = sorted(
-        {
-            int(aid)
-            for entry in cart_entries
-            for aid in (getattr(entry, "assignment_ids", None) or [])
-            if isinstance(aid, int) or (isinstance(aid, str) and aid.isdigit())
-        }
-    )
-    standard_item_ids = sorted(
-        {
-            int(sid)
-            for entry in cart_entries
-            for sid in (getattr(entry, "standard_item_ids", None) or [])
-            if isinstance(sid, int) or (isinstance(sid, str) and sid.isdigit())
-        }
-    )
 
-    assignment_label_by_id = {}
-    assignment_family_list_id_by_id = {}
-    family_name_by_family_list_id = {}
-    family_item_meta_by_id = {}
-    assignment_standard_item_ids = set()
-    assignment_family_name_by_id = {}
-    assignment_standard_item_id_by_id = {}
-    if assignment_ids:
-        assigns = (
-            db.query(models.GwmFamilyAssign)
-            .filter(models.GwmFamilyAssign.id.in_(assignment_ids))
-            .all()
+def _export_download_filename(
+    prefix: str, project_identifier: str, pjt_abbr: Optional[str], suffix: str
+) -> str:
+    stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    safe_abbr = (pjt_abbr or project_identifier or "project").strip()
+    for ch in '\\/:*?"<>|':
+        safe_abbr = safe_abbr.replace(ch, "_")
+    return f"{prefix}_{safe_abbr}_{stamp}{suffix}"
+
+
+# 엔트리별 첫 revit_type/building_name 과 id 목록(position 순, _DYNAMO_ID_SEPARATOR 구분)을
+# 한 번에 읽는다. REAL 값은 _coerce_int 와 같게 정수로 자른다.
+_DYNAMO_ID_SEPARATOR = "\x1f"
+_DYNAMO_CART_ROWS_SQL = """
+    SELECT
+        e.id,
+        e.created_at,
+        e.formula,
+        (SELECT revit_type FROM cart_entry_revit_type
+         WHERE cart_entry_id = e.id ORDER BY position LIMIT 1),
+        (SELECT building_name FROM cart_entry_building
+         WHERE cart_entry_id = e.id ORDER BY position LIMIT 1),
+        (SELECT group_concat({id_value}, char(31)) FROM (
+            SELECT assignment_id AS value FROM cart_entry_assignment
+            WHERE cart_entry_id = e.id ORDER BY position)),
+        (SELECT group_concat({id_value}, char(31)) FROM (
+            SELECT standard_item_id AS value FROM cart_entry_standard_item
+            WHERE cart_entry_id = e.id ORDER BY position))
+    FROM workmaster_cart_entries e
+    ORDER BY e.id DESC
+""".format(
+    id_value="CASE typeof(value) WHEN 'real' THEN CAST(value AS INTEGER) ELSE value END"
+)
+
+
+def _load_dynamo_cart_rows(db: Session) -> list:
+    """Cart entries as export rows, newest first.
+
+    Each row is (id, created_at, revit_type, building_name, formula,
+    assignment_ids, standard_item_ids): the first revit type / building of the
+    entry, the formula as text and the id lists as tuples of ints. Id lists come
+    back as one separated string; those and the text values are converted once
+    per distinct value.
+    """
+
+    id_lists = {}
+    texts = {}
+
+    def _id_tuple(raw):
+        ids = id_lists.get(raw)
+        if ids is None:
+            ids = id_lists[raw] = tuple(
+                v
+                for v in map(_coerce_int, raw.split(_DYNAMO_ID_SEPARATOR) if raw else ())
+                if v is not None
+            )
+        return ids
+
+    def _text(raw):
+        if raw not in texts:
+            texts[raw] = _coerce_str(raw)
+        return texts[raw]
+
+    out = []
+    for (
+        entry_id,
+        created_raw,
+        formula,
+        revit_type,
+        building_name,
+        assignment_ids_raw,
+        standard_item_ids_raw,
+    ) in db.execute(text(_DYNAMO_CART_ROWS_SQL)).fetchall():
+        if formula is not None and not isinstance(formula, str):
+            formula = str(formula)
+        out.append(
+            (
+                int(entry_id),
+                _parse_cart_created_at(created_raw),
+                _text(revit_type),
+                _text(building_name),
+                formula,
+                _id_tuple(assignment_ids_raw),
+                _id_tuple(standard_item_ids_raw),
+            )
         )
-        for a in assigns:
-            family_name = getattr(getattr(a, "family_list_item", None), "name", None)
-            standard_item_id = getattr(a, "standard_item_id", None)
-            if standard_item_id is not None:
-                try:
-                    assignment_standard_item_ids.add(int(standard_item_id))
-                except (TypeError, ValueError):
-                    pass
-            if family_name:
-                assignment_family_name_by_id[a.id] = family_name
-            if standard_item_id is not None:
-                try:
-                    assignment_standard_item_id_by_id[a.id] = int(standard_item_id)
-                except (TypeError, ValueError):
-                    pass
-            family_list_id = getattr(a, "family_list_id", None)
-            if family_list_id is not None:
-                try:
-                    family_list_id_int = int(family_list_id)
-                except (TypeError, ValueError):
-                    family_list_id_int = None
-                if family_list_id_int is not None:
-                    assignment_family_list_id_by_id[a.id] = family_list_id_int
-                    if family_name:
-                        family_name_by_family_list_id[family_list_id_int] = family_name
+    return out
 
-    standard_item_name_by_id = {}
-    standard_item_raw_name_by_id = {}
-    standard_item_parent_id_by_id = {}
-    standard_item_type_by_id = {}
-    standard_item_ids_to_load = sorted(
-        set(standard_item_ids) | set(assignment_standard_item_ids)
-    )
-    if standard_item_ids_to_load:
-        loaded_standard_ids = set()
-        pending_standard_ids = {int(sid) for sid in standard_item_ids_to_load}
-        derive_from_by_id = {}
-        while pending_standard_ids:
-            batch_ids = sorted(pending_standard_ids - loaded_standard_ids)
-            if not batch_ids:
-                break
+
+class _DynamoExportContext:
+    """Hierarchy/lookup maps shared by every cart entry of one Dynamo export.
+
+    StandardItem and FamilyListItem trees are loaded once as full tables; derived
+    values (formatted names, tree levels, family categories) are memoized per id.
+    """
+
+    def __init__(self, db: Session, cart_rows: list, pjt_abbr: Optional[str]):
+        self.pjt_abbr = pjt_abbr
+        id_lists = {row[5:] for row in cart_rows}
+        assignment_ids = sorted({aid for aids, _ in id_lists for aid in aids})
+        standard_item_ids = sorted({sid for _, sids in id_lists for sid in sids})
+
+        # StandardItem tree (one query)
+        self.standard_name = {}
+        self.standard_parent = {}
+        self.standard_type = {}
+        self.standard_derive_from = {}
+        for sid, name, item_type, parent_id, derive_from in db.query(
+            models.StandardItem.id,
+            models.StandardItem.name,
+            models.StandardItem.type,
+            models.StandardItem.parent_id,
+            models.StandardItem.derive_from,
+        ):
+            sid = int(sid)
+            self.standard_name[sid] = name
+            self.standard_parent[sid] = int(parent_id) if parent_id is not None else None
+            self.standard_type[sid] = (
+                item_type.value if hasattr(item_type, "value") else str(item_type)
+            )
+            self.standard_derive_from[sid] = derive_from
+
+        # FamilyListItem tree (one query)
+        self.family_meta = {}
+        self.family_parent = {}
+        for fid, parent_id, name, sequence_number in db.query(
+            models.FamilyListItem.id,
+            models.FamilyListItem.parent_id,
+            models.FamilyListItem.name,
+            models.FamilyListItem.sequence_number,
+        ):
+            fid = int(fid)
+            parent = int(parent_id) if parent_id is not None else None
+            self.family_parent[fid] = parent
+            self.family_meta[fid] = {
+                "id": fid,
+                "parent_id": parent,
+                "name": name,
+                "sequence_number": sequence_number,
+            }
+
+        # Assignments referenced by the cart
+        self.assignment_family_list_id = {}
+        self.assignment_standard_item_id = {}
+        self.assignment_family_name = {}
+        for batch in _chunked(assignment_ids):
+            for aid, family_list_id, standard_item_id in db.query(
+                models.GwmFamilyAssign.id,
+                models.GwmFamilyAssign.family_list_id,
+                models.GwmFamilyAssign.standard_item_id,
+            ).filter(models.GwmFamilyAssign.id.in_(batch)):
+                aid = int(aid)
+                if standard_item_id is not None:
+                    self.assignment_standard_item_id[aid] = int(standard_item_id)
+                fid = int(family_list_id) if family_list_id is not None else None
+                meta = self.family_meta.get(fid) if fid is not None else None
+                family_name = meta.get("name") if meta else None
+                if family_name:
+                    self.assignment_family_name[aid] = family_name
+                if fid is not None:
+                    self.assignment_family_list_id[aid] = fid
+
+        # Selected WorkMaster per standard item
+        self.work_master_by_standard_item_id = {}
+        for batch in _chunked(standard_item_ids):
             rows = (
                 db.query(
-                    models.StandardItem.id,
-                    models.StandardItem.name,
-                    models.StandardItem.type,
-                    models.StandardItem.parent_id,
-                    models.StandardItem.derive_from,
+                    models.StandardItemWorkMasterSelect.standard_item_id,
+                    models.WorkMaster.id,
+                    models.WorkMaster.work_master_code,
+                    models.WorkMaster.gauge,
+                    models.WorkMaster.discipline,
+                    models.WorkMaster.cat_large_desc,
+                    models.WorkMaster.cat_mid_desc,
+                    models.WorkMaster.cat_small_desc,
+                    models.WorkMaster.uom1,
+                    models.WorkMaster.uom2,
                 )
-                .filter(models.StandardItem.id.in_(batch_ids))
-                .all()
+                .join(
+                    models.WorkMaster,
+                    models.WorkMaster.id
+                    == models.StandardItemWorkMasterSelect.work_master_id,
+                )
+                .filter(models.StandardItemWorkMasterSelect.standard_item_id.in_(batch))
             )
-            pending_standard_ids.clear()
-            for sid, name, item_type, parent_id, derive_from in rows:
-                sid_int = int(sid)
-                loaded_standard_ids.add(sid_int)
-                standard_item_name_by_id[sid_int] = name
-                standard_item_raw_name_by_id[sid_int] = name
-                standard_item_parent_id_by_id[sid_int] = (
-                    int(parent_id) if parent_id is not None else None
+            for (
+                standard_item_id,
+                work_master_id,
+                work_master_code,
+                gauge,
+                discipline,
+                cat_large_desc,
+                cat_mid_desc,
+                cat_small_desc,
+                uom1,
+                uom2,
+            ) in rows:
+                self.work_master_by_standard_item_id[int(standard_item_id)] = (
+                    schemas.WorkMasterBrief(
+                        id=int(work_master_id),
+                        work_master_code=work_master_code,
+                        gauge=gauge,
+                        discipline=discipline,
+                        cat_large_desc=cat_large_desc,
+                        cat_mid_desc=cat_mid_desc,
+                        cat_small_desc=cat_small_desc,
+                        uom1=uom1,
+                        uom2=uom2,
+                    )
                 )
-                standard_item_type_by_id[sid_int] = (
-                    item_type.value if hasattr(item_type, "value") else str(item_type)
+
+        # calc_dictionary symbols per family_list_id (shared across entries)
+        self.calc_symbols_by_family_list_id = {}
+        family_list_ids = sorted(set(self.assignment_family_list_id.values()))
+        for batch in _chunked(family_list_ids):
+            calc_entries = (
+                db.query(models.CalcDictionaryEntry)
+                .filter(models.CalcDictionaryEntry.family_list_id.in_(batch))
+                .order_by(
+                    models.CalcDictionaryEntry.family_list_id,
+                    models.CalcDictionaryEntry.symbol_key,
+                )
+            )
+            for entry in calc_entries:
+                fid = int(getattr(entry, "family_list_id", 0) or 0)
+                if not fid:
+                    continue
+                meta = self.family_meta.get(fid)
+                self.calc_symbols_by_family_list_id.setdefault(fid, []).append(
+                    schemas.CalcDictionarySymbol(
+                        family_list_id=fid,
+                        family_name=(meta.get("name") if meta else None) or None,
+                        calc_code=getattr(entry, "calc_code", None),
+                        symbol_key=getattr(entry, "symbol_key", ""),
+                        symbol_value=getattr(entry, "symbol_value", ""),
+                    )
                 )
-                derive_from_by_id[sid_int] = derive_from
-                if parent_id is not None:
-                    try:
-                        pending_standard_ids.add(int(parent_id))
-                    except (TypeError, ValueError):
-                        pass
-                if derive_from is not None:
-                    try:
-                        pending_standard_ids.add(int(derive_from))
-                    except (TypeError, ValueError):
-                        pass
 
-        formatted_name_by_id = {}
-        for item_id, name in list(standard_item_name_by_id.items()):
-            derive_from = derive_from_by_id.get(item_id)
-            if derive_from is None:
-                formatted_name_by_id[item_id] = name
-                continue
-            try:
-                parent_id = int(derive_from)
-            except (TypeError, ValueError):
-                formatted_name_by_id[item_id] = name
-                continue
-            parent_name = standard_item_name_by_id.get(parent_id)
-            if not parent_name:
-                formatted_name_by_id[item_id] = name
-                continue
-            if pjt_abbr:
-                formatted_name_by_id[item_id] = f"{parent_name} [{pjt_abbr}]::{name}"
-            else:
-                formatted_name_by_id[item_id] = f"{parent_name}::{name}"
+        self._formatted_name_cache = {}
+        self._tree_levels_cache = {}
+        self._assignment_cache = {}
+        self._calc_symbols_cache = {}
+        self._shared_fields_cache = {}
+        self._entry_templates = {}
+        self._str_cache = {}
+
+    def formatted_standard_name(self, sid: int):
+        if sid in self._formatted_name_cache:
+            return self._formatted_name_cache[sid]
+        name = self.standard_name.get(sid)
+        derive_from = self.standard_derive_from.get(sid)
+        parent_id = _coerce_int(derive_from) if derive_from is not None else None
+        parent_name = (
+            self.standard_name.get(parent_id) if parent_id is not None else None
+        )
+        if parent_name and self.pjt_abbr:
+            name = f"{parent_name} [{self.pjt_abbr}]::{name}"
+        elif parent_name:
+            name = f"{parent_name}::{name}"
+        self._formatted_name_cache[sid] = name
+        return name
 
-        standard_item_name_by_id = formatted_name_by_id
+    def standard_tree_levels(self, sid: Optional[int]):
+        """(level1 name, level2 name) on the StandardItem path of sid."""
 
-    if assignment_ids:
+        if not sid:
+            return (None, None)
+        cached = self._tree_levels_cache.get(sid)
+        if cached is None:
+            path_ids = _ancestor_path(sid, self.standard_parent, known_only=False)
+            level1_id = path_ids[1] if len(path_ids) > 1 else path_ids[-1]
+            level2_id = path_ids[2] if len(path_ids) > 2 else path_ids[-1]
+            cached = (
+                _coerce_str(self.standard_name.get(level1_id)),
+                _coerce_str(self.standard_name.get(level2_id)),
+            )
+            self._tree_levels_cache[sid] = cached
+        return cached
+
+    def assignment_info(self, aid: int) -> dict:
+        cached = self._assignment_cache.get(aid)
+        if cached is not None:
+            return cached
+
+        family_name = self.assignment_family_name.get(aid)
+        standard_item_id = self.assignment_standard_item_id.get(aid)
+        standard_name = (
+            self.formatted_standard_name(standard_item_id)
+            if standard_item_id is not None and standard_item_id in self.standard_name
+            else None
+        )
+        if family_name and standard_name:
+            label = f"{family_name} / {standard_name}"
+        elif standard_name:
+            label = standard_name
+        elif family_name:
+            label = family_name
+        else:
+            label = f"assignment:{aid}"
+
+        category = std_no = std_name = None
+        fid = self.assignment_family_list_id.get(aid)
+        path = [
+            self.family_meta[f]
+            for f in _ancestor_path(fid, self.family_parent, known_only=True)
+        ]
+        if path:
+            category = _category_label_from_family_root(path[0])
+            level2_meta = path[2] if len(path) > 2 else path[-1]
+            std_no, std_name = _parse_standard_type_from_family(level2_meta)
+
+        cached = {
+            "label": label,
+            "category": category,
+            "standard_type_number": std_no,
+            "standard_type_name": std_name,
+        }
+        self._assignment_cache[aid] = cached
+        return cached
+
+    def _calc_symbols_entry(self, assignment_ids) -> list:
+        """[symbols, encoded JSON or None] shared by assignments with the same families."""
+
+        family_list_ids = []
         for aid in assignment_ids:
-            family_name = assignment_family_name_by_id.get(aid)
-            standard_item_id = assignment_standard_item_id_by_id.get(aid)
-            standard_name = (
-                standard_item_name_by_id.get(standard_item_id)
-                if standard_item_id is not None
-                else None
+            fid = self.assignment_family_list_id.get(aid)
+            if fid and fid not in family_list_ids:
+                family_list_ids.append(fid)
+        key = tuple(family_list_ids)
+        cached = self._calc_symbols_cache.get(key)
+        if cached is None:
+            symbols = [
+                symbol
+                for fid in family_list_ids
+                for symbol in self.calc_symbols_by_family_list_id.get(fid, [])
+            ]
+            cached = self._calc_symbols_cache[key] = [symbols, None]
+        return cached
+
+    def calc_symbols(self, assignment_ids) -> list:
+        return list(self._calc_symbols_entry(assignment_ids)[0])
+
+    def calc_symbols_json(self, assignment_ids) -> bytes:
+        cached = self._calc_symbols_entry(assignment_ids)
+        if cached[1] is None:
+            cached[1] = _DYNAMO_CALC_SYMBOLS_ADAPTER.dump_json(cached[0], by_alias=True)
+        return cached[1]
+
+    def shared_fields(self, assignment_ids: tuple, standard_item_ids: tuple) -> dict:
+        """Entry fields that depend only on the id lists (memoized per pair)."""
+
+        key = (assignment_ids, standard_item_ids)
+        cached = self._shared_fields_cache.get(key)
+        if cached is not None:
+            return cached
+
+        standard_item_id = standard_item_ids[0] if standard_item_ids else None
+        standard_item_name = None
+        if standard_item_id is not None:
+            standard_item_name = _coerce_str(
+                self.formatted_standard_name(standard_item_id)
+                if standard_item_id in self.standard_name
+                else f"standard_item:{standard_item_id}"
             )
-            if family_name and standard_name:
-                assignment_label_by_id[aid] = f"{family_name} / {standard_name}"
-            elif standard_name:
-                assignment_label_by_id[aid] = standard_name
-            elif family_name:
-                assignment_label_by_id[aid] = family_name
-            else:
-                assignment_label_by_id[aid] = f"assignment:{aid}"
 
-    selected_work_master_by_standard_item_id = {}
-    if standard_item_ids:
-        rows = (
-            db.query(
-                models.StandardItemWorkMasterSelect.standard_item_id,
-                models.WorkMaster.id,
-                models.WorkMaster.work_master_code,
-                models.WorkMaster.gauge,
-                models.WorkMaster.discipline,
-                models.WorkMaster.cat_large_desc,
-                models.WorkMaster.cat_mid_desc,
-                models.WorkMaster.cat_small_desc,
-                models.WorkMaster.uom1,
-                models.WorkMaster.uom2,
-            )
-            .join(
-                models.WorkMaster,
-                models.WorkMaster.id
-                == models.StandardItemWorkMasterSelect.work_master_id,
-            )
-            .filter(
-                models.StandardItemWorkMasterSelect.standard_item_id.in_(
-                    standard_item_ids
-                )
-            )
-            .all()
+        assignment_id = assignment_ids[0] if assignment_ids else None
+        assignment = (
+            self.assignment_info(assignment_id) if assignment_id is not None else {}
         )
-        for (
-            standard_item_id,
-            work_master_id,
-            work_master_code,
-            gauge,
-            discipline,
-            cat_large_desc,
-            cat_mid_desc,
-            cat_small_desc,
-            uom1,
-            uom2,
-        ) in rows:
-            selected_work_master_by_standard_item_id[int(standard_item_id)] = {
-                "id": int(work_master_id),
-                "work_master_code": work_master_code,
-                "gauge": gauge,
-                "discipline": discipline,
-                "cat_large_desc": cat_large_desc,
-                "cat_mid_desc": cat_mid_desc,
-                "cat_small_desc": cat_small_desc,
-                "uom1": uom1,
-                "uom2": uom2,
-            }
 
-    calc_dictionary_entries_by_family_list_id = {}
-    family_list_ids = sorted({fid for fid in assignment_family_list_id_by_id.values()})
+        work_master = next(
+            (
+                self.work_master_by_standard_item_id[sid]
+                for sid in standard_item_ids
+                if sid in self.work_master_by_standard_item_id
+            ),
+            None,
+        )
 
-    def _load_family_items_with_ancestors(seed_ids):
-        loaded_ids = set(family_item_meta_by_id.keys())
-        pending_ids = {int(fid) for fid in (seed_ids or []) if fid}
-        while pending_ids:
-            batch = sorted(pending_ids - loaded_ids)
-            if not batch:
-                break
-            rows = (
-                db.query(
-                    models.FamilyListItem.id,
-                    models.FamilyListItem.parent_id,
-                    models.FamilyListItem.name,
-                    models.FamilyListItem.sequence_number,
+        level1, level2 = self.standard_tree_levels(standard_item_id)
+        if level1 and level2:
+            detail_classification = f"{level1} | {level2}"
+        else:
+            detail_classification = level2 or level1 or standard_item_name
+
+        cached = {
+            "assignment_id": assignment_id,
+            "standard_item_id": standard_item_id,
+            "assignment_label": _coerce_str(assignment.get("label")),
+            "standard_item_name": standard_item_name,
+            "category": _coerce_str(assignment.get("category")),
+            "standard_type_number": _coerce_str(
+                assignment.get("standard_type_number")
+            ),
+            "standard_type_name": _coerce_str(assignment.get("standard_type_name")),
+            "classification": (
+                _coerce_str(self.standard_type.get(standard_item_id))
+                if standard_item_id is not None
+                else None
+            ),
+            "detail_classification": detail_classification,
+            "unit": _coerce_str(work_master.uom1) if work_master is not None else None,
+            "work_master": work_master,
+            "calc_dictionary_entries": self.calc_symbols(assignment_ids),
+        }
+        self._shared_fields_cache[key] = cached
+        return cached
+
+    def cart_entry(self, row: tuple) -> dict:
+        """Plain dict keyed by field name for one `_load_dynamo_cart_rows` row."""
+
+        (
+            entry_id,
+            created_at,
+            revit_type,
+            building_name,
+            formula,
+            assignment_ids,
+            standard_item_ids,
+        ) = row
+        return {
+            **self.shared_fields(assignment_ids, standard_item_ids),
+            "id": entry_id,
+            "created_at": created_at,
+            "formula": formula,
+            "revit_type": revit_type,
+            "building_name": building_name,
+        }
+
+    def encode_cart_entries(self, rows: list) -> bytes:
+        """Comma-joined DynamoWorkMasterCartEntry JSON (by alias) for rows.
+
+        Entries sharing the same id lists differ only in the per-entry fields, so
+        the entry is rendered once per id-list pair with sentinel values and split
+        into a bytes template around them; each entry then only fills in its own
+        values, encoded by pydantic (created_at once per batch, strings once per
+        distinct value). A pair whose rendering does not contain every sentinel
+        exactly once is encoded through the model as a whole.
+        """
+
+        if not rows:
+            return b""
+        # 직렬화된 datetime 에는 '","' 가 나올 수 없어 배치 한 번으로 나눠 쓴다
+        created_ats = _DYNAMO_DATETIMES_ADAPTER.dump_json(
+            [row[1] for row in rows]
+        )[2:-2].split(b'","')
+        templates = self._entry_templates
+        str_cache = self._str_cache
+        encode_str = self._encode_str
+        out = []
+        for row, created_at in zip(rows, created_ats):
+            key = row[5:]
+            if key not in templates:
+                templates[key] = self._entry_template(key)
+            fmt = templates[key]
+            if fmt is None:
+                out.append(
+                    _DYNAMO_CART_ENTRY_ADAPTER.dump_json(
+                        _DYNAMO_CART_ENTRY_ADAPTER.validate_python(self.cart_entry(row)),
+                        by_alias=True,
+                    )
+                )
+                continue
+            entry_id, _, revit_type, building_name, formula = row[:5]
+            out.append(
+                fmt
+                % (
+                    str_cache.get(revit_type) or encode_str(revit_type),
+                    str_cache.get(building_name) or encode_str(building_name),
+                    str_cache.get(formula) or encode_str(formula),
+                    b"%d" % entry_id,
+                    created_at,
                 )
-                .filter(models.FamilyListItem.id.in_(batch))
-                .all()
             )
-            pending_ids.clear()
-            for fid, parent_id, name, sequence_number in rows:
-                fid_int = int(fid)
-                loaded_ids.add(fid_int)
-                family_item_meta_by_id[fid_int] = {
-                    "id": fid_int,
-                    "parent_id": int(parent_id) if parent_id is not None else None,
-                    "name": name,
-                    "sequence_number": sequence_number,
-                }
-                if parent_id is not None:
-                    try:
-                        pending_ids.add(int(parent_id))
-                    except (TypeError, ValueError):
-                        pass
+        return b",".join(out)
 
-    _load_family_items_with_ancestors(family_list_ids)
+    def _encode_str(self, value: Optional[str]) -> bytes:
+        encoded = self._str_cache[value] = _DYNAMO_OPTIONAL_STR_ADAPTER.dump_json(
+            value
+        )
+        return encoded
 
-    def _family_path(fid):
-        if not fid:
-            return []
-        path = []
-        cursor = int(fid)
-        seen = set()
-        while cursor and cursor not in seen:
-            seen.add(cursor)
-            meta = family_item_meta_by_id.get(cursor)
-            if not meta:
-                break
-            path.append(meta)
-            cursor = meta.get("parent_id")
-        return list(reversed(path))
+    def _entry_template(self, key: tuple) -> Optional[bytes]:
+        """Bytes %-format for one id-list pair (slots in _DYNAMO_ENTRY_SLOTS order)."""
 
-    def _category_label_from_family_root(root_meta):
-        if not root_meta:
+        fields = self.cart_entry(_DYNAMO_ENTRY_SENTINEL_ROW + key)
+        # calc_dictionary_entries(마지막 필드)는 패밀리 조합별로 한 번 인코딩해 붙인다
+        fields["calc_dictionary_entries"] = []
+        rendered = _DYNAMO_CART_ENTRY_ADAPTER.dump_json(
+            _DYNAMO_CART_ENTRY_ADAPTER.validate_python(fields), by_alias=True
+        )
+        if not rendered.endswith(_DYNAMO_CALC_ENTRIES_EMPTY_TAIL):
             return None
-        seq = root_meta.get("sequence_number")
-        name = root_meta.get("name")
-        if seq and name:
-            return f"{str(seq).strip()}.{str(name).strip()}"
-        return str(name).strip() if name else None
-
-    def _parse_standard_type_from_family(level2_meta):
-        if not level2_meta:
-            return (None, None)
-        seq = level2_meta.get("sequence_number")
-        name = level2_meta.get("name")
-        if seq:
-            seq = str(seq).strip() or None
-        if name:
-            name = str(name).strip() or None
-        if seq or name:
-            return (seq, name)
-
-        combined = str(level2_meta.get("name") or "").strip()
-        if not combined:
-            return (None, None)
-        import re
-
-        m = re.match(r"^\s*([0-9]+(?:\.[0-9]+)*)\s+(.+?)\s*$", combined)
-        if m:
-            return (m.group(1), m.group(2))
-        m = re.match(r"^\s*([0-9]+)\.(.+?)\s*$", combined)
-        if m:
-            return (m.group(1), m.group(2).strip())
-        return (None, combined)
-
-    assignment_category_by_id = {}
-    assignment_family_std_type_number_by_id = {}
-    assignment_family_std_type_name_by_id = {}
-    if assignment_ids:
-        for aid in assignment_ids:
-            fid = assignment_family_list_id_by_id.get(aid)
-            path = _family_path(fid)
-            if not path:
-                continue
-            assignment_category_by_id[aid] = _category_label_from_family_root(path[0])
-            level2_meta = path[2] if len(path) > 2 else path[-1]
-            std_no, std_name = _parse_standard_type_from_family(level2_meta)
-            assignment_family_std_type_number_by_id[aid] = std_no
-            assignment_family_std_type_name_by_id[aid] = std_name
-    if family_list_ids:
-        calc_entries = (
-            db.query(models.CalcDictionaryEntry)
-            .filter(models.CalcDictionaryEntry.family_list_id.in_(family_list_ids))
-            .order_by(
-                models.CalcDictionaryEntry.family_list_id,
-                models.CalcDictionaryEntry.symbol_key,
+        rendered = b"".join(
+            (
+                rendered[: -len(_DYNAMO_CALC_ENTRIES_EMPTY_TAIL)],
+                b'"calc_dictionary_entries":',
+                self.calc_symbols_json(key[0]),
+                b"}",
             )
-            .all()
         )
-        for entry in calc_entries:
-            fid = int(getattr(entry, "family_list_id", 0) or 0)
-            if not fid:
-                continue
-            calc_dictionary_entries_by_family_list_id.setdefault(fid, []).append(
-                schemas.CalcDictionarySymbol(
-                    family_list_id=fid,
-                    family_name=family_name_by_family_list_id.get(fid),
-                    calc_code=getattr(entry, "calc_code", None),
-                    symbol_key=getattr(entry, "symbol_key", ""),
-                    symbol_value=getattr(entry, "symbol_value", ""),
-                )
-            )
+        positions = []
+        for slot, marker in zip(_DYNAMO_ENTRY_SLOTS, _DYNAMO_ENTRY_SENTINEL_JSON):
+            if rendered.count(marker) != 1:
+                return None
+            positions.append((rendered.index(marker), slot, marker))
+        positions.sort()
+        if tuple(slot for _, slot, _ in positions) != _DYNAMO_ENTRY_SLOTS:
+            return None
+        parts = []
+        cursor = 0
+        for position, _slot, marker in positions:
+            parts.append(rendered[cursor:position].replace(b"%", b"%%"))
+            cursor = position + len(marker)
+        parts.append(rendered[cursor:].replace(b"%", b"%%"))
+        return b"%b".join(parts)
+
+
+DYNAMO_EXPORT_STREAM_CHUNK_SIZE = 500
+_DYNAMO_CART_ENTRY_ADAPTER = TypeAdapter(schemas.DynamoWorkMasterCartEntry)
+_DYNAMO_DATETIMES_ADAPTER = TypeAdapter(List[datetime.datetime])
+_DYNAMO_OPTIONAL_STR_ADAPTER = TypeAdapter(Optional[str])
+_DYNAMO_CALC_SYMBOLS_ADAPTER = TypeAdapter(List[schemas.CalcDictionarySymbol])
+_DYNAMO_CALC_ENTRIES_EMPTY_TAIL = b'"calc_dictionary_entries":[]}'
+_DYNAMO_CART_ENTRIES_EMPTY = b'"workmaster_cart_entries":[]'
+# 템플릿 분할용 자리표시 값 (행 순서: id, created_at, revit_type, building_name, formula)
+_DYNAMO_ENTRY_SENTINEL_ROW = (
+    -7_318_264_905_512_037,
+    datetime.datetime(1, 2, 3, 4, 5, 6, 789_012),
+    "\x00revit_type\x00",
+    "\x00building_name\x00",
+    "\x00formula\x00",
+)
+# DynamoWorkMasterCartEntry 필드 순서대로의 행 위치; created_at 은 따옴표 안쪽만 바꾼다
+_DYNAMO_ENTRY_SLOTS = (2, 3, 4, 0, 1)
+_DYNAMO_ENTRY_SENTINEL_JSON = (
+    *(_DYNAMO_OPTIONAL_STR_ADAPTER.dump_json(v) for v in _DYNAMO_ENTRY_SENTINEL_ROW[2:]),
+    b"%d" % _DYNAMO_ENTRY_SENTINEL_ROW[0],
+    _DYNAMO_DATETIMES_ADAPTER.dump_json([_DYNAMO_ENTRY_SENTINEL_ROW[1]])[2:-2],
+)
 
-    for entry in cart_entries:
-        entry.assignment_labels = [
-            assignment_label_by_id.get(int(aid), f"assignment:{aid}")
-            for aid in (entry.assignment_ids or [])
-        ]
-        entry.standard_item_names = [
-            standard_item_name_by_id.get(int(sid), f"standard_item:{sid}")
-            for sid in (entry.standard_item_ids or [])
-        ]
-        entry.work_masters = [
-            schemas.WorkMasterBrief(**wm)
-            for sid in (entry.standard_item_ids or [])
-            for wm in [selected_work_master_by_standard_item_id.get(int(sid))]
-            if wm
-        ]
 
-        family_list_ids_for_entry = []
-        seen_family_list_ids = set()
-        for aid in entry.assignment_ids or []:
-            try:
-                aid_int = int(aid)
-            except (TypeError, ValueError):
-                continue
-            fid = assignment_family_list_id_by_id.get(aid_int)
-            if not fid or fid in seen_family_list_ids:
-                continue
-            seen_family_list_ids.add(fid)
-            family_list_ids_for_entry.append(fid)
+def _iter_dynamo_export_json(
+    project_identifier: str,
+    buildings,
+    context: "_DynamoExportContext",
+    cart_rows,
+    progress=None,
+):
+    """Yield the DynamoProjectExportPayload JSON with entries encoded chunk by chunk.
 
-        entry.calc_dictionary_entries = [
-            calc_entry
-            for fid in family_list_ids_for_entry
-            for calc_entry in calc_dictionary_entries_by_family_list_id.get(fid, [])
-        ]
+    The envelope is rendered once with an empty entry list and split around it, so
+    the key order and aliases match the non-streaming response exactly.
+    `progress(sheet_name, sheet_index, sheet_count, rows_written)` is called per chunk.
+    """
 
-    def _first_from(value):
-        if value is None:
-            return None
-        if isinstance(value, (list, tuple)):
-            return value[0] if value else None
-        return value
+    envelope = schemas.DynamoProjectExportPayload.model_validate(
+        {"project_identifier": project_identifier, "buildings": buildings}
+    ).model_dump_json(by_alias=True).encode("utf-8")
+    head, tail = envelope.split(_DYNAMO_CART_ENTRIES_EMPTY, 1)
+    yield head + b'"workmaster_cart_entries":['
 
-    def _coerce_int(value):
-        if value is None:
-            return None
-        if isinstance(value, int):
-            return value
-        if isinstance(value, str):
-            value = value.strip()
-            if not value:
-                return None
-            if value.isdigit():
-                return int(value)
-        try:
-            return int(value)
-        except (TypeError, ValueError):
-            return None
+    for start in range(0, len(cart_rows), DYNAMO_EXPORT_STREAM_CHUNK_SIZE):
+        batch = cart_rows[start : start + DYNAMO_EXPORT_STREAM_CHUNK_SIZE]
+        yield (b"," if start else b"") + context.encode_cart_entries(batch)
+        if progress is not None:
+            progress("workmaster_cart_entries", 1, 1, start + len(batch))
 
-    def _coerce_str(value):
-        if value is None:
-            return None
-        text_value = str(value).strip()
-        return text_value or None
+    yield b"]" + tail
 
-    def _standard_tree_level2_name(standard_item_id):
-        sid = _coerce_int(standard_item_id)
-        if not sid:
-            return None
-        path_ids = []
-        cursor = sid
-        seen = set()
-        while cursor and cursor not in seen:
-            seen.add(cursor)
-            path_ids.append(cursor)
-            cursor = standard_item_parent_id_by_id.get(cursor)
-        path_ids = list(reversed(path_ids))
-        if not path_ids:
-            return None
-        level2_id = path_ids[2] if len(path_ids) > 2 else path_ids[-1]
-        return _coerce_str(standard_item_raw_name_by_id.get(level2_id))
 
-    def _standard_tree_level1_name(standard_item_id):
-        sid = _coerce_int(standard_item_id)
-        if not sid:
-            return None
-        path_ids = []
-        cursor = sid
-        seen = set()
-        while cursor and cursor not in seen:
-            seen.add(cursor)
-            path_ids.append(cursor)
-            cursor = standard_item_parent_id_by_id.get(cursor)
-        path_ids = list(reversed(path_ids))
-        if not path_ids:
-            return None
-        level1_id = path_ids[1] if len(path_ids) > 1 else path_ids[-1]
-        return _coerce_str(standard_item_raw_name_by_id.get(level1_id))
+def _dynamo_export_stream(project_identifier: str, db: Session, progress=None):
+    """(pjt_abbr, JSON chunk iterator) for the Dynamo export; DB reads happen up front."""
 
-    def _compose_unit(wm_obj):
-        if wm_obj is None:
-            return None
-        return _coerce_str(getattr(wm_obj, "uom1", None))
+    buildings = crud.list_buildings(db)
+    cart_rows = _load_dynamo_cart_rows(db)
+    pjt_abbr = _read_project_pjt_abbr(db)
+    context = _DynamoExportContext(db, cart_rows, pjt_abbr)
+    return pjt_abbr, _iter_dynamo_export_json(
+        project_identifier, buildings, context, cart_rows, progress=progress
+    )
 
-    dynamo_cart_entries = []
-    for entry in cart_entries:
-        wm = _first_from(getattr(entry, "work_masters", None) or [])
-        if wm is not None and not isinstance(wm, schemas.WorkMasterBrief):
-            try:
-                wm = schemas.WorkMasterBrief(**wm)
-            except Exception:
-                wm = None
 
-        standard_item_id_value = _coerce_int(
-            _first_from(getattr(entry, "standard_item_ids", None) or [])
-        )
-        standard_item_name_value = _coerce_str(
-            _first_from(getattr(entry, "standard_item_names", None) or [])
-        )
+@router.get(
+    "/project/{project_identifier}/export/dynamo-json",
+    response_model=schemas.DynamoProjectExportPayload,
+    response_model_by_alias=True,
+    tags=["Project Data"],
+)
+def export_project_db_for_dynamo(
+    project_identifier: str,
+    request: Request,
+    stream: bool = False,
+    db: Session = Depends(get_project_db_session),
+):
+    """Dynamo 테스트를 위한 프로젝트 DB JSON 추출 엔드포인트.
 
-        assignment_id_value = _coerce_int(
-            _first_from(getattr(entry, "assignment_ids", None) or [])
-        )
-        family_category_value = (
-            assignment_category_by_id.get(assignment_id_value)
-            if assignment_id_value is not None
-            else None
-        )
-        family_std_type_number_value = (
-            assignment_family_std_type_number_by_id.get(assignment_id_value)
-            if assignment_id_value is not None
-            else None
+    - 추후에는 "파일 다운로드" 대신 Dynamo가 직접 참조하는 라우터로 사용 가능
+    - DB revision이 같으면 캐시된 파일을 ETag와 함께 반환 (If-None-Match → 304)
+    - `?stream=1`: 캐시가 없으면 workmaster_cart_entries를 계산되는 대로 청크 단위로 전송
+    - `exported_at`은 파일을 생성한 시각 (캐시 적중 시 요청 시각이 아님)
+    """
+
+    db_path = project_db.resolve_project_db_path(project_identifier)
+    kind = "dynamo-json"
+    revision = _project_db_stat(db_path)["revision"]
+    if not stream or project_db.export_cache_path(db_path, kind, revision).exists():
+        filename = _export_download_filename(
+            "Bnote", project_identifier, _read_project_pjt_abbr(db), ".json"
         )
-        family_std_type_name_value = (
-            assignment_family_std_type_name_by_id.get(assignment_id_value)
-            if assignment_id_value is not None
-            else None
-        )
-        standard_item_type_value = (
-            _coerce_str(standard_item_type_by_id.get(standard_item_id_value))
-            if standard_item_id_value is not None
-            else None
+        return _export_file_response(
+            request, project_identifier, db_path, kind, filename, db=db
         )
 
-        standard_tree_level1_value = _standard_tree_level1_name(standard_item_id_value)
-        standard_tree_level2_value = _standard_tree_level2_name(standard_item_id_value)
-        if standard_tree_level1_value and standard_tree_level2_value:
-            detail_classification_value = (
-                f"{standard_tree_level1_value} | {standard_tree_level2_value}"
-            )
-        else:
-            detail_classification_value = (
-                standard_tree_level2_value
-                or standard_tree_level1_value
-                or standard_item_name_value
-            )
-
-        dynamo_cart_entries.append(
-            schemas.DynamoWorkMasterCartEntry(
-                id=int(getattr(entry, "id")),
-                created_at=getattr(entry, "created_at"),
-                formula=getattr(entry, "formula", None),
-                revit_type=_coerce_str(
-                    _first_from(getattr(entry, "revit_types", None) or [])
-                ),
-                assignment_id=assignment_id_value,
-                standard_item_id=standard_item_id_value,
-                building_name=_coerce_str(
-                    _first_from(getattr(entry, "building_names", None) or [])
-                ),
-                assignment_label=_coerce_str(
-                    _first_from(getattr(entry, "assignment_labels", None) or [])
-                ),
-                standard_item_name=standard_item_name_value,
-                category=_coerce_str(family_category_value),
-                standard_type_number=_coerce_str(family_std_type_number_value),
-                standard_type_name=_coerce_str(family_std_type_name_value),
-                classification=standard_item_type_value,
-                detail_classification=detail_classification_value,
-                unit=_compose_unit(wm),
-                work_master=wm,
-                calc_dictionary_entries=list(
-                    getattr(entry, "calc_dictionary_entries", None) or []
-                ),
-            )
-        )
-    return {
-        "project_identifier": project_identifier,
-        "buildings": buildings,
-        "workmaster_cart_entries": dynamo_cart_entries,
+    etag = _export_etag(kind, revision)
+    if _if_none_match(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    pjt_abbr, chunks = _dynamo_export_stream(project_identifier, db)
+    filename = _export_download_filename("Bnote", project_identifier, pjt_abbr, ".json")
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "ETag": etag,
+        "Cache-Control": "no-cache",
     }
+    return StreamingResponse(
+        _iter_into_export_cache(chunks, db_path, kind, revision),
+        media_type=_EXPORT_MEDIA_TYPES[kind],
+        headers=headers,
+    )
 
 
 @router.get(
@@ -1734,7 +2613,8 @@ def export_project_db_for_dynamo(
 )
 def export_project_db_json(
     project_identifier: str,
-    response: Response,
+    request: Request,
+    stream: bool = False,
     db: Session = Depends(get_project_db_session),
 ):
     """Compatibility alias for the Dynamo JSON export.
@@ -1743,10 +2623,430 @@ def export_project_db_json(
     """
 
     return export_project_db_for_dynamo(
-        project_identifier=project_identifier, response=response, db=db
+        project_identifier=project_identifier, request=request, stream=stream, db=db
     )
 
 
+# ===================
+#  Calc Result import
+# ===================
+CALC_RESULT_IMPORT_CHUNK_SIZE = 5000
+CALC_RESULT_REJECTED_ROWS_LIMIT = 200
+
+_CALC_RESULT_INSERT_SQL = text(
+    """
+    INSERT OR REPLACE INTO calc_result (
+        key, rev_key, building_name, guid, gui, member_name,
+        category, standard_type_number, standard_type_name,
+        classification, detail_classification, unit,
+        formula, substituted_formula, result, result_log,
+        work_master_id, work_master_code, gauge, created_at
+    ) VALUES (
+        :key, :rev_key, :building_name, :guid, :gui, :member_name,
+        :category, :standard_type_number, :standard_type_name,
+        :classification, :detail_classification, :unit,
+        :formula, :substituted_formula, :result, :result_log,
+        :work_master_id, :work_master_code, :gauge, :created_at
+    )
+    """
+)
+
+
+def _calc_result_key(*parts) -> str:
+    return "|".join([_sanitize_filename_part(_coerce_str(p) or "") for p in parts])
+
+
+def _load_work_master_id_by_code(db: Session) -> dict:
+    """work_master_code -> lowest WorkMaster id, loaded once per import."""
+
+    rows = db.execute(
+        text(
+            """
+            SELECT work_master_code, MIN(id)
+            FROM work_masters
+            WHERE work_master_code IS NOT NULL
+            GROUP BY work_master_code
+            """
+        )
+    ).fetchall()
+    return {row[0]: int(row[1]) for row in rows if row[1] is not None}
+
+
+def _refresh_calc_result_summary(
+    db: Session, rev_key: Optional[str] = None, building_names=None
+) -> None:
+    """Recompute calc_result_summary for the touched (rev_key, building) scopes.
+
+    Runs inside the caller's transaction; without rev_key the whole table is rebuilt.
+    """
+
+    if rev_key is None:
+        for stmt in project_db.CALC_RESULT_SUMMARY_REBUILD_SQL:
+            db.execute(text(stmt))
+        return
+    scopes = {str(name or "").strip() for name in (building_names or [None])}
+    for building_name in sorted(scopes):
+        params = {"rev_key": rev_key, "building_name": building_name}
+        db.execute(text(project_db.CALC_RESULT_SUMMARY_SCOPE_DELETE_SQL), params)
+        db.execute(text(project_db.CALC_RESULT_SUMMARY_SCOPE_INSERT_SQL), params)
+
+
+def _backfill_calc_result_work_master_ids(db: Session, codes) -> int:
+    """Resolve code-only calc_result rows for newly created WorkMaster codes.
+
+    Only the (rev_key, building) summary scopes holding those rows are refreshed.
+    Runs inside the caller's transaction (no commit).
+    """
+
+    codes = sorted({str(c) for c in (codes or []) if c is not None and str(c) != ""})
+    updated = 0
+    scopes = set()
+    for chunk in _chunked(codes):
+        params = {f"c{i}": code for i, code in enumerate(chunk)}
+        scope_sql = f"AND work_master_code IN ({', '.join(':' + k for k in params)})"
+        where_sql = project_db.CALC_RESULT_UNRESOLVED_WORK_MASTER_WHERE.format(
+            scope=scope_sql
+        )
+        scopes.update(
+            (rev_key, building_name)
+            for rev_key, building_name in db.execute(
+                text(
+                    "SELECT DISTINCT rev_key, TRIM(COALESCE(building_name, '')) "
+                    f"FROM calc_result WHERE rev_key IS NOT NULL AND {where_sql}"
+                ),
+                params,
+            )
+        )
+        result = db.execute(
+            text(
+                project_db.CALC_RESULT_WORK_MASTER_ID_BACKFILL_TEMPLATE.format(
+                    scope=scope_sql
+                )
+            ),
+            params,
+        )
+        updated += int(result.rowcount or 0)
+
+    buildings_by_rev_key = {}
+    for rev_key, building_name in scopes:
+        buildings_by_rev_key.setdefault(rev_key, []).append(building_name)
+    for rev_key, building_names in sorted(buildings_by_rev_key.items()):
+        _refresh_calc_result_summary(db, rev_key, building_names)
+    return updated
+
+
+def _calc_result_params_from_entry(
+    entry: dict,
+    *,
+    rev_key: str,
+    building_name: Optional[str],
+    work_master_id_by_code: dict,
+    now_iso: str,
+) -> dict:
+    wm_payload = (
+        entry.get("work_master") if isinstance(entry.get("work_master"), dict) else {}
+    )
+
+    work_master_id = _payload_get(wm_payload, "id", "work_master_id", "workMasterId")
+    work_master_code = _coerce_str(
+        _payload_get(
+            wm_payload, "work_master_code", "workMasterCode", "wm_code", "wmCode"
+        )
+    )
+    resolved_wm_id = None
+    if work_master_id is not None and str(work_master_id).isdigit():
+        resolved_wm_id = int(work_master_id) or None
+    if resolved_wm_id is None and work_master_code:
+        resolved_wm_id = work_master_id_by_code.get(work_master_code)
+
+    # Try to extract gauge from the work_master payload or entry payload
+    gauge = _coerce_str(
+        _payload_get(wm_payload, "gauge", "gauge_code", "gaugeCode", "G")
+    )
+    if not gauge:
+        gauge = _coerce_str(_payload_get(entry, "gauge", "게이지", "gauge"))
+
+    guid = _coerce_str(_payload_get(entry, "GUID", "guid"))
+    gui = _coerce_str(_payload_get(entry, "GUI", "gui"))
+    formula = _coerce_str(_payload_get(entry, "수식", "formula"))
+    detail = _coerce_str(
+        _payload_get(entry, "상세분류", "detail_classification", "detailClassification")
+    )
+
+    result_val = _payload_get(entry, "산출결과", "result")
+    result_float = None
+    if isinstance(result_val, (int, float)):
+        result_float = float(result_val)
+    elif result_val is not None:
+        try:
+            result_float = float(str(result_val).strip())
+        except Exception:
+            result_float = None
+
+    return {
+        "key": _calc_result_key(
+            rev_key or "",
+            building_name or "",
+            guid or "",
+            gui or "",
+            formula or "",
+            work_master_code or str(resolved_wm_id or ""),
+            detail or "",
+        ),
+        "rev_key": rev_key,
+        "building_name": building_name,
+        "guid": guid,
+        "gui": gui,
+        "member_name": _coerce_str(
+            _payload_get(entry, "name", "member", "member_name", "memberName")
+        ),
+        "category": _coerce_str(_payload_get(entry, "카테고리", "category")),
+        "standard_type_number": _coerce_str(
+            _payload_get(
+                entry, "표준타입 번호", "standard_type_number", "standardTypeNumber"
+            )
+        ),
+        "standard_type_name": _coerce_str(
+            _payload_get(entry, "표준타입 이름", "standard_type_name", "standardTypeName")
+        ),
+        "classification": _coerce_str(_payload_get(entry, "분류", "classification")),
+        "detail_classification": detail,
+        "unit": _coerce_str(_payload_get(entry, "단위", "unit")),
+        "formula": formula,
+        "substituted_formula": _coerce_str(
+            _payload_get(entry, "대입수식", "substituted_formula", "substitutedFormula")
+        ),
+        "result": result_float,
+        "result_log": _coerce_str(
+            _payload_get(entry, "산출로그", "result_log", "resultLog")
+        ),
+        "work_master_id": resolved_wm_id,
+        "work_master_code": work_master_code,
+        "gauge": gauge,
+        "created_at": now_iso,
+    }
+
+
+def _iter_calc_result_rows(
+    entries,
+    *,
+    rev_key: str,
+    building_name: Optional[str],
+    work_master_id_by_code: dict,
+    now_iso: str,
+):
+    """Yield `(index, params, reject_reason)` for each entry of the result array."""
+
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            yield index, None, "entry is not a JSON object"
+            continue
+        try:
+            params = _calc_result_params_from_entry(
+                entry,
+                rev_key=rev_key,
+                building_name=building_name,
+                work_master_id_by_code=work_master_id_by_code,
+                now_iso=now_iso,
+            )
+        except Exception as exc:
+            yield index, None, f"invalid entry: {exc}"
+            continue
+        yield index, params, None
+
+
+def _bulk_insert_calc_results(
+    db: Session, rows, chunk_size: int = CALC_RESULT_IMPORT_CHUNK_SIZE
+) -> dict:
+    """executemany `rows` into calc_result in chunks, without committing.
+
+    A chunk that fails as a whole is retried row by row so the offending rows
+    can be reported; INSERT OR REPLACE makes the retry idempotent.
+    """
+
+    stats = {"inserted": 0, "rejected": 0, "rejected_rows": [], "chunks": []}
+
+    def _reject(index: int, reason: str):
+        stats["rejected"] += 1
+        if len(stats["rejected_rows"]) < CALC_RESULT_REJECTED_ROWS_LIMIT:
+            stats["rejected_rows"].append({"index": index, "reason": reason})
+
+    def _flush(chunk):
+        if not chunk:
+            return
+        started = time.perf_counter()
+        try:
+            db.execute(_CALC_RESULT_INSERT_SQL, [params for _, params in chunk])
+            stats["inserted"] += len(chunk)
+        except Exception:
+            for index, params in chunk:
+                try:
+                    db.execute(_CALC_RESULT_INSERT_SQL, params)
+                    stats["inserted"] += 1
+                except Exception as exc:
+                    _reject(index, f"insert failed: {exc}")
+        stats["chunks"].append(
+            {
+                "index": len(stats["chunks"]),
+                "rows": len(chunk),
+                "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
+            }
+        )
+
+    chunk = []
+    for index, params, reason in rows:
+        if params is None:
+            _reject(index, reason or "rejected")
+            continue
+        chunk.append((index, params))
+        if len(chunk) >= chunk_size:
+            _flush(chunk)
+            chunk = []
+    _flush(chunk)
+    return stats
+
+
+_CALC_RESULT_ARRAY_KEYS = ("calculation result", "calculation_result", "calculationResult")
+
+
+def _building_name_from_project_info(project_info) -> Optional[str]:
+    return _coerce_str(
+        _payload_get(
+            project_info if isinstance(project_info, dict) else {},
+            "building name",
+            "building_name",
+            "buildingName",
+        )
+    )
+
+
+def _read_calc_result_payload(fp):
+    """Whole-document parse (used when ijson is not installed)."""
+
+    try:
+        payload = json.loads(fp.read().decode("utf-8"))
+    except Exception:
+        raise ValueError("Invalid JSON file")
+
+    project_info = payload.get("project_info") if isinstance(payload, dict) else None
+    results = None
+    if isinstance(payload, dict):
+        for array_key in _CALC_RESULT_ARRAY_KEYS:
+            results = payload.get(array_key)
+            if results is not None:
+                break
+    if results is None and isinstance(payload, list):
+        results = payload
+    if not isinstance(results, list):
+        results = []
+    return _building_name_from_project_info(project_info), results
+
+
+def _stream_calc_result_json(fp, ijson):
+    """Event-parse the upload: one header pass, then iterate the result array lazily.
+
+    `project_info` may come after the result array, so the header pass reads
+    events (never materializing the array) before the file is rewound.
+    """
+
+    project_info = None
+    array_keys = set()
+    is_list = False
+    builder = None
+    try:
+        for prefix, event, value in ijson.parse(fp):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == "project_info" and event in ("end_map", "end_array"):
+                    project_info = builder.value
+                    builder = None
+                continue
+            if prefix == "":
+                if event == "start_array":
+                    is_list = True
+                    break
+                if event == "map_key" and value in _CALC_RESULT_ARRAY_KEYS:
+                    array_keys.add(value)
+            elif prefix == "project_info" and event in ("start_map", "start_array"):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            if project_info is not None and array_keys:
+                break
+    except ijson.JSONError:
+        raise ValueError("Invalid JSON file")
+
+    if is_list:
+        items_prefix = "item"
+    else:
+        items_prefix = next(
+            (f"{k}.item" for k in _CALC_RESULT_ARRAY_KEYS if k in array_keys), None
+        )
+
+    def _entries():
+        if items_prefix is None:
+            return
+        fp.seek(0)
+        try:
+            yield from ijson.items(fp, items_prefix, use_float=True)
+        except ijson.JSONError:
+            raise ValueError("Invalid JSON file")
+
+    return _building_name_from_project_info(project_info), _entries()
+
+
+def _stream_calc_result_ndjson(fp):
+    """NDJSON: one result entry per line; an optional first line `{"project_info": {...}}`."""
+
+    lines = (line for line in fp if line.strip())
+    first = next(lines, None)
+    building_name = None
+    pending = []
+    if first is not None:
+        try:
+            first_obj = json.loads(first)
+        except Exception:
+            first_obj = None
+        if isinstance(first_obj, dict) and "project_info" in first_obj:
+            building_name = _building_name_from_project_info(
+                first_obj.get("project_info")
+            )
+        else:
+            pending.append(first)
+
+    def _entries():
+        for line in itertools.chain(pending, lines):
+            try:
+                yield json.loads(line)
+            except Exception:
+                # Surfaces as a rejected row ("entry is not a JSON object").
+                yield None
+
+    return building_name, _entries()
+
+
+def _open_calc_result_upload(file: UploadFile, file_format: str):
+    """Return `(building_name, entries)` with entries consumed lazily when possible."""
+
+    fmt = (_coerce_str(file_format) or "auto").lower()
+    if fmt == "auto":
+        name = (file.filename or "").lower()
+        fmt = "ndjson" if name.endswith((".ndjson", ".jsonl")) else "json"
+    if fmt not in {"json", "ndjson"}:
+        raise HTTPException(status_code=400, detail="format must be auto|json|ndjson")
+
+    fp = file.file
+    try:
+        if fmt == "ndjson":
+            return _stream_calc_result_ndjson(fp)
+        try:
+            import ijson
+        except ImportError:
+            return _read_calc_result_payload(fp)
+        return _stream_calc_result_json(fp, ijson)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @router.post(
     "/project/{project_identifier}/calc-result/import-json",
     response_model=schemas.CalcResultImportResponse,
@@ -1756,9 +3056,17 @@ def import_calc_result_json(
     project_identifier: str,
     rev_key: str = Form(...),
     mode: str = Form("append"),
+    file_format: str = Form("auto", alias="format"),
     file: UploadFile = File(...),
     db: Session = Depends(get_project_db_session),
 ):
+    """Import a Dynamo calc-result export.
+
+    The upload is parsed incrementally (ijson event parsing, or NDJSON when
+    `format=ndjson` / a `.ndjson`/`.jsonl` file name) so memory stays bounded
+    regardless of file size.
+    """
+
     rev_key = _coerce_str(rev_key)
     if not rev_key:
         raise HTTPException(status_code=400, detail="rev_key is required")
@@ -1766,32 +3074,7 @@ def import_calc_result_json(
     if mode not in {"append", "overwrite"}:
         raise HTTPException(status_code=400, detail="mode must be append|overwrite")
 
-    try:
-        raw = file.file.read()
-        payload = json.loads(raw.decode("utf-8"))
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail="Invalid JSON file")
-
-    project_info = payload.get("project_info") if isinstance(payload, dict) else None
-    building_name = _coerce_str(
-        _payload_get(
-            project_info or {},
-            "building name",
-            "building_name",
-            "buildingName",
-        )
-    )
-    results = None
-    if isinstance(payload, dict):
-        results = payload.get("calculation result")
-        if results is None:
-            results = payload.get("calculation_result")
-        if results is None:
-            results = payload.get("calculationResult")
-    if results is None and isinstance(payload, list):
-        results = payload
-    if not isinstance(results, list):
-        results = []
+    building_name, results = _open_calc_result_upload(file, file_format)
 
     if building_name:
         try:
@@ -1806,182 +3089,43 @@ def import_calc_result_json(
         except Exception:
             db.rollback()
 
+    # Overwrite delete + all inserts share one transaction.
     deleted = 0
     if mode == "overwrite":
         if not building_name:
             raise HTTPException(
                 status_code=400,
-                detail="building name is required in JSON for overwrite mode",
-            )
-        try:
-            res = db.execute(
-                text(
-                    "DELETE FROM calc_result WHERE TRIM(COALESCE(building_name,'')) = TRIM(:building_name) AND rev_key = :rev_key"
-                ),
-                {"building_name": building_name, "rev_key": rev_key},
-            )
-            deleted = int(getattr(res, "rowcount", 0) or 0)
-            db.commit()
-        except Exception:
-            db.rollback()
-            raise HTTPException(
-                status_code=500, detail="Failed to overwrite calc results"
-            )
-
-    now_iso = datetime.datetime.utcnow().isoformat()
-
-    def _resolve_work_master_id(
-        work_master_id: Optional[int], work_master_code: Optional[str]
-    ) -> Optional[int]:
-        if work_master_id:
-            return int(work_master_id)
-        code = _coerce_str(work_master_code)
-        if not code:
-            return None
-        try:
-            row = db.execute(
-                text(
-                    "SELECT id FROM work_masters WHERE work_master_code = :code LIMIT 1"
-                ),
-                {"code": code},
-            ).fetchone()
-            return int(row[0]) if row and row[0] is not None else None
-        except Exception:
-            return None
-
-    def _mk_key(*parts) -> str:
-        return "|".join([_sanitize_filename_part(_coerce_str(p) or "") for p in parts])
-
-    inserted = 0
-    for entry in results:
-        if not isinstance(entry, dict):
-            continue
-        wm_payload = (
-            entry.get("work_master")
-            if isinstance(entry.get("work_master"), dict)
-            else {}
-        )
-
-        work_master_id = _payload_get(
-            wm_payload, "id", "work_master_id", "workMasterId"
-        )
-        work_master_code = _coerce_str(
-            _payload_get(
-                wm_payload, "work_master_code", "workMasterCode", "wm_code", "wmCode"
-            )
-        )
-        resolved_wm_id = _resolve_work_master_id(
-            (
-                int(work_master_id)
-                if work_master_id is not None and str(work_master_id).isdigit()
-                else None
-            ),
-            work_master_code,
-        )
-
-        # Try to extract gauge from the work_master payload or entry payload
-        gauge = _coerce_str(
-            _payload_get(wm_payload, "gauge", "gauge_code", "gaugeCode", "G")
-        )
-        if not gauge:
-            gauge = _coerce_str(_payload_get(entry, "gauge", "게이지", "gauge"))
-
-        guid = _coerce_str(_payload_get(entry, "GUID", "guid"))
-        gui = _coerce_str(_payload_get(entry, "GUI", "gui"))
-        member_name = _coerce_str(
-            _payload_get(entry, "name", "member", "member_name", "memberName")
-        )
-        category = _coerce_str(_payload_get(entry, "카테고리", "category"))
-        std_num = _coerce_str(
-            _payload_get(
-                entry, "표준타입 번호", "standard_type_number", "standardTypeNumber"
-            )
-        )
-        std_name = _coerce_str(
-            _payload_get(
-                entry, "표준타입 이름", "standard_type_name", "standardTypeName"
-            )
-        )
-        classification = _coerce_str(_payload_get(entry, "분류", "classification"))
-        detail = _coerce_str(
-            _payload_get(
-                entry, "상세분류", "detail_classification", "detailClassification"
-            )
-        )
-        unit = _coerce_str(_payload_get(entry, "단위", "unit"))
-        formula = _coerce_str(_payload_get(entry, "수식", "formula"))
-        substituted = _coerce_str(
-            _payload_get(entry, "대입수식", "substituted_formula", "substitutedFormula")
-        )
-        result_val = _payload_get(entry, "산출결과", "result")
-        result_log = _coerce_str(
-            _payload_get(entry, "산출로그", "result_log", "resultLog")
-        )
-
-        result_float = None
-        if isinstance(result_val, (int, float)):
-            result_float = float(result_val)
-        elif result_val is not None:
-            try:
-                result_float = float(str(result_val).strip())
-            except Exception:
-                result_float = None
-
-        key = _mk_key(
-            rev_key or "",
-            building_name or "",
-            guid or "",
-            gui or "",
-            formula or "",
-            work_master_code or str(resolved_wm_id or ""),
-            detail or "",
-        )
-
+                detail="building name is required in JSON for overwrite mode",
+            )
         try:
-            db.execute(
+            res = db.execute(
                 text(
-                    """
-                    INSERT OR REPLACE INTO calc_result (
-                        key, rev_key, building_name, guid, gui, member_name,
-                        category, standard_type_number, standard_type_name,
-                        classification, detail_classification, unit,
-                        formula, substituted_formula, result, result_log,
-                        work_master_id, work_master_code, gauge, created_at
-                    ) VALUES (
-                        :key, :rev_key, :building_name, :guid, :gui, :member_name,
-                        :category, :standard_type_number, :standard_type_name,
-                        :classification, :detail_classification, :unit,
-                        :formula, :substituted_formula, :result, :result_log,
-                        :work_master_id, :work_master_code, :gauge, :created_at
-                    )
-                    """
+                    "DELETE FROM calc_result WHERE TRIM(COALESCE(building_name,'')) = TRIM(:building_name) AND rev_key = :rev_key"
                 ),
-                {
-                    "key": key,
-                    "rev_key": rev_key,
-                    "building_name": building_name,
-                    "guid": guid,
-                    "gui": gui,
-                    "member_name": member_name,
-                    "category": category,
-                    "standard_type_number": std_num,
-                    "standard_type_name": std_name,
-                    "classification": classification,
-                    "detail_classification": detail,
-                    "unit": unit,
-                    "formula": formula,
-                    "substituted_formula": substituted,
-                    "result": result_float,
-                    "result_log": result_log,
-                    "work_master_id": resolved_wm_id,
-                    "work_master_code": work_master_code,
-                    "gauge": gauge,
-                    "created_at": now_iso,
-                },
+                {"building_name": building_name, "rev_key": rev_key},
             )
-            inserted += 1
+            deleted = int(getattr(res, "rowcount", 0) or 0)
         except Exception:
-            continue
+            db.rollback()
+            raise HTTPException(
+                status_code=500, detail="Failed to overwrite calc results"
+            )
+
+    try:
+        stats = _bulk_insert_calc_results(
+            db,
+            _iter_calc_result_rows(
+                results,
+                rev_key=rev_key,
+                building_name=building_name,
+                work_master_id_by_code=_load_work_master_id_by_code(db),
+                now_iso=datetime.datetime.utcnow().isoformat(),
+            ),
+        )
+        _refresh_calc_result_summary(db, rev_key, [building_name])
+    except ValueError as exc:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(exc))
 
     try:
         db.commit()
@@ -1995,52 +3139,225 @@ def import_calc_result_json(
         "rev_key": rev_key,
         "mode": mode,
         "deleted": deleted,
-        "inserted": inserted,
+        **stats,
     }
 
 
+# ===================
+#  Calc Result listing
+# ===================
+CALC_RESULT_LIST_MAX_LIMIT = 20000
+CALC_RESULT_CACHE_SIZE = 256
+
+# 응답 필드 -> SELECT 컬럼. wm 조인이 필요한 필드는 _CALC_RESULT_WM_FIELDS 참고.
+_CALC_RESULT_LIST_COLUMNS = {
+    "id": ["cr.id AS id"],
+    "created_at": ["cr.created_at AS created_at"],
+    "building_name": ["cr.building_name AS building_name"],
+    "rev_key": ["cr.rev_key AS rev_key"],
+    "category": ["cr.category AS category"],
+    "standard_type_number": ["cr.standard_type_number AS standard_type_number"],
+    "standard_type_name": ["cr.standard_type_name AS standard_type_name"],
+    "classification": ["cr.classification AS classification"],
+    "description": ["cr.detail_classification AS description"],
+    "guid": ["cr.guid AS guid"],
+    "gui": ["cr.gui AS gui"],
+    "member_name": ["cr.member_name AS member_name"],
+    "wm_code": ["COALESCE(wm.work_master_code, cr.work_master_code) AS wm_code"],
+    "gauge": ["COALESCE(cr.gauge, wm.gauge) AS gauge"],
+    "spec": [
+        "wm.cat_large_desc AS cat_large_desc",
+        "wm.cat_mid_desc AS cat_mid_desc",
+        "wm.cat_small_desc AS cat_small_desc",
+        "wm.attr1_spec AS attr1_spec",
+        "wm.attr2_spec AS attr2_spec",
+        "wm.attr3_spec AS attr3_spec",
+    ],
+    "add_spec": ["wm.add_spec AS add_spec"],
+    "formula": ["cr.formula AS formula"],
+    "substituted_formula": ["cr.substituted_formula AS substituted_formula"],
+    "result": ["cr.result AS result"],
+    "result_log": ["cr.result_log AS result_log"],
+    "unit": ["cr.unit AS unit"],
+}
+_CALC_RESULT_WM_FIELDS = {"wm_code", "gauge", "spec", "add_spec"}
+
+# (db file, kind, *params) -> (db revision, value); invalidated by any write to the file.
+_calc_result_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_calc_result_cache_lock = threading.Lock()
+
+
+def _project_db_stat(db_path) -> dict:
+    stat = os.stat(db_path)
+    mtime_ns = int(getattr(stat, "st_mtime_ns", int(stat.st_mtime * 1_000_000_000)))
+    size = int(stat.st_size)
+    return {"revision": f"{mtime_ns}:{size}", "mtime_ns": mtime_ns, "size": size}
+
+
+def _parse_calc_result_fields(fields: Optional[str]) -> List[str]:
+    if fields is None or not str(fields).strip():
+        return list(_CALC_RESULT_LIST_COLUMNS.keys())
+    requested = [f.strip() for f in str(fields).split(",") if f.strip()]
+    unknown = [f for f in requested if f not in _CALC_RESULT_LIST_COLUMNS]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    # id는 커서 계산에 필요하므로 항상 포함
+    selected = ["id"] + [f for f in requested if f != "id"]
+    return list(dict.fromkeys(selected))
+
+
+def _calc_result_list_row(row, selected: List[str]) -> dict:
+    out = {}
+    for field in selected:
+        if field == "id":
+            out["id"] = int(row["id"])
+        elif field == "created_at":
+            out["created_at"] = str(row["created_at"])
+        elif field == "result":
+            out["result"] = float(row["result"]) if row["result"] is not None else None
+        elif field == "spec":
+            out["spec"] = _compose_spec_from_work_master_row(row)
+        else:
+            out[field] = _coerce_str(row[field])
+    return out
+
+
+def _cached_calc_result_value(db: Session, key: tuple, compute):
+    """Return compute() cached per (db file, key) until the DB file revision changes."""
+    db_path = db.get_bind().url.database
+    revision = _project_db_stat(db_path)["revision"]
+    cache_key = (db_path,) + tuple(key)
+    with _calc_result_cache_lock:
+        cached = _calc_result_cache.get(cache_key)
+        if cached is not None and cached[0] == revision:
+            _calc_result_cache.move_to_end(cache_key)
+            return cached[1]
+
+    value = compute()
+    with _calc_result_cache_lock:
+        _calc_result_cache[cache_key] = (revision, value)
+        _calc_result_cache.move_to_end(cache_key)
+        while len(_calc_result_cache) > CALC_RESULT_CACHE_SIZE:
+            _calc_result_cache.popitem(last=False)
+    return value
+
+
 @router.get(
     "/project/{project_identifier}/calc-result",
     response_model=List[schemas.CalcResultRow],
+    response_model_exclude_unset=True,
     tags=["Project Data"],
 )
 def list_calc_results(
     project_identifier: str,
+    response: Response,
     building_name: Optional[str] = None,
     rev_key: Optional[str] = None,
     limit: int = 2000,
     offset: int = 0,
+    cursor: Optional[int] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_project_db_session),
 ):
-    limit = max(1, min(int(limit), 20000))
+    """
+    calc_result 목록 (id 내림차순).
+
+    - cursor: 이전 페이지의 X-Next-Cursor 값. 지정하면 id < cursor 로 이어서 조회(offset 무시).
+    - fields: 반환할 필드 콤마 목록 (예: fields=id,rev_key,result). wm_code/gauge/spec/add_spec 이
+      없으면 work_masters 조인을 생략한다.
+    - 응답 헤더: X-Total-Count (필터 기준 전체 건수), X-Next-Cursor (다음 페이지가 있을 때만).
+    """
+    limit = max(1, min(int(limit), CALC_RESULT_LIST_MAX_LIMIT))
     offset = max(0, int(offset))
     building_name = _coerce_str(building_name)
     rev_key = _coerce_str(rev_key)
+    selected = _parse_calc_result_fields(fields)
+
+    conditions = []
+    params = {}
+    if building_name is not None:
+        conditions.append("cr.building_name = :building_name")
+        params["building_name"] = building_name
+    if rev_key is not None:
+        conditions.append("cr.rev_key = :rev_key")
+        params["rev_key"] = rev_key
+    filter_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    page_conditions = list(conditions)
+    page_params = dict(params, limit=limit)
+    if cursor is not None:
+        page_conditions.append("cr.id < :cursor")
+        page_params["cursor"] = int(cursor)
+        page_sql = "LIMIT :limit"
+    else:
+        page_params["offset"] = offset
+        page_sql = "LIMIT :limit OFFSET :offset"
+    page_where_sql = (
+        f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+    )
+
+    columns = [col for field in selected for col in _CALC_RESULT_LIST_COLUMNS[field]]
+    join_sql = ""
+    if _CALC_RESULT_WM_FIELDS.intersection(selected):
+        join_sql = """
+            LEFT JOIN work_masters wm ON wm.id = cr.work_master_id
+        """
 
     rows = (
+        db.execute(
+            text(
+                f"""
+            SELECT {', '.join(columns)}
+            FROM calc_result cr
+            {join_sql}
+            {page_where_sql}
+            ORDER BY cr.id DESC
+            {page_sql}
+            """
+            ),
+            page_params,
+        )
+        .mappings()
+        .all()
+    )
+
+    output = [_calc_result_list_row(row, selected) for row in rows]
+
+    total = _cached_calc_result_value(
+        db,
+        ("count", building_name, rev_key),
+        lambda: int(
+            db.execute(
+                text(f"SELECT COUNT(*) FROM calc_result cr {filter_sql}"), params
+            ).scalar()
+            or 0
+        ),
+    )
+    response.headers["X-Total-Count"] = str(total)
+    if len(output) == limit:
+        response.headers["X-Next-Cursor"] = str(output[-1]["id"])
+    return output
+
+
+def _build_calc_result_boq(db: Session, rev_key: str) -> dict:
+    # (wm_code, gauge, building) 합계를 calc_result_summary 에서 읽는다. MAX()와 함께 쓴
+    # bare 컬럼은 SQLite에서 해당 최신 행의 값이 되므로, 화면에서 쓰던 "가장 최근 행" 기준
+    # 설명/단위를 그대로 얻는다.
+    grouped = (
         db.execute(
             text(
                 """
             SELECT
-                cr.id AS id,
-                cr.created_at AS created_at,
-                cr.building_name AS building_name,
-                cr.rev_key AS rev_key,
-                cr.category AS category,
-                cr.standard_type_number AS standard_type_number,
-                cr.standard_type_name AS standard_type_name,
-                cr.classification AS classification,
-                cr.detail_classification AS detail_classification,
-                cr.unit AS unit,
-                cr.formula AS formula,
-                cr.substituted_formula AS substituted_formula,
-                cr.result AS result,
-                cr.result_log AS result_log,
-                cr.guid AS guid,
-                cr.gui AS gui,
-                cr.member_name AS member_name,
-                COALESCE(wm.work_master_code, cr.work_master_code) AS wm_code,
-                COALESCE(cr.gauge, wm.gauge) AS gauge,
+                TRIM(COALESCE(wm.work_master_code, NULLIF(s.work_master_code, ''), '')) AS wm_code,
+                TRIM(COALESCE(NULLIF(s.gauge, ''), wm.gauge, '')) AS gauge,
+                s.building_name AS building_name,
+                SUM(s.qty) AS qty,
+                MAX(s.last_calc_result_id) AS rep_id,
+                s.category AS category,
+                s.detail_classification AS detail_classification,
+                s.unit AS unit,
                 wm.add_spec AS add_spec,
                 wm.cat_large_desc AS cat_large_desc,
                 wm.cat_mid_desc AS cat_mid_desc,
@@ -2048,60 +3365,169 @@ def list_calc_results(
                 wm.attr1_spec AS attr1_spec,
                 wm.attr2_spec AS attr2_spec,
                 wm.attr3_spec AS attr3_spec
-            FROM calc_result cr
-            LEFT JOIN work_masters wm
-              ON (wm.id = cr.work_master_id)
-              OR (cr.work_master_id IS NULL AND wm.work_master_code = cr.work_master_code)
-                        WHERE (:building_name IS NULL OR cr.building_name = :building_name)
-                            AND (:rev_key IS NULL OR cr.rev_key = :rev_key)
-            ORDER BY cr.id DESC
-            LIMIT :limit OFFSET :offset
+            FROM calc_result_summary s
+            LEFT JOIN work_masters wm ON wm.id = s.work_master_id
+            WHERE s.rev_key = :rev_key
+              AND TRIM(COALESCE(wm.work_master_code, NULLIF(s.work_master_code, ''), '')) != ''
+            GROUP BY 1, 2, 3
             """
             ),
-            {
-                "building_name": building_name,
-                "rev_key": rev_key,
-                "limit": limit,
-                "offset": offset,
-            },
+            {"rev_key": rev_key},
         )
         .mappings()
         .all()
     )
 
-    output: List[schemas.CalcResultRow] = []
-    for row in rows:
-        row_dict = dict(row)
-        output.append(
-            schemas.CalcResultRow(
-                id=int(row_dict.get("id")),
-                created_at=str(row_dict.get("created_at")),
-                building_name=_coerce_str(row_dict.get("building_name")),
-                rev_key=_coerce_str(row_dict.get("rev_key")),
-                category=_coerce_str(row_dict.get("category")),
-                standard_type_number=_coerce_str(row_dict.get("standard_type_number")),
-                standard_type_name=_coerce_str(row_dict.get("standard_type_name")),
-                classification=_coerce_str(row_dict.get("classification")),
-                description=_coerce_str(row_dict.get("detail_classification")),
-                guid=_coerce_str(row_dict.get("guid")),
-                gui=_coerce_str(row_dict.get("gui")),
-                member_name=_coerce_str(row_dict.get("member_name")),
-                wm_code=_coerce_str(row_dict.get("wm_code")),
-                gauge=_coerce_str(row_dict.get("gauge")),
-                spec=_compose_spec_from_work_master_row(row_dict),
-                add_spec=_coerce_str(row_dict.get("add_spec")),
-                formula=_coerce_str(row_dict.get("formula")),
-                substituted_formula=_coerce_str(row_dict.get("substituted_formula")),
-                result=(
-                    float(row_dict["result"])
-                    if row_dict.get("result") is not None
-                    else None
-                ),
-                result_log=_coerce_str(row_dict.get("result_log")),
-                unit=_coerce_str(row_dict.get("unit")),
-            )
+    building_rank = {}
+    items = {}
+    for row in grouped:
+        building = row["building_name"] or ""
+        rep_id = int(row["rep_id"])
+        building_rank[building] = max(building_rank.get(building, 0), rep_id)
+        item_key = (row["wm_code"], row["gauge"])
+        item = items.get(item_key)
+        if item is None:
+            item = items[item_key] = {"by_building": {}, "rep_id": -1, "rep": None}
+        item["by_building"][building] = item["by_building"].get(building, 0.0) + float(
+            row["qty"] or 0
         )
-    return output
+        if rep_id > item["rep_id"]:
+            item["rep_id"] = rep_id
+            item["rep"] = row
+
+    # 최근 행이 먼저 나오는 순서 (기존 화면의 id DESC 순회와 동일)
+    buildings = sorted(building_rank, key=lambda b: -building_rank[b])
+
+    wm_by_key = {}
+    mid_order = {}
+    wm_rows = db.execute(
+        text(
+            """
+            SELECT work_master_code, gauge, add_spec,
+                   cat_large_code, cat_large_desc, cat_mid_code, cat_mid_desc,
+                   cat_small_code, cat_small_desc
+            FROM work_masters
+            ORDER BY id
+            """
+        )
+    ).mappings()
+    for wm in wm_rows:
+        code = str(wm["work_master_code"] or "").strip()
+        gauge = str(wm["gauge"] or "").strip()
+        wm_by_key[(code, gauge)] = wm
+        large = str(wm["cat_large_desc"] or wm["cat_large_code"] or "").strip()
+        mid = str(wm["cat_mid_desc"] or wm["cat_mid_code"] or "").strip()
+        mids = mid_order.setdefault(large, [])
+        if mid and mid not in mids:
+            mids.append(mid)
+
+    rows = []
+    for (code, gauge), item in sorted(
+        items.items(), key=lambda kv: (kv[0][0], -kv[1]["rep_id"])
+    ):
+        rep = item["rep"]
+        wm = (
+            wm_by_key.get((code, gauge))
+            or wm_by_key.get((code, gauge.upper()))
+            or wm_by_key.get((code.upper(), gauge.upper()))
+        )
+        description = _coerce_str(rep["detail_classification"]) or ""
+        add_spec = _coerce_str(rep["add_spec"]) or ""
+        cat_large = ""
+        cat_mid = ""
+        if wm is not None:
+            cat_large = wm["cat_large_desc"] or wm["cat_large_code"] or ""
+            cat_mid = wm["cat_mid_desc"] or wm["cat_mid_code"] or ""
+            description = wm["cat_small_desc"] or wm["cat_small_code"] or description
+            add_spec = wm["add_spec"] or add_spec
+        cat_large = cat_large or _coerce_str(rep["category"]) or ""
+        values = [item["by_building"].get(b, 0.0) for b in buildings]
+        rows.append(
+            {
+                "wm_code": code,
+                "gauge": gauge,
+                "description": description,
+                "spec": _compose_spec_from_work_master_row(rep) or "",
+                "add_spec": add_spec,
+                "uom": _coerce_str(rep["unit"]) or "",
+                "cat_large_desc": cat_large,
+                "cat_mid_desc": cat_mid,
+                "total": sum(values),
+                "values": values,
+            }
+        )
+
+    return {"buildings": buildings, "rows": rows, "mid_order": mid_order}
+
+
+@router.get(
+    "/project/{project_identifier}/calc-result/boq",
+    response_model=schemas.CalcResultBoqResponse,
+    tags=["Project Data"],
+)
+def read_calc_result_boq(
+    project_identifier: str,
+    rev_key: str,
+    db: Session = Depends(get_project_db_session),
+):
+    """
+    rev_key 기준 Total BOQ 집계 (WM code + gauge 행 x 건물 열).
+
+    - rows[].values 는 buildings 순서와 같은 건물별 수량, total 은 그 합.
+    - 결과는 (rev_key, DB revision) 단위로 캐시된다.
+    """
+    rev_key = _coerce_str(rev_key)
+    if not rev_key:
+        raise HTTPException(status_code=400, detail="rev_key is required")
+
+    payload = _cached_calc_result_value(
+        db, ("boq", rev_key), lambda: _build_calc_result_boq(db, rev_key)
+    )
+    return {"rev_key": rev_key, **payload}
+
+
+def _run_calc_result_summary_job(project_identifier: str, job, commit: bool):
+    try:
+        db_path = project_db.resolve_project_db_path(project_identifier)
+    except (FileNotFoundError, ValueError) as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+    project_db.ensure_extra_tables_once(db_path)
+    conn = sqlite3.connect(db_path.as_posix())
+    try:
+        result = job(conn.cursor())
+        if commit:
+            conn.commit()
+        return result
+    finally:
+        conn.close()
+
+
+@router.post(
+    "/project/{project_identifier}/calc-result/summary/rebuild",
+    tags=["Project Data"],
+)
+def rebuild_calc_result_summary(project_identifier: str):
+    started = time.perf_counter()
+    rows = _run_calc_result_summary_job(
+        project_identifier, project_db.rebuild_calc_result_summary, commit=True
+    )
+    return {
+        "project_identifier": project_identifier,
+        "summary_rows": rows,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 1),
+    }
+
+
+@router.get(
+    "/project/{project_identifier}/calc-result/summary/check",
+    tags=["Project Data"],
+)
+def check_calc_result_summary(project_identifier: str):
+    report = _run_calc_result_summary_job(
+        project_identifier, project_db.check_calc_result_summary, commit=False
+    )
+    return {"project_identifier": project_identifier, **report}
 
 
 @router.get(
@@ -2155,6 +3581,86 @@ def list_calc_result_buildings(
     return [str(r[0]) for r in rows if r and r[0] is not None]
 
 
+def _calc_manual_dirty_scope(db: Session, rev_key: str, building_names: List[str]):
+    """What changed since the last manual update of rev_key (see project_db triggers).
+
+    Returns (seq, scope). scope is None when everything must be recomputed (first
+    run for rev_key, or a change that cannot be traced to entries/buildings),
+    otherwise {"entry_ids": cart entries to redo for every building,
+    "buildings": buildings to redo for every entry}.
+    """
+
+    seq = int(
+        db.execute(text("SELECT COALESCE(MAX(seq), 0) FROM calc_manual_change")).scalar()
+        or 0
+    )
+    last_seq = db.execute(
+        text("SELECT last_seq FROM calc_manual_update_state WHERE rev_key = :rev_key"),
+        {"rev_key": rev_key},
+    ).scalar()
+    if last_seq is None:
+        return seq, None
+
+    entry_ids = set()
+    family_ids = set()
+    dirty_buildings = set()
+    for kind, ref in db.execute(
+        text("SELECT kind, ref FROM calc_manual_change WHERE seq > :last_seq"),
+        {"last_seq": int(last_seq)},
+    ):
+        if kind == "all":
+            return seq, None
+        if kind == "building":
+            dirty_buildings.add(str(ref or "").strip())
+            continue
+        try:
+            ref_id = int(ref)
+        except (TypeError, ValueError):
+            continue
+        if kind == "cart_entry":
+            entry_ids.add(ref_id)
+        elif kind == "calc_family":
+            family_ids.add(ref_id)
+
+    # calc_dictionary 변경 -> 그 family 에 배정된 assignment 를 가진 cart entry
+    for chunk in _chunked(sorted(family_ids)):
+        placeholders = ", ".join(f":f{i}" for i in range(len(chunk)))
+        rows = db.execute(
+            text(
+                f"""
+                SELECT DISTINCT cea.cart_entry_id
+                FROM cart_entry_assignment cea
+                JOIN gwm_family_assign gfa ON gfa.id = cea.assignment_id
+                WHERE gfa.family_list_id IN ({placeholders})
+                """
+            ),
+            {f"f{i}": fid for i, fid in enumerate(chunk)},
+        )
+        entry_ids.update(int(row[0]) for row in rows)
+
+    return seq, {
+        "entry_ids": entry_ids,
+        "buildings": [name for name in building_names if name.strip() in dirty_buildings],
+    }
+
+
+def _stamp_calc_manual_update(db: Session, rev_key: str, seq: int, now_iso: str) -> None:
+    db.execute(
+        text(
+            "INSERT OR REPLACE INTO calc_manual_update_state (rev_key, last_seq, updated_at) "
+            "VALUES (:rev_key, :seq, :updated_at)"
+        ),
+        {"rev_key": rev_key, "seq": int(seq), "updated_at": now_iso},
+    )
+    # 모든 rev_key 가 이미 반영한 변경 기록은 정리 (처음 갱신하는 rev_key 는 전체 재계산)
+    db.execute(
+        text(
+            "DELETE FROM calc_manual_change "
+            "WHERE seq <= (SELECT MIN(last_seq) FROM calc_manual_update_state)"
+        )
+    )
+
+
 @router.post(
     "/project/{project_identifier}/calc-result/manual-update",
     response_model=schemas.CalcResultManualUpdateResponse,
@@ -2163,8 +3669,15 @@ def list_calc_result_buildings(
 def manual_update_calc_results(
     project_identifier: str,
     rev_key: str = Form(...),
+    full: bool = False,
     db: Session = Depends(get_project_db_session),
 ):
+    """Write manual-input (14.Manual_Input) cart entries into calc_result per building.
+
+    By default only the (cart entry, building) rows affected by changes since the
+    last manual update of rev_key are recomputed; `?full=1` recomputes everything.
+    """
+
     rev_key = _coerce_str(rev_key)
     if not rev_key:
         raise HTTPException(status_code=400, detail="rev_key is required")
@@ -2178,9 +3691,20 @@ def manual_update_calc_results(
     if not building_names:
         raise HTTPException(status_code=400, detail="No buildings found")
 
-    rows = db.execute(
-        text("SELECT id, payload FROM workmaster_cart_entries ORDER BY id DESC")
-    ).fetchall()
+    change_seq, scope = _calc_manual_dirty_scope(db, rev_key, building_names)
+    if full:
+        scope = None
+    if scope is None:
+        scope_entry_ids = None
+    elif scope["buildings"]:
+        # 건물이 바뀌면 모든 entry 를 그 건물에 대해 다시 계산
+        scope_entry_ids = None
+    else:
+        scope_entry_ids = scope["entry_ids"]
+
+    cart_entries = _load_cart_entries(
+        db, entry_ids=scope_entry_ids, keys=("assignment_ids", "standard_item_ids")
+    )
 
     cart_entries_scanned = 0
     inserted = 0
@@ -2191,14 +3715,8 @@ def manual_update_calc_results(
     cart_entry_payloads = []
     assignment_ids = set()
     standard_item_ids = set()
-    for row in rows:
+    for entry_id, _created_raw, normalized in cart_entries:
         cart_entries_scanned += 1
-        entry_id = int(row[0])
-        try:
-            payload = json.loads(row[1] or "{}")
-        except Exception:
-            payload = {}
-        normalized = _normalize_cart_payload(payload)
         aids = normalized.get("assignment_ids") or []
         for aid in aids:
             try:
@@ -2518,6 +4036,9 @@ def manual_update_calc_results(
             calc_entries_by_family_list_id.setdefault(fid_int, []).append(entry)
 
     now_iso = datetime.datetime.utcnow().isoformat()
+    written_buildings = set()
+    # (cart_entry_id, formula, variables, target buildings, calc_result columns)
+    manual_rows = []
 
     for cart_entry_id, normalized in cart_entry_payloads:
         aids = normalized.get("assignment_ids") or []
@@ -2616,15 +4137,43 @@ def manual_update_calc_results(
                     continue
                 variables[str(key).strip()] = num
 
-        result_val = _safe_eval_numeric_expr(str(formula), variables)
+        if scope is None or cart_entry_id in scope["entry_ids"]:
+            target_buildings = building_names
+        else:
+            target_buildings = scope["buildings"]
+        manual_rows.append(
+            (
+                cart_entry_id,
+                str(formula),
+                variables,
+                target_buildings,
+                {
+                    "standard_type_number": std_type_number,
+                    "standard_type_name": std_type_name,
+                    "classification": standard_item_type_value or "Manual_Input",
+                    "detail_classification": detail_classification_value,
+                    "unit": unit_val,
+                    "work_master_id": work_master_id,
+                    "work_master_code": work_master_code,
+                    "gauge": gauge_val,
+                },
+            )
+        )
+
+    # 같은 수식은 entry 들의 변수 값을 열로 모아 한 번에 계산
+    result_values = _eval_numeric_exprs(
+        [(formula, variables) for _eid, formula, variables, _b, _m in manual_rows]
+    )
+    result_log = f"manual_update:{now_iso}"
+    for (cart_entry_id, formula, _variables, target_buildings, row_meta), result_val in zip(
+        manual_rows, result_values
+    ):
         if result_val is None:
             skipped += 1
             continue
 
-        substituted_formula = str(formula)
-        result_log = f"manual_update:{now_iso}"
-
-        for bname in building_names:
+        substituted_formula = formula
+        for bname in target_buildings:
             key = f"{_sanitize_filename_part(rev_key)}|{_sanitize_filename_part(bname)}|manual|{cart_entry_id}"
             try:
                 db.execute(
@@ -2653,27 +4202,28 @@ def manual_update_calc_results(
                         "gui": None,
                         "member_name": "Manual_Input",
                         "category": "14.Manual_Input",
-                        "standard_type_number": std_type_number,
-                        "standard_type_name": std_type_name,
-                        "classification": standard_item_type_value or "Manual_Input",
-                        "detail_classification": detail_classification_value,
-                        "unit": unit_val,
-                        "formula": str(formula),
+                        **row_meta,
+                        "formula": formula,
                         "substituted_formula": substituted_formula,
                         "result": float(result_val),
                         "result_log": result_log,
-                        "work_master_id": work_master_id,
-                        "work_master_code": work_master_code,
-                        "gauge": gauge_val,
                         "created_at": now_iso,
                     },
                 )
                 inserted += 1
+                written_buildings.add(bname)
             except Exception:
                 skipped += 1
                 continue
 
+    if scope is None:
+        touched_buildings = building_names
+    else:
+        touched_buildings = [name for name in building_names if name in written_buildings]
     try:
+        if touched_buildings:
+            _refresh_calc_result_summary(db, rev_key, touched_buildings)
+        _stamp_calc_manual_update(db, rev_key, change_seq, now_iso)
         db.commit()
     except Exception:
         db.rollback()
@@ -2682,7 +4232,8 @@ def manual_update_calc_results(
     return {
         "project_identifier": project_identifier,
         "rev_key": rev_key,
-        "buildings": len(building_names),
+        "mode": "full" if scope is None else "incremental",
+        "buildings": len(touched_buildings),
         "cart_entries_scanned": cart_entries_scanned,
         "manual_entries_matched": manual_entries_matched,
         "inserted": inserted,
@@ -2716,6 +4267,7 @@ def delete_calc_results_by_revision(
             {"building_name": building_name, "rev_key": rev_key},
         )
         deleted = int(getattr(res, "rowcount", 0) or 0)
+        _refresh_calc_result_summary(db, rev_key, [building_name])
         db.commit()
     except Exception:
         db.rollback()
@@ -2729,29 +4281,302 @@ def delete_calc_results_by_revision(
     }
 
 
-@router.get(
-    "/project/{project_identifier}/export/db-excel",
-    tags=["Project Data"],
-)
-def export_project_db_excel(project_identifier: str):
-    """Export a human-reviewable Excel report for the project DB.
+EXCEL_EXPORT_WIDTH_SAMPLE_ROWS = 1000
+EXCEL_EXPORT_MAX_WORKERS = 4
 
-    NOTE: This is intentionally *not* a raw table dump. It generates joined/flattened
-    sheets so a person can review without jumping across tables.
+
+# ===================
+#  Report_FamilyList tree
+# ===================
+_NATURAL_KEY_SPLIT = re.compile(r"(\d+)")
+_SEQUENCE_IDENTIFIER_PATTERN = re.compile(r"^(\d+(?:\.\d+)*)([a-zA-Z]*)")
+
+
+def _excel_escape_formula(value):
+    if value is None:
+        return None
+    text_value = str(value)
+    if not text_value:
+        return text_value
+    return text_value if text_value.startswith("'") else f"'{text_value}"
+
+
+def _natural_key(text: str) -> tuple:
+    value = (text or "").strip().casefold()
+    key = []
+    for part in _NATURAL_KEY_SPLIT.split(value):
+        if part.isdigit():
+            try:
+                key.append(int(part))
+            except Exception:
+                key.append(part)
+        else:
+            key.append(part)
+    return tuple(key)
+
+
+def _sequence_sort_key(value) -> Optional[tuple]:
+    """"1.2a" -> ((1, 2), "a"); None when value has no leading sequence number.
+
+    Trailing zero segments are dropped so "1" and "1.0" compare equal, matching the
+    zero-padded comparison the app uses.
     """
 
+    trimmed = str(value).strip() if value is not None else ""
+    if not trimmed:
+        return None
+    match = _SEQUENCE_IDENTIFIER_PATTERN.match(trimmed)
+    if not match:
+        return None
+    numbers = [int(seg) for seg in match.group(1).split(".")]
+    while numbers and numbers[-1] == 0:
+        numbers.pop()
+    return (tuple(numbers), (match.group(2) or "").lower())
+
+
+def _family_sort_key(node) -> tuple:
+    """Sort key for family nodes: sequence number (from sequence_number, else name)
+    first, nodes without one after, then natural name order with blank names last."""
+
+    sequence = _sequence_sort_key(node.get("sequence_number")) or _sequence_sort_key(
+        node.get("name")
+    )
+    name = (node.get("name") or "").strip()
+    return (
+        sequence is None,
+        sequence or ((), ""),
+        not name,
+        _natural_key(name) if name else (),
+    )
+
+
+def _report_int(value) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
     try:
-        db_path = project_db.resolve_project_db_path(project_identifier)
-    except (FileNotFoundError, ValueError) as exc:
-        raise HTTPException(status_code=404, detail=str(exc))
+        text_value = str(value).strip()
+        if not text_value or text_value.lower() == "nan":
+            return None
+        return int(float(text_value))
+    except Exception:
+        return None
+
+
+def _build_family_tree_rows(
+    items,
+    assignments_by_family_id=None,
+    standard_item_name_by_id=None,
+    standard_item_type_by_id=None,
+    standard_item_parent_by_id=None,
+):
+    """Flatten the family tree (as shown in the app) with the assigned standard items
+    nested right under each family node.
+
+    Children maps are indexed and sorted once; both trees are walked iteratively.
+    """
+
+    assignments_by_family_id = assignments_by_family_id or {}
+    standard_item_name_by_id = standard_item_name_by_id or {}
+    standard_item_type_by_id = standard_item_type_by_id or {}
+    standard_item_parent_by_id = standard_item_parent_by_id or {}
+
+    node_by_id = {}
+    for item in items:
+        node_id = _report_int(item.get("id"))
+        if node_id is None:
+            continue
+        node_by_id[node_id] = {
+            **item,
+            "id": node_id,
+            "parent_id": _report_int(item.get("parent_id")),
+        }
 
-    project_db.ensure_extra_tables(db_path)
+    family_children = {}
+    family_roots = []
+    for node in node_by_id.values():
+        parent_id = node["parent_id"]
+        if parent_id is not None and parent_id in node_by_id:
+            family_children.setdefault(parent_id, []).append(node)
+        else:
+            family_roots.append(node)
+    family_roots.sort(key=_family_sort_key)
+    for children in family_children.values():
+        children.sort(key=_family_sort_key)
+
+    # Standard item forest, indexed once and shared by every family node.
+    std_parent = {}
+    for sid, pid in standard_item_parent_by_id.items():
+        sid_int = _report_int(sid)
+        if sid_int is not None:
+            std_parent[sid_int] = _report_int(pid)
+
+    def _std_sort_key(sid: int):
+        t = (standard_item_type_by_id.get(sid) or "").strip()
+        # Prefer GWM then SWM, then others
+        type_rank = 2
+        if t == "GWM":
+            type_rank = 0
+        elif t == "SWM":
+            type_rank = 1
+        name = (standard_item_name_by_id.get(sid) or "").strip()
+        return (type_rank, _natural_key(name), sid)
+
+    std_ancestors = {}
+
+    def _ancestors(sid: int) -> tuple:
+        chain = std_ancestors.get(sid)
+        if chain is not None:
+            return chain
+        path = []
+        seen = {sid}
+        pid = std_parent.get(sid)
+        while pid is not None and pid not in seen:
+            cached = std_ancestors.get(pid)
+            if cached is not None:
+                path.append(pid)
+                path.extend(cached)
+                break
+            path.append(pid)
+            seen.add(pid)
+            pid = std_parent.get(pid)
+        chain = std_ancestors[sid] = tuple(path)
+        return chain
+
+    assigned_by_family_id = {}
+    for family_id, assigned in assignments_by_family_id.items():
+        assigned_by_std_id = {}
+        for a in assigned or []:
+            sid = a.get("standard_item_id")
+            try:
+                sid_int = int(sid) if sid is not None else None
+            except Exception:
+                sid_int = None
+            if sid_int is None:
+                continue
+            # Keep the first assignment if duplicates exist.
+            assigned_by_std_id.setdefault(sid_int, a)
+        if assigned_by_std_id:
+            assigned_by_family_id[family_id] = assigned_by_std_id
+
+    # A family's included set (assigned items + all their ancestors) is closed under
+    # parents, so its walk order is the preorder of the whole forest restricted to
+    # it. Rank/depth every reachable item once; items stuck in a parent cycle stay
+    # unranked and are skipped, as before.
+    std_children = {}
+    std_roots = {
+        sid
+        for assigned_by_std_id in assigned_by_family_id.values()
+        for sid in assigned_by_std_id
+        if sid not in std_parent
+    }
+    for sid, pid in std_parent.items():
+        if pid is None:
+            std_roots.add(sid)
+        else:
+            std_children.setdefault(pid, []).append(sid)
+            if pid not in std_parent:
+                std_roots.add(pid)
+    std_rank = {}
+    std_depth = {}
+    stack = [(sid, 0) for sid in sorted(std_roots, key=_std_sort_key, reverse=True)]
+    while stack:
+        sid, depth = stack.pop()
+        if sid in std_rank:
+            continue
+        std_rank[sid] = len(std_rank)
+        std_depth[sid] = depth
+        children = std_children.get(sid)
+        if children:
+            children.sort(key=_std_sort_key, reverse=True)
+            stack.extend((child_id, depth + 1) for child_id in children)
+
+    rows = []
+
+    def _append_standard_item_rows(family_id: int, base_level: int):
+        assigned_by_std_id = assigned_by_family_id.get(family_id)
+        if not assigned_by_std_id:
+            return
+
+        included_ids = set(assigned_by_std_id)
+        for sid in assigned_by_std_id:
+            included_ids.update(_ancestors(sid))
+        base_level = int(base_level) + 1
+        for sid in sorted(
+            (sid for sid in included_ids if sid in std_rank), key=std_rank.__getitem__
+        ):
+            depth = std_depth[sid]
+            assignment = assigned_by_std_id.get(sid)
+            rows.append(
+                {
+                    "level": base_level + depth,
+                    "sequence_number": None,
+                    "name": standard_item_name_by_id.get(sid),
+                    "item_type": standard_item_type_by_id.get(sid),
+                    "id": sid,
+                    "parent_id": std_parent[sid] if depth else family_id,
+                    "description": (
+                        assignment.get("assignment_description") if assignment else None
+                    ),
+                    "formula": (
+                        _excel_escape_formula(assignment.get("formula"))
+                        if assignment
+                        else None
+                    ),
+                    "created_at": (
+                        (assignment.get("assigned_at") or assignment.get("created_at"))
+                        if assignment
+                        else None
+                    ),
+                }
+            )
+
+    stack = [(node, 0) for node in reversed(family_roots)]
+    while stack:
+        node, level = stack.pop()
+        seq = (node.get("sequence_number") or "").strip()
+        name = (node.get("name") or "").strip() or "Unnamed"
+        rows.append(
+            {
+                "level": int(level),
+                "sequence_number": seq or None,
+                "name": name,
+                "item_type": node.get("item_type"),
+                "id": node["id"],
+                "parent_id": node["parent_id"],
+                "description": node.get("description"),
+                "formula": None,
+                "created_at": node.get("created_at"),
+            }
+        )
+        # Insert assigned standard items right under this family node, preserving hierarchy.
+        _append_standard_item_rows(node["id"], int(level))
+        stack.extend(
+            (child, level + 1)
+            for child in reversed(family_children.get(node["id"], ()))
+        )
+
+    return rows
+
+
+def _write_project_db_excel(
+    project_identifier: str, db_path, output_path, progress=None
+) -> None:
+    """Write a human-reviewable Excel report for the project DB to output_path.
+
+    NOTE: This is intentionally *not* a raw table dump. It generates joined/flattened
+    sheets so a person can review without jumping across tables.
+    `progress(sheet_name, sheet_index, sheet_count, rows_written)` is called as
+    each report sheet starts and once more when all are written.
+    """
 
-    pjt_abbr = None
     try:
         from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
         from openpyxl.utils import get_column_letter
         from openpyxl.styles import Alignment, Font, PatternFill
+        from openpyxl.styles.fonts import DEFAULT_FONT
     except Exception as exc:
         raise HTTPException(status_code=500, detail="Excel export dependency missing")
 
@@ -2783,22 +4608,39 @@ def export_project_db_excel(project_identifier: str):
                 return str(value)
         return value
 
-    def _excel_escape_formula(value):
-        if value is None:
-            return None
-        text_value = str(value)
-        if not text_value:
-            return text_value
-        return text_value if text_value.startswith("'") else f"'{text_value}"
-
-    wb = Workbook()
-    if wb.worksheets:
-        wb.remove(wb.worksheets[0])
+    # Write-only workbook: rows are flushed to temp files as they are appended, so
+    # column widths/freeze panes must be set before the first row of each sheet.
+    wb = Workbook(write_only=True)
 
     sheet_names = set()
     generated_at = datetime.datetime.now().isoformat(timespec="seconds")
 
-    def _write_sheet_from_df(title: str, df: "pd.DataFrame"):
+    def _sample_column_widths(df: "pd.DataFrame") -> list:
+        # Basic width cap to keep file readable (sampled, not a full column scan)
+        max_lens = [len(str(col_name)) for col_name in df.columns]
+        step = max(1, -(-len(df.index) // EXCEL_EXPORT_WIDTH_SAMPLE_ROWS))
+        sample = df.iloc[::step]
+        for values in sample.itertuples(index=False, name=None):
+            for idx, value in enumerate(values):
+                value = _excel_value(value)
+                if value is None or max_lens[idx] >= 60:
+                    continue
+                max_lens[idx] = max(max_lens[idx], len(str(value)))
+        return [min(60, max(10, min(60, max_len) + 2)) for max_len in max_lens]
+
+    def _write_sheet_from_df(
+        title: str,
+        df: "pd.DataFrame",
+        widths: Optional[dict] = None,
+        style_row=None,
+        row_height=None,
+    ):
+        """Append df to a new write-only sheet.
+
+        widths: {column name: width} overrides for the sampled widths.
+        style_row(ws, row_idx, values) -> cells, row_height(values) -> height.
+        """
+
         ws = wb.create_sheet(_safe_sheet_name(title, sheet_names))
         ws.freeze_panes = "A2"
 
@@ -2806,323 +4648,737 @@ def export_project_db_excel(project_identifier: str):
             ws.append(["(no rows)"])
             return ws
 
-        ws.append(list(df.columns))
-        for _, row in df.iterrows():
-            ws.append([_excel_value(v) for v in row.tolist()])
+        columns = list(df.columns)
+        widths = widths or {}
+        for idx, width in enumerate(_sample_column_widths(df), start=1):
+            ws.column_dimensions[get_column_letter(idx)].width = widths.get(
+                columns[idx - 1], width
+            )
 
-        # Basic width cap to keep file readable
-        for idx, col_name in enumerate(df.columns, start=1):
-            col_letter = get_column_letter(idx)
-            max_len = len(str(col_name))
-            for cell in ws[col_letter]:
-                if cell.value is None:
-                    continue
-                max_len = max(max_len, len(str(cell.value)))
-                if max_len > 60:
-                    max_len = 60
-                    break
-            ws.column_dimensions[col_letter].width = min(60, max(10, max_len + 2))
+        def _append(row_idx: int, values: list):
+            if row_height is not None:
+                ws.row_dimensions[row_idx].height = row_height(values)
+            ws.append(style_row(ws, row_idx, values) if style_row else values)
+            if row_height is not None:
+                # already written; keep row_dimensions from growing with the sheet
+                ws.row_dimensions.pop(row_idx, None)
+
+        _append(1, columns)
+        for row_idx, values in enumerate(
+            df.itertuples(index=False, name=None), start=2
+        ):
+            _append(row_idx, [_excel_value(v) for v in values])
 
         return ws
 
-    conn = sqlite3.connect(db_path.as_posix())
+    executor = ThreadPoolExecutor(
+        max_workers=EXCEL_EXPORT_MAX_WORKERS, thread_name_prefix="db-excel"
+    )
     try:
 
-        def _natural_key(text: str):
-            import re
+        def _read_df(conn, query: str, params=None) -> "pd.DataFrame":
+            try:
+                return pd.read_sql_query(query, conn, params=params)
+            except Exception:
+                return pd.DataFrame()
+
+        buildings_sql = "SELECT id, name AS building_name, created_at FROM building_list ORDER BY id"
+        standard_items_sql = "SELECT id, name AS standard_item_name, type AS standard_item_type, parent_id, derive_from FROM standard_items ORDER BY id"
+        work_masters_sql = "SELECT id, discipline, work_master_code, cat_large_code, cat_large_desc, cat_mid_code, cat_mid_desc, cat_small_code, cat_small_desc, attr1_code, attr1_spec, attr2_code, attr2_spec, attr3_code, attr3_spec, attr4_code, attr4_spec, attr5_code, attr5_spec, attr6_code, attr6_spec, uom1, uom2, work_group_code, new_old_code, add_spec, gauge FROM work_masters ORDER BY id"
+        standard_item_selections_sql = """
+            SELECT
+              sel.id,
+              sel.standard_item_id,
+              si.name AS standard_item_name,
+              si.type AS standard_item_type,
+              sel.work_master_id,
+              wm.work_master_code,
+              wm.cat_large_code,
+              wm.cat_mid_code,
+              wm.cat_small_code,
+              sel.created_at,
+              sel.updated_at
+            FROM standard_item_work_master_select sel
+            LEFT JOIN standard_items si ON si.id = sel.standard_item_id
+            LEFT JOIN work_masters wm ON wm.id = sel.work_master_id
+            ORDER BY sel.standard_item_id
+            """
+        gwm_family_assign_sql = """
+            SELECT
+              g.id,
+              g.family_list_id,
+              fl.name AS family_name,
+              g.standard_item_id,
+              si.name AS standard_item_name,
+              si.type AS standard_item_type,
+              g.formula,
+              g.description,
+              g.assigned_at,
+              g.created_at
+            FROM gwm_family_assign g
+            LEFT JOIN family_list fl ON fl.id = g.family_list_id
+            LEFT JOIN standard_items si ON si.id = g.standard_item_id
+            ORDER BY g.id
+            """
+        family_revit_types_sql = """
+            SELECT
+              frt.id,
+              frt.family_list_id,
+              fl.name AS family_name,
+              frt.type_name,
+              frt.building_name,
+              frt.created_at
+            FROM family_revit_type frt
+            LEFT JOIN family_list fl ON fl.id = frt.family_list_id
+            ORDER BY frt.id
+            """
+        calc_dictionary_sql = """
+            SELECT
+              c.id,
+              c.family_list_id,
+              fl.name AS family_name,
+              c.calc_code,
+              c.symbol_key,
+              c.symbol_value,
+              c.created_at
+            FROM calc_dictionary c
+            LEFT JOIN family_list fl ON fl.id = c.family_list_id
+            WHERE COALESCE(c.is_deleted, 0) = 0
+            ORDER BY c.id
+            """
+
+        def _prepare_report_wm(conn):
+            """Report_WM (WM pre-check) rows + per-row "selected in Standard Select" flags."""
+
+            df_wm_precheck_raw = _read_df(
+                conn,
+                """
+                SELECT
+                  wm.id AS work_master_id,
+                  COALESCE(wmp.use_yn, 0) AS use_yn,
+                                wmp.other_opinion,
+                  wm.work_master_code,
+                  wm.gauge,
+                  wm.uom1,
+                  wm.uom2,
+                  wm.add_spec,
+                  wm.discipline,
+                  wm.cat_large_code,
+                  wm.cat_large_desc,
+                  wm.cat_mid_code,
+                  wm.cat_mid_desc,
+                  wm.cat_small_code,
+                  wm.cat_small_desc,
+                  wm.attr1_code,
+                  wm.attr1_spec,
+                  wm.attr2_code,
+                  wm.attr2_spec,
+                  wm.attr3_code,
+                  wm.attr3_spec,
+                  wm.attr4_code,
+                  wm.attr4_spec,
+                  wm.attr5_code,
+                  wm.attr5_spec,
+                  wm.attr6_code,
+                  wm.attr6_spec,
+                  wm.work_group_code,
+                  wm.new_old_code,
+                  wmp.updated_at
+                FROM work_masters wm
+                LEFT JOIN work_master_precheck wmp ON wmp.work_master_id = wm.id
+                WHERE LOWER(COALESCE(TRIM(wm.new_old_code), '')) <> 'old'
+                  AND (wm.work_master_code NOT LIKE 'S%' OR COALESCE(wm.cat_mid_code, '') = 'AA')
+                  AND (wm.work_master_code NOT LIKE 'F%' OR COALESCE(wm.cat_large_code, '') = 'F01')
+                ORDER BY wm.work_master_code, wm.gauge, wm.id
+                """
+            )
+
+            def _wm_trim(value):
+                return str(value).strip() if value is not None else ""
+
+            def _wm_summary_parts(row) -> list:
+                parts = []
+
+                def add(label, value):
+                    v = _wm_trim(value)
+                    if not v:
+                        return
+                    parts.append((label, v))
+
+                add("Discipline", row.get("discipline"))
+                add(
+                    "Large",
+                    " ".join(
+                        [
+                            _wm_trim(row.get("cat_large_code")),
+                            _wm_trim(row.get("cat_large_desc")),
+                        ]
+                    ).strip(),
+                )
+                add(
+                    "Mid",
+                    " ".join(
+                        [
+                            _wm_trim(row.get("cat_mid_code")),
+                            _wm_trim(row.get("cat_mid_desc")),
+                        ]
+                    ).strip(),
+                )
+                add(
+                    "Small",
+                    " ".join(
+                        [
+                            _wm_trim(row.get("cat_small_code")),
+                            _wm_trim(row.get("cat_small_desc")),
+                        ]
+                    ).strip(),
+                )
+                add(
+                    "Attr1",
+                    " ".join(
+                        [_wm_trim(row.get("attr1_code")), _wm_trim(row.get("attr1_spec"))]
+                    ).strip(),
+                )
+                add(
+                    "Attr2",
+                    " ".join(
+                        [_wm_trim(row.get("attr2_code")), _wm_trim(row.get("attr2_spec"))]
+                    ).strip(),
+                )
+                add(
+                    "Attr3",
+                    " ".join(
+                        [_wm_trim(row.get("attr3_code")), _wm_trim(row.get("attr3_spec"))]
+                    ).strip(),
+                )
+                add(
+                    "Attr4",
+                    " ".join(
+                        [_wm_trim(row.get("attr4_code")), _wm_trim(row.get("attr4_spec"))]
+                    ).strip(),
+                )
+                add(
+                    "Attr5",
+                    " ".join(
+                        [_wm_trim(row.get("attr5_code")), _wm_trim(row.get("attr5_spec"))]
+                    ).strip(),
+                )
+                add(
+                    "Attr6",
+                    " ".join(
+                        [_wm_trim(row.get("attr6_code")), _wm_trim(row.get("attr6_spec"))]
+                    ).strip(),
+                )
+                add("Group", row.get("work_group_code"))
+                add("New/Old", row.get("new_old_code"))
+
+                return parts
+
+            df_wm_precheck = (
+                df_wm_precheck_raw.copy()
+                if df_wm_precheck_raw is not None
+                else pd.DataFrame()
+            )
 
-            value = (text or "").strip().casefold()
-            parts = re.split(r"(\d+)", value)
-            key = []
-            for part in parts:
-                if part.isdigit():
+            selected_work_master_ids = set()
+            try:
+                df_selected = _read_df(
+                    conn,
+                    "SELECT work_master_id FROM standard_item_work_master_select"
+                )
+                if df_selected is not None and not df_selected.empty:
+                    for v in df_selected["work_master_id"].tolist():
+                        try:
+                            selected_work_master_ids.add(int(v))
+                        except Exception:
+                            continue
+            except Exception:
+                selected_work_master_ids = set()
+
+            selected_row_flags = []
+            if df_wm_precheck is not None and not df_wm_precheck.empty:
+                ui_use = []
+                ui_code = []
+                ui_gauge = []
+                ui_unit = []
+                ui_spec = []
+                ui_other_opinion = []
+                ui_work_master = []
+                for r in df_wm_precheck.to_dict(orient="records"):
                     try:
-                        key.append(int(part))
+                        wm_id = r.get("work_master_id")
+                        selected_row_flags.append(
+                            int(wm_id) in selected_work_master_ids
+                            if wm_id is not None
+                            else False
+                        )
                     except Exception:
-                        key.append(part)
-                else:
-                    key.append(part)
-            return key
+                        selected_row_flags.append(False)
+
+                    wm_code = _wm_trim(r.get("work_master_code"))
+                    gauge_value = _wm_trim(r.get("gauge")).upper()
+                    wm_title = (
+                        (f"{wm_code}({gauge_value})" if gauge_value else wm_code)
+                        if wm_code
+                        else (f"({gauge_value})" if gauge_value else "코드 정보 없음")
+                    )
+
+                    headline = (
+                        _wm_trim(r.get("cat_large_desc"))
+                        or _wm_trim(r.get("cat_mid_desc"))
+                        or _wm_trim(r.get("cat_small_desc"))
+                        or wm_title
+                    )
 
-        def _parse_sequence_identifier(value):
-            import re
+                    unit_label = " / ".join(
+                        [v for v in [_wm_trim(r.get("uom1")), _wm_trim(r.get("uom2"))] if v]
+                    )
+                    spec_value = str(r.get("add_spec") or "")
+                    other_opinion_value = str(r.get("other_opinion") or "")
 
-            trimmed = str(value).strip() if value is not None else ""
-            if not trimmed:
-                return None
-            match = re.match(r"^(\d+(?:\.\d+)*)([a-zA-Z]*)", trimmed)
-            if not match:
-                return None
-            number_parts = []
-            for seg in match.group(1).split("."):
-                try:
-                    number_parts.append(int(seg))
-                except Exception:
-                    return None
-            suffix = (match.group(2) or "").lower()
-            return {"numbers": number_parts, "suffix": suffix}
-
-        def _get_sequence_identifier(node):
-            return _parse_sequence_identifier(
-                node.get("sequence_number")
-            ) or _parse_sequence_identifier(node.get("name"))
-
-        def _compare_sequence_identifiers(a, b):
-            max_len = max(len(a["numbers"]), len(b["numbers"]))
-            for i in range(max_len):
-                va = a["numbers"][i] if i < len(a["numbers"]) else 0
-                vb = b["numbers"][i] if i < len(b["numbers"]) else 0
-                if va != vb:
-                    return -1 if va < vb else 1
-            if a["suffix"] != b["suffix"]:
-                if not a["suffix"]:
-                    return -1
-                if not b["suffix"]:
-                    return 1
-                return -1 if a["suffix"] < b["suffix"] else 1
-            return 0
-
-        def _compare_family_nodes(a, b):
-            ida = _get_sequence_identifier(a)
-            idb = _get_sequence_identifier(b)
-            if ida and idb:
-                c = _compare_sequence_identifiers(ida, idb)
-                if c != 0:
-                    return c
-            elif ida:
-                return -1
-            elif idb:
-                return 1
-
-            name_a = (a.get("name") or "").strip()
-            name_b = (b.get("name") or "").strip()
-            if not name_a:
-                return 1 if name_b else 0
-            if not name_b:
-                return -1
-            ka = _natural_key(name_a)
-            kb = _natural_key(name_b)
-            if ka == kb:
-                return 0
-            return -1 if ka < kb else 1
-
-        def _build_family_tree_rows(
-            items,
-            assignments_by_family_id=None,
-            standard_item_name_by_id=None,
-            standard_item_type_by_id=None,
-            standard_item_parent_by_id=None,
-        ):
-            from functools import cmp_to_key
-            import math
+                    parts = _wm_summary_parts(r)
+                    summary = " | ".join([f"{k}={v}" for k, v in parts])
+                    work_master_cell = f"{headline}\n{wm_title}" + (
+                        f"\n{summary}" if summary else ""
+                    )
 
-            def _to_int_or_none(value):
-                if value is None:
-                    return None
-                if isinstance(value, float) and math.isnan(value):
-                    return None
-                try:
-                    text = str(value).strip()
-                    if not text or text.lower() == "nan":
-                        return None
-                    return int(float(text))
-                except Exception:
-                    return None
+                    ui_use.append(bool(r.get("use_yn")))
+                    ui_code.append(wm_code)
+                    ui_gauge.append(gauge_value)
+                    ui_unit.append(unit_label)
+                    ui_spec.append(spec_value)
+                    ui_other_opinion.append(other_opinion_value)
+                    ui_work_master.append(work_master_cell)
+
+                # Insert UI columns first (same order as WM pre-check table)
+                df_wm_precheck.insert(0, "Work Master", ui_work_master)
+                df_wm_precheck.insert(0, "기타의견", ui_other_opinion)
+                df_wm_precheck.insert(0, "Spec", ui_spec)
+                df_wm_precheck.insert(0, "Unit", ui_unit)
+                df_wm_precheck.insert(0, "Gauge", ui_gauge)
+                df_wm_precheck.insert(0, "WM Code", ui_code)
+                df_wm_precheck.insert(0, "Use", ui_use)
+
+                # Omit columns from `work_master_id` and everything to the right.
+                if "work_master_id" in df_wm_precheck.columns:
+                    keep_end = int(df_wm_precheck.columns.get_loc("work_master_id"))
+                    df_wm_precheck = df_wm_precheck.loc[
+                        :, df_wm_precheck.columns[:keep_end]
+                    ]
 
-            node_by_id = {}
-            for item in items:
-                node_id = _to_int_or_none(item.get("id"))
-                if node_id is None:
-                    continue
-                parent_id = _to_int_or_none(item.get("parent_id"))
-                node_by_id[node_id] = {
-                    **item,
-                    "id": node_id,
-                    "parent_id": parent_id,
-                    "children": [],
-                }
+            return df_wm_precheck, selected_row_flags
+
+        def _write_report_wm(title: str, prepared) -> int:
+            df_wm_precheck, selected_row_flags = prepared
+
+            # --- WM pre-check screen color cues (approximation) ---
+            # - Gauge text is purple & bold
+            # - WM Code cell is bold, and highlighted when selected in Standard Select
+            # - UI-style text columns wrap; fonts scaled down (~80%); rows sized by line count
+            scale = 0.8
+            default_font_size = 11
+            default_row_height = 15
+            base_line_height = default_row_height * scale
+            scaled_size = default_font_size * scale
+
+            header_fill = PatternFill("solid", fgColor="FFF9FAFB")
+            header_font = Font(bold=True, size=scaled_size)
+            plain_font = copy.copy(DEFAULT_FONT)
+            plain_font.size = scaled_size
+            gauge_font = Font(color="FF9333EA", bold=True, size=scaled_size)
+            wm_code_font = Font(bold=True, size=scaled_size)
+            wm_selected_fill = PatternFill("solid", fgColor="FFEDE9FE")
+            wm_selected_font = Font(color="FF4C1D95", bold=True, size=scaled_size)
+            center_alignment = Alignment(vertical="center")
+            wrap_alignment = Alignment(wrap_text=True, vertical="center")
+            use_alignment = Alignment(horizontal="center", vertical="center")
+
+            wm_columns = list(df_wm_precheck.columns)
+            wm_col_index = {name: idx for idx, name in enumerate(wm_columns, start=1)}
+            wm_wrap_cols = {
+                wm_col_index[name]
+                for name in ("Spec", "기타의견", "Work Master")
+                if name in wm_col_index
+            }
+            col_use = wm_col_index.get("Use")
+            col_wm_code = wm_col_index.get("WM Code")
+            col_gauge = wm_col_index.get("Gauge")
+
+            # Assigning Font/Alignment objects hashes them per cell; resolve each
+            # (font, alignment, fill) combination to a style array once and copy it.
+            wm_style_cache = {}
+
+            def _wm_cell(ws, value, font, alignment, fill=None):
+                key = (id(font), id(alignment), id(fill))
+                style = wm_style_cache.get(key)
+                if style is None:
+                    proto = WriteOnlyCell(ws)
+                    proto.font = font
+                    proto.alignment = alignment
+                    if fill is not None:
+                        proto.fill = fill
+                    style = wm_style_cache[key] = proto._style
+                cell = WriteOnlyCell(ws, value=value)
+                cell._style = copy.copy(style)
+                return cell
+
+            def _style_wm_row(ws, row_idx: int, values: list) -> list:
+                if row_idx == 1:
+                    return [
+                        _wm_cell(ws, value, header_font, center_alignment, header_fill)
+                        for value in values
+                    ]
+                selected = row_idx - 2 < len(selected_row_flags) and bool(
+                    selected_row_flags[row_idx - 2]
+                )
+                cells = []
+                for col_idx, value in enumerate(values, start=1):
+                    font = plain_font
+                    fill = None
+                    alignment = center_alignment
+                    if col_idx in wm_wrap_cols:
+                        alignment = wrap_alignment
+                    elif col_idx == col_use:
+                        alignment = use_alignment
+
+                    if col_idx == col_gauge:
+                        font = gauge_font
+                    elif col_idx == col_wm_code:
+                        if selected:
+                            fill = wm_selected_fill
+                            font = wm_selected_font
+                        else:
+                            font = wm_code_font
+                    cells.append(_wm_cell(ws, value, font, alignment, fill))
+                return cells
+
+            def _wm_row_height(values: list) -> float:
+                max_lines = 1
+                for value in values:
+                    if value is None:
+                        continue
+                    max_lines = max(max_lines, str(value).count("\n") + 1)
+                return max(1, base_line_height * max_lines)
+
+            _write_sheet_from_df(
+                title,
+                df_wm_precheck,
+                widths={"Spec": 40, "기타의견": 40, "Work Master": 60},
+                style_row=_style_wm_row,
+                row_height=_wm_row_height,
+            )
+            return int(len(df_wm_precheck.index))
+
+        def _prepare_report_family_list(conn):
+            """Family list (tree, as shown in app) + assigned standard items under each node."""
+
+            df_family_raw = _read_df(
+                conn,
+                "SELECT id, parent_id, sequence_number, name, item_type, description, created_at FROM family_list ORDER BY id"
+            )
+            df_family_assignments = _read_df(
+                conn,
+                """
+                SELECT
+                  g.id AS assignment_id,
+                  g.family_list_id,
+                  g.standard_item_id,
+                  si.name AS standard_item_name,
+                  si.type AS standard_item_type,
+                  g.formula,
+                  g.description AS assignment_description,
+                  g.assigned_at,
+                  g.created_at
+                FROM gwm_family_assign g
+                LEFT JOIN standard_items si ON si.id = g.standard_item_id
+                ORDER BY g.family_list_id, si.type, si.name, g.id
+                """
+            )
+
+            # Project abbreviation (for derived item name formatting)
+            pjt_abbr = None
+            try:
+                df_meta = _read_df(
+                    conn,
+                    "SELECT pjt_abbr FROM project_metadata ORDER BY id LIMIT 1"
+                )
+                if df_meta is not None and not df_meta.empty:
+                    raw_abbr = df_meta.iloc[0].get("pjt_abbr")
+                    if raw_abbr is not None:
+                        abbr = str(raw_abbr).strip()
+                        pjt_abbr = abbr or None
+            except Exception:
+                pjt_abbr = None
 
-            roots = []
-            for node_id, node in node_by_id.items():
-                parent_id = node.get("parent_id")
-                if parent_id is not None and parent_id in node_by_id:
-                    node_by_id[parent_id]["children"].append(node)
-                else:
-                    roots.append(node)
-
-            def sort_nodes(nodes):
-                nodes.sort(key=cmp_to_key(_compare_family_nodes))
-                for n in nodes:
-                    if n.get("children"):
-                        sort_nodes(n["children"])
-
-            sort_nodes(roots)
-
-            rows = []
-
-            assignments_by_family_id = assignments_by_family_id or {}
-            standard_item_name_by_id = standard_item_name_by_id or {}
-            standard_item_type_by_id = standard_item_type_by_id or {}
-            standard_item_parent_by_id = standard_item_parent_by_id or {}
-
-            def _build_standard_item_subtree_rows(family_id: int, base_level: int):
-                assigned = assignments_by_family_id.get(family_id, []) or []
-                if not assigned:
-                    return
-
-                assigned_by_std_id = {}
-                for a in assigned:
-                    sid = a.get("standard_item_id")
+            # Standard item hierarchy (for indentation of assigned items)
+            df_standard_items_hier = _read_df(
+                conn,
+                "SELECT id, parent_id, derive_from, name AS standard_item_name, type AS standard_item_type FROM standard_items"
+            )
+            standard_item_name_by_id = {}
+            standard_item_type_by_id = {}
+            standard_item_parent_by_id = {}
+            standard_item_derive_from_by_id = {}
+            if df_standard_items_hier is not None and not df_standard_items_hier.empty:
+                for r in df_standard_items_hier.to_dict(orient="records"):
+                    sid = r.get("id")
                     try:
                         sid_int = int(sid) if sid is not None else None
                     except Exception:
                         sid_int = None
                     if sid_int is None:
                         continue
-                    # Keep the first assignment if duplicates exist.
-                    assigned_by_std_id.setdefault(sid_int, a)
-
-                if not assigned_by_std_id:
-                    return
-
-                included_ids = set(assigned_by_std_id.keys())
-                stack = list(included_ids)
-                while stack:
-                    sid = stack.pop()
-                    pid = standard_item_parent_by_id.get(sid)
-                    if pid is None:
-                        continue
-                    try:
-                        pid_int = int(pid)
-                    except Exception:
-                        continue
-                    if pid_int not in included_ids:
-                        included_ids.add(pid_int)
-                        stack.append(pid_int)
-
-                children_by_parent = {sid: [] for sid in included_ids}
-                roots = []
-                for sid in included_ids:
-                    pid = standard_item_parent_by_id.get(sid)
+                    standard_item_name_by_id[sid_int] = r.get("standard_item_name")
+                    standard_item_type_by_id[sid_int] = r.get("standard_item_type")
+                    pid = r.get("parent_id")
                     try:
                         pid_int = int(pid) if pid is not None else None
                     except Exception:
                         pid_int = None
-                    if pid_int is not None and pid_int in included_ids:
-                        children_by_parent[pid_int].append(sid)
-                    else:
-                        roots.append(sid)
-
-                def _std_sort_key(sid: int):
-                    t = (standard_item_type_by_id.get(sid) or "").strip()
-                    # Prefer GWM then SWM, then others
-                    type_rank = 2
-                    if t == "GWM":
-                        type_rank = 0
-                    elif t == "SWM":
-                        type_rank = 1
-                    name = (standard_item_name_by_id.get(sid) or "").strip()
-                    return (type_rank, _natural_key(name), sid)
-
-                for pid in list(children_by_parent.keys()):
-                    children_by_parent[pid].sort(key=_std_sort_key)
-                roots.sort(key=_std_sort_key)
-
-                def walk_std(sid: int, depth: int):
-                    name = standard_item_name_by_id.get(sid)
-                    typ = standard_item_type_by_id.get(sid)
-                    assignment = assigned_by_std_id.get(sid)
-
-                    pid = standard_item_parent_by_id.get(sid)
-                    parent_id = None
-                    if pid is not None:
-                        try:
-                            pid_int = int(pid)
-                        except Exception:
-                            pid_int = None
-                        if pid_int is not None and pid_int in included_ids:
-                            parent_id = pid_int
-                    if parent_id is None:
-                        parent_id = family_id
+                    standard_item_parent_by_id[sid_int] = pid_int
 
-                    rows.append(
+                    derive_from = r.get("derive_from")
+                    try:
+                        derive_from_int = (
+                            int(derive_from) if derive_from is not None else None
+                        )
+                    except Exception:
+                        derive_from_int = None
+                    standard_item_derive_from_by_id[sid_int] = derive_from_int
+
+            # Apply derived item naming: sourceName [abbr]::baseName
+            if standard_item_derive_from_by_id:
+                for sid_int, source_id in list(standard_item_derive_from_by_id.items()):
+                    if source_id is None:
+                        continue
+                    base_name = standard_item_name_by_id.get(sid_int)
+                    source_name = standard_item_name_by_id.get(source_id)
+                    if not base_name or not source_name:
+                        continue
+                    base_name = str(base_name).replace("\u00a0", " ").strip()
+                    source_name = str(source_name).replace("\u00a0", " ").strip()
+                    if not base_name or not source_name:
+                        continue
+                    if pjt_abbr:
+                        formatted = f"{source_name} [{pjt_abbr}]::{base_name}"
+                    else:
+                        formatted = f"{source_name}::{base_name}"
+
+                    # Enforce no whitespace after '::'
+                    while ":: " in formatted:
+                        formatted = formatted.replace(":: ", "::")
+                    formatted = formatted.replace("::\u00a0", "::")
+                    standard_item_name_by_id[sid_int] = formatted
+            assignments_by_family_id = {}
+            if df_family_assignments is not None and not df_family_assignments.empty:
+                for r in df_family_assignments.to_dict(orient="records"):
+                    fid = r.get("family_list_id")
+                    try:
+                        fid_int = int(fid) if fid is not None else None
+                    except Exception:
+                        fid_int = None
+                    if fid_int is None:
+                        continue
+                    assignments_by_family_id.setdefault(fid_int, []).append(
                         {
-                            "level": int(base_level) + 1 + int(depth),
-                            "sequence_number": None,
-                            "name": name,
-                            "item_type": typ,
-                            "id": sid,
-                            "parent_id": parent_id,
-                            "description": (
-                                assignment.get("assignment_description")
-                                if assignment
-                                else None
-                            ),
-                            "formula": (
-                                _excel_escape_formula(assignment.get("formula"))
-                                if assignment
-                                else None
-                            ),
-                            "created_at": (
-                                (
-                                    assignment.get("assigned_at")
-                                    or assignment.get("created_at")
-                                )
-                                if assignment
-                                else None
-                            ),
+                            "assignment_id": r.get("assignment_id"),
+                            "standard_item_id": r.get("standard_item_id"),
+                            "standard_item_name": r.get("standard_item_name"),
+                            "standard_item_type": r.get("standard_item_type"),
+                            "formula": r.get("formula"),
+                            "assignment_description": r.get("assignment_description"),
+                            "assigned_at": r.get("assigned_at"),
+                            "created_at": r.get("created_at"),
                         }
                     )
-                    for child_id in children_by_parent.get(sid, []) or []:
-                        walk_std(child_id, depth + 1)
-
-                for root_id in roots:
-                    walk_std(root_id, 0)
-
-            def walk(nodes, level=0):
-                for n in nodes:
-                    seq = (n.get("sequence_number") or "").strip()
-                    name = (n.get("name") or "").strip() or "Unnamed"
-                    family_id = n.get("id")
-                    rows.append(
-                        {
-                            "level": int(level),
-                            "sequence_number": seq or None,
-                            "name": name,
-                            "item_type": n.get("item_type"),
-                            "id": n.get("id"),
-                            "parent_id": n.get("parent_id"),
-                            "description": n.get("description"),
-                            "formula": None,
-                            "created_at": n.get("created_at"),
-                        }
+
+            family_rows = _build_family_tree_rows(
+                df_family_raw.to_dict(orient="records") if not df_family_raw.empty else [],
+                assignments_by_family_id=assignments_by_family_id,
+                standard_item_name_by_id=standard_item_name_by_id,
+                standard_item_type_by_id=standard_item_type_by_id,
+                standard_item_parent_by_id=standard_item_parent_by_id,
+            )
+            df_family_tree = pd.DataFrame(family_rows)
+            if df_family_tree is not None and not df_family_tree.empty:
+                df_family_tree = df_family_tree.drop(
+                    columns=["created_at"], errors="ignore"
+                )
+                preferred_cols = [
+                    "level",
+                    "sequence_number",
+                    "name",
+                    "item_type",
+                    "id",
+                    "parent_id",
+                    "formula",
+                    "description",
+                ]
+                existing = [c for c in preferred_cols if c in df_family_tree.columns]
+                remainder = [
+                    c
+                    for c in df_family_tree.columns
+                    if c not in set(existing) and c != "created_at"
+                ]
+                df_family_tree = df_family_tree[existing + remainder]
+
+            return df_family_tree
+
+        def _write_report_family_list(title: str, df_family_tree) -> int:
+            family_columns = list(df_family_tree.columns)
+            family_level_idx = (
+                family_columns.index("level") if "level" in family_columns else None
+            )
+            family_name_idx = (
+                family_columns.index("name") if "name" in family_columns else None
+            )
+
+            def _style_family_row(ws, row_idx: int, values: list) -> list:
+                if row_idx == 1 or family_level_idx is None or family_name_idx is None:
+                    return values
+                try:
+                    indent_level = int(values[family_level_idx] or 0)
+                except Exception:
+                    indent_level = 0
+                name_cell = WriteOnlyCell(ws, value=values[family_name_idx])
+                name_cell.alignment = Alignment(indent=indent_level, wrap_text=True)
+                values = list(values)
+                values[family_name_idx] = name_cell
+                return values
+
+            _write_sheet_from_df(
+                title, df_family_tree, style_row=_style_family_row
+            )
+            return int(len(df_family_tree.index))
+
+        def _prepare_cart_entries(conn):
+            """Cart entries (flattened for review)."""
+
+            df_standard_items = _read_df(conn, standard_items_sql)
+            df_selected = _read_df(conn, standard_item_selections_sql)
+            std_name_by_id = (
+                df_standard_items.set_index("id")["standard_item_name"].to_dict()
+                if not df_standard_items.empty and "id" in df_standard_items.columns
+                else {}
+            )
+            std_type_by_id = (
+                df_standard_items.set_index("id")["standard_item_type"].to_dict()
+                if not df_standard_items.empty and "id" in df_standard_items.columns
+                else {}
+            )
+            sel_by_std_id = {}
+            if not df_selected.empty and "standard_item_id" in df_selected.columns:
+                for r in df_selected.to_dict(orient="records"):
+                    sid = r.get("standard_item_id")
+                    if sid is None:
+                        continue
+                    sel_by_std_id[int(sid)] = {
+                        "selected_work_master_id": r.get("work_master_id"),
+                        "selected_work_master_code": r.get("work_master_code"),
+                    }
+
+            cart_rows = []
+            for cart_entry_id, created_raw, normalized in _load_cart_entries(conn):
+                revit_types = normalized.get("revit_types") or []
+                assignment_ids = normalized.get("assignment_ids") or []
+                standard_item_ids = normalized.get("standard_item_ids") or []
+                building_names = normalized.get("building_names") or []
+
+                standard_item_id = None
+                try:
+                    standard_item_id = (
+                        int(standard_item_ids[0]) if standard_item_ids else None
                     )
+                except Exception:
+                    standard_item_id = None
 
-                    # Insert assigned standard items right under this family node, preserving hierarchy.
-                    try:
-                        family_id_int = (
-                            int(family_id) if family_id is not None else None
-                        )
-                    except Exception:
-                        family_id_int = None
-                    if family_id_int is not None:
-                        _build_standard_item_subtree_rows(
-                            family_id=family_id_int,
-                            base_level=int(level),
-                        )
+                sel = (
+                    sel_by_std_id.get(standard_item_id)
+                    if standard_item_id is not None
+                    else None
+                )
+                cart_rows.append(
+                    {
+                        "cart_entry_id": cart_entry_id,
+                        "created_at": created_raw,
+                        "building_name": (building_names[0] if building_names else None),
+                        "standard_item_id": standard_item_id,
+                        "standard_item_name": std_name_by_id.get(standard_item_id),
+                        "standard_item_type": std_type_by_id.get(standard_item_id),
+                        "assignment_id": (assignment_ids[0] if assignment_ids else None),
+                        "revit_type": (revit_types[0] if revit_types else None),
+                        "formula": _excel_escape_formula(normalized.get("formula")),
+                        "selected_work_master_id": (
+                            sel.get("selected_work_master_id") if sel else None
+                        ),
+                        "selected_work_master_code": (
+                            sel.get("selected_work_master_code") if sel else None
+                        ),
+                        "building_names_json": json.dumps(
+                            building_names, ensure_ascii=False
+                        ),
+                        "standard_item_ids_json": json.dumps(
+                            standard_item_ids, ensure_ascii=False
+                        ),
+                        "assignment_ids_json": json.dumps(
+                            assignment_ids, ensure_ascii=False
+                        ),
+                        "revit_types_json": json.dumps(revit_types, ensure_ascii=False),
+                    }
+                )
+            return pd.DataFrame(cart_rows)
 
-                    children = n.get("children") or []
-                    if children:
-                        walk(children, level + 1)
+        def _prepare_query(query: str):
+            return lambda conn: _read_df(conn, query)
+
+        def _prepare_gwm_family_assign(conn):
+            df_gwm_assign = _read_df(conn, gwm_family_assign_sql)
+            if not df_gwm_assign.empty and "formula" in df_gwm_assign.columns:
+                df_gwm_assign["formula"] = df_gwm_assign["formula"].map(
+                    _excel_escape_formula
+                )
+            return df_gwm_assign
 
-            walk(roots, 0)
-            return rows
+        def _write_plain(title: str, df) -> int:
+            _write_sheet_from_df(title, df)
+            return int(len(df.index))
 
-        def _read_df(query: str, params=None) -> "pd.DataFrame":
+        def _run_prepare(prepare):
+            # Each worker gets its own read-only connection (sqlite3 objects are
+            # not shared across threads).
+            started = time.perf_counter()
+            conn = project_db.connect_project_db_read_only(db_path)
             try:
-                return pd.read_sql_query(query, conn, params=params)
-            except Exception:
-                return pd.DataFrame()
+                result = prepare(conn)
+            finally:
+                conn.close()
+            return result, (time.perf_counter() - started) * 1000.0
+
+        # (sheet title, data preparation in a worker, writer on this thread).
+        # Sheets are written in this order regardless of which worker finishes first.
+        sheet_jobs = [
+            ("Report_WM", _prepare_report_wm, _write_report_wm),
+            (
+                "Report_FamilyList",
+                _prepare_report_family_list,
+                _write_report_family_list,
+            ),
+            ("Buildings", _prepare_query(buildings_sql), _write_plain),
+            ("StandardItems", _prepare_query(standard_items_sql), _write_plain),
+            ("WorkMasters", _prepare_query(work_masters_sql), _write_plain),
+            (
+                "StandardItemSelections",
+                _prepare_query(standard_item_selections_sql),
+                _write_plain,
+            ),
+            ("GwmFamilyAssign", _prepare_gwm_family_assign, _write_plain),
+            ("FamilyRevitTypes", _prepare_query(family_revit_types_sql), _write_plain),
+            ("CalcDictionary", _prepare_query(calc_dictionary_sql), _write_plain),
+            ("CartEntries", _prepare_cart_entries, _write_plain),
+        ]
+        futures = [
+            executor.submit(_run_prepare, prepare) for _, prepare, _ in sheet_jobs
+        ]
 
         # Summary / metadata
         summary_ws = wb.create_sheet(_safe_sheet_name("SUMMARY", sheet_names))
@@ -3130,738 +5386,429 @@ def export_project_db_excel(project_identifier: str):
         summary_ws.append(["db_file", db_path.name])
         summary_ws.append(["generated_at", generated_at])
         summary_ws.append([])
-        summary_ws.append(["sheet", "rows"])
+        summary_ws.append(["sheet", "rows", "prepare_ms", "write_ms"])
 
-        # Report_WM (WM pre-check)
-        df_wm_precheck_raw = _read_df(
-            """
-            SELECT
-              wm.id AS work_master_id,
-              COALESCE(wmp.use_yn, 0) AS use_yn,
-                            wmp.other_opinion,
-              wm.work_master_code,
-              wm.gauge,
-              wm.uom1,
-              wm.uom2,
-              wm.add_spec,
-              wm.discipline,
-              wm.cat_large_code,
-              wm.cat_large_desc,
-              wm.cat_mid_code,
-              wm.cat_mid_desc,
-              wm.cat_small_code,
-              wm.cat_small_desc,
-              wm.attr1_code,
-              wm.attr1_spec,
-              wm.attr2_code,
-              wm.attr2_spec,
-              wm.attr3_code,
-              wm.attr3_spec,
-              wm.attr4_code,
-              wm.attr4_spec,
-              wm.attr5_code,
-              wm.attr5_spec,
-              wm.attr6_code,
-              wm.attr6_spec,
-              wm.work_group_code,
-              wm.new_old_code,
-              wmp.updated_at
-            FROM work_masters wm
-            LEFT JOIN work_master_precheck wmp ON wmp.work_master_id = wm.id
-            WHERE LOWER(COALESCE(TRIM(wm.new_old_code), '')) <> 'old'
-              AND (wm.work_master_code NOT LIKE 'S%' OR COALESCE(wm.cat_mid_code, '') = 'AA')
-              AND (wm.work_master_code NOT LIKE 'F%' OR COALESCE(wm.cat_large_code, '') = 'F01')
-            ORDER BY wm.work_master_code, wm.gauge, wm.id
-            """
-        )
+        rows_written = 0
+        for index, ((title, _, write), future) in enumerate(
+            zip(sheet_jobs, futures), start=1
+        ):
+            if progress is not None:
+                progress(title, index, len(sheet_jobs), rows_written)
+            prepared, prepare_ms = future.result()
+            started = time.perf_counter()
+            rows = write(title, prepared)
+            write_ms = (time.perf_counter() - started) * 1000.0
+            summary_ws.append([title, rows, round(prepare_ms, 1), round(write_ms, 1)])
+            rows_written += rows
+        if progress is not None:
+            progress(title, len(sheet_jobs), len(sheet_jobs), rows_written)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    wb.save(output_path)
+
+
+@router.get(
+    "/project/{project_identifier}/export/db-excel",
+    tags=["Project Data"],
+)
+def export_project_db_excel(project_identifier: str, request: Request):
+    """Export a human-reviewable Excel report for the project DB.
+
+    Served from the export cache when the DB revision is unchanged (ETag/If-None-Match).
+    """
+
+    try:
+        db_path = project_db.resolve_project_db_path(project_identifier)
+    except (FileNotFoundError, ValueError) as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+    project_db.ensure_extra_tables_once(db_path)
+
+    filename = _export_download_filename(
+        "DB", project_identifier, _read_pjt_abbr_from_path(db_path), ".xlsx"
+    )
+    return _export_file_response(
+        request, project_identifier, db_path, "db-excel", filename
+    )
+
+
+# ===================
+#  Export cache
+# ===================
+EXPORT_PREGENERATE_DELAY_SECONDS = float(
+    os.getenv("BNOTE_EXPORT_PREGENERATE_DELAY", "30")
+)
+_EXPORT_MEDIA_TYPES = {
+    "db-excel": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "dynamo-json": "application/json",
+}
+_PROJECT_ROUTE_PATTERN = re.compile(r"/project/([^/]+)/")
+_export_cache_guard = threading.Lock()
+_export_cache_locks = {}
+_export_pregenerate_timers = {}
 
-        def _wm_trim(value):
-            return str(value).strip() if value is not None else ""
-
-        def _wm_summary_parts(row) -> list:
-            parts = []
-
-            def add(label, value):
-                v = _wm_trim(value)
-                if not v:
-                    return
-                parts.append((label, v))
-
-            add("Discipline", row.get("discipline"))
-            add(
-                "Large",
-                " ".join(
-                    [
-                        _wm_trim(row.get("cat_large_code")),
-                        _wm_trim(row.get("cat_large_desc")),
-                    ]
-                ).strip(),
-            )
-            add(
-                "Mid",
-                " ".join(
-                    [
-                        _wm_trim(row.get("cat_mid_code")),
-                        _wm_trim(row.get("cat_mid_desc")),
-                    ]
-                ).strip(),
-            )
-            add(
-                "Small",
-                " ".join(
-                    [
-                        _wm_trim(row.get("cat_small_code")),
-                        _wm_trim(row.get("cat_small_desc")),
-                    ]
-                ).strip(),
-            )
-            add(
-                "Attr1",
-                " ".join(
-                    [_wm_trim(row.get("attr1_code")), _wm_trim(row.get("attr1_spec"))]
-                ).strip(),
-            )
-            add(
-                "Attr2",
-                " ".join(
-                    [_wm_trim(row.get("attr2_code")), _wm_trim(row.get("attr2_spec"))]
-                ).strip(),
-            )
-            add(
-                "Attr3",
-                " ".join(
-                    [_wm_trim(row.get("attr3_code")), _wm_trim(row.get("attr3_spec"))]
-                ).strip(),
-            )
-            add(
-                "Attr4",
-                " ".join(
-                    [_wm_trim(row.get("attr4_code")), _wm_trim(row.get("attr4_spec"))]
-                ).strip(),
-            )
-            add(
-                "Attr5",
-                " ".join(
-                    [_wm_trim(row.get("attr5_code")), _wm_trim(row.get("attr5_spec"))]
-                ).strip(),
-            )
-            add(
-                "Attr6",
-                " ".join(
-                    [_wm_trim(row.get("attr6_code")), _wm_trim(row.get("attr6_spec"))]
-                ).strip(),
-            )
-            add("Group", row.get("work_group_code"))
-            add("New/Old", row.get("new_old_code"))
 
-            return parts
+def _read_pjt_abbr_from_path(db_path) -> Optional[str]:
+    conn = project_db.connect_project_db_read_only(db_path)
+    try:
+        row = conn.execute(
+            "SELECT pjt_abbr FROM project_metadata ORDER BY id LIMIT 1"
+        ).fetchone()
+        return (str(row[0]).strip() or None) if row and row[0] else None
+    except Exception:
+        return None
+    finally:
+        conn.close()
 
-        df_wm_precheck = (
-            df_wm_precheck_raw.copy()
-            if df_wm_precheck_raw is not None
-            else pd.DataFrame()
-        )
 
-        selected_work_master_ids = set()
-        try:
-            df_selected = _read_df(
-                "SELECT work_master_id FROM standard_item_work_master_select"
-            )
-            if df_selected is not None and not df_selected.empty:
-                for v in df_selected["work_master_id"].tolist():
-                    try:
-                        selected_work_master_ids.add(int(v))
-                    except Exception:
-                        continue
-        except Exception:
-            selected_work_master_ids = set()
+def _export_etag(kind: str, revision: str) -> str:
+    return f'"{kind}-{revision}-f{project_db.EXPORT_FORMAT_VERSION}"'
 
-        selected_row_flags = []
-        if df_wm_precheck is not None and not df_wm_precheck.empty:
-            ui_use = []
-            ui_code = []
-            ui_gauge = []
-            ui_unit = []
-            ui_spec = []
-            ui_other_opinion = []
-            ui_work_master = []
-            for _, r in df_wm_precheck.iterrows():
-                try:
-                    wm_id = r.get("work_master_id")
-                    selected_row_flags.append(
-                        int(wm_id) in selected_work_master_ids
-                        if wm_id is not None
-                        else False
-                    )
-                except Exception:
-                    selected_row_flags.append(False)
-
-                wm_code = _wm_trim(r.get("work_master_code"))
-                gauge_value = _wm_trim(r.get("gauge")).upper()
-                wm_title = (
-                    (f"{wm_code}({gauge_value})" if gauge_value else wm_code)
-                    if wm_code
-                    else (f"({gauge_value})" if gauge_value else "코드 정보 없음")
-                )
 
-                headline = (
-                    _wm_trim(r.get("cat_large_desc"))
-                    or _wm_trim(r.get("cat_mid_desc"))
-                    or _wm_trim(r.get("cat_small_desc"))
-                    or wm_title
-                )
+def _if_none_match(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip() for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
 
-                unit_label = " / ".join(
-                    [v for v in [_wm_trim(r.get("uom1")), _wm_trim(r.get("uom2"))] if v]
-                )
-                spec_value = str(r.get("add_spec") or "")
-                other_opinion_value = str(r.get("other_opinion") or "")
 
-                parts = _wm_summary_parts(r)
-                summary = " | ".join([f"{k}={v}" for k, v in parts])
-                work_master_cell = f"{headline}\n{wm_title}" + (
-                    f"\n{summary}" if summary else ""
-                )
+def _export_cache_lock(db_path, kind: str) -> threading.Lock:
+    key = (db_path.as_posix(), kind)
+    with _export_cache_guard:
+        return _export_cache_locks.setdefault(key, threading.Lock())
 
-                ui_use.append(bool(r.get("use_yn")))
-                ui_code.append(wm_code)
-                ui_gauge.append(gauge_value)
-                ui_unit.append(unit_label)
-                ui_spec.append(spec_value)
-                ui_other_opinion.append(other_opinion_value)
-                ui_work_master.append(work_master_cell)
-
-            # Insert UI columns first (same order as WM pre-check table)
-            df_wm_precheck.insert(0, "Work Master", ui_work_master)
-            df_wm_precheck.insert(0, "기타의견", ui_other_opinion)
-            df_wm_precheck.insert(0, "Spec", ui_spec)
-            df_wm_precheck.insert(0, "Unit", ui_unit)
-            df_wm_precheck.insert(0, "Gauge", ui_gauge)
-            df_wm_precheck.insert(0, "WM Code", ui_code)
-            df_wm_precheck.insert(0, "Use", ui_use)
-
-            # Omit columns from `work_master_id` and everything to the right.
-            if "work_master_id" in df_wm_precheck.columns:
-                keep_end = int(df_wm_precheck.columns.get_loc("work_master_id"))
-                df_wm_precheck = df_wm_precheck.loc[
-                    :, df_wm_precheck.columns[:keep_end]
-                ]
 
-        ws_wm = _write_sheet_from_df("Report_WM", df_wm_precheck)
+def _new_export_cache_tmp() -> str:
+    project_db.EXPORT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=project_db.EXPORT_CACHE_DIR, suffix=".tmp")
+    os.close(fd)
+    return tmp_name
 
-        # Improve readability for the UI-style text columns.
+
+def _write_export_artifact(
+    project_identifier: str,
+    db_path,
+    kind: str,
+    output_path,
+    db: Optional[Session],
+    progress=None,
+) -> None:
+    if kind == "db-excel":
+        _write_project_db_excel(
+            project_identifier, db_path, output_path, progress=progress
+        )
+        return
+    if db is None:
+        session = project_db.get_project_sessionmaker(db_path)()
         try:
-            header_cells = list(
-                ws_wm.iter_rows(min_row=1, max_row=1, values_only=False)
-            )[0]
-            header_to_col = {c.value: c.column for c in header_cells}
-            for header_name in ("Spec", "기타의견", "Work Master"):
-                col_idx = header_to_col.get(header_name)
-                if not col_idx:
-                    continue
-                col_letter = get_column_letter(col_idx)
-                ws_wm.column_dimensions[col_letter].width = (
-                    60 if header_name == "Work Master" else 40
-                )
-                for cell in ws_wm[col_letter]:
-                    if cell.row == 1:
-                        continue
-                    cell.alignment = Alignment(wrap_text=True, vertical="center")
+            _write_export_artifact(
+                project_identifier,
+                db_path,
+                kind,
+                output_path,
+                db=session,
+                progress=progress,
+            )
+        finally:
+            session.close()
+        return
+    _, chunks = _dynamo_export_stream(project_identifier, db, progress=progress)
+    with open(output_path, "wb") as fh:
+        for chunk in chunks:
+            fh.write(chunk)
 
-            # --- WM pre-check screen color cues (approximation) ---
-            # - Gauge text is purple & bold
-            # - WM Code cell is bold, and highlighted when selected in Standard Select
 
-            header_fill = PatternFill("solid", fgColor="FFF9FAFB")
-            header_font = Font(bold=True)
-            gauge_font = Font(color="FF9333EA", bold=True)
-            wm_code_font = Font(bold=True)
-            wm_selected_fill = PatternFill("solid", fgColor="FFEDE9FE")
-            wm_selected_font = Font(color="FF4C1D95", bold=True)
+def _ensure_export_artifact(
+    project_identifier: str,
+    db_path,
+    kind: str,
+    db: Optional[Session] = None,
+    progress=None,
+):
+    """(cached artifact path, revision) for the DB's current revision.
 
-            # Header styling
-            for cell in ws_wm[1]:
-                cell.fill = header_fill
-                cell.font = header_font
+    Generation is single-flight per (project, kind); concurrent callers wait and
+    then hit the freshly stored file.
+    """
 
-            col_use = header_to_col.get("Use")
-            col_wm_code = header_to_col.get("WM Code")
-            col_gauge = header_to_col.get("Gauge")
+    with _export_cache_lock(db_path, kind):
+        revision = _project_db_stat(db_path)["revision"]
+        cache_path = project_db.export_cache_path(db_path, kind, revision)
+        if cache_path.exists():
+            project_db.touch_export_cache(cache_path)
+            return cache_path, revision
+        tmp_name = _new_export_cache_tmp()
+        try:
+            _write_export_artifact(
+                project_identifier, db_path, kind, tmp_name, db, progress=progress
+            )
+            project_db.store_export_artifact(tmp_name, cache_path)
+        except BaseException:
+            try:
+                os.remove(tmp_name)
+            except OSError:
+                pass
+            raise
+        return cache_path, revision
 
-            if col_use:
-                col_letter = get_column_letter(col_use)
-                for cell in ws_wm[col_letter]:
-                    if cell.row == 1:
-                        continue
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            # Row-wise styling (keep it minimal for performance)
-            if col_wm_code or col_gauge:
-                max_row = ws_wm.max_row
-                for r in range(2, max_row + 1):
-                    if col_gauge:
-                        c = ws_wm.cell(row=r, column=col_gauge)
-                        c.font = gauge_font
-
-                    if col_wm_code:
-                        c = ws_wm.cell(row=r, column=col_wm_code)
-                        selected = False
-                        try:
-                            idx = r - 2
-                            if idx >= 0 and idx < len(selected_row_flags):
-                                selected = bool(selected_row_flags[idx])
-                        except Exception:
-                            selected = False
 
-                        if selected:
-                            c.fill = wm_selected_fill
-                            c.font = wm_selected_font
-                        else:
-                            c.font = wm_code_font
+def _iter_into_export_cache(chunks, db_path, kind: str, revision: str):
+    """Pass chunks through while writing them into the cache (stored only if complete)."""
 
-            # Ensure all cells are vertically centered (including header).
-            for row in ws_wm.iter_rows():
-                for cell in row:
-                    try:
-                        cell.alignment = cell.alignment.copy(vertical="center")
-                    except Exception:
-                        cell.alignment = Alignment(vertical="center")
+    tmp_name = _new_export_cache_tmp()
+    completed = False
+    try:
+        with open(tmp_name, "wb") as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+                yield chunk
+        completed = True
+    finally:
+        try:
+            if completed:
+                project_db.store_export_artifact(
+                    tmp_name, project_db.export_cache_path(db_path, kind, revision)
+                )
+            else:
+                os.remove(tmp_name)
+        except OSError:
+            pass
 
-            # Scale down font size (~80%).
-            scale = 0.8
-            default_font_size = 11
 
-            for row in ws_wm.iter_rows():
-                for cell in row:
-                    try:
-                        base = (
-                            cell.font.size
-                            if cell.font.size is not None
-                            else default_font_size
-                        )
-                        cell.font = cell.font.copy(size=max(1, base * scale))
-                    except Exception:
-                        cell.font = Font(size=max(1, default_font_size * scale))
+def _export_file_response(
+    request: Request,
+    project_identifier: str,
+    db_path,
+    kind: str,
+    filename: str,
+    db: Optional[Session] = None,
+):
+    etag = _export_etag(kind, _project_db_stat(db_path)["revision"])
+    if _if_none_match(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
 
-            default_row_height = 15
-            base_line_height = default_row_height * scale
+    cache_path, revision = _ensure_export_artifact(
+        project_identifier, db_path, kind, db=db
+    )
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "ETag": _export_etag(kind, revision),
+        "Cache-Control": "no-cache",
+    }
+    return FileResponse(cache_path, media_type=_EXPORT_MEDIA_TYPES[kind], headers=headers)
 
-            def _line_count(value) -> int:
-                if value is None:
-                    return 1
-                try:
-                    text = str(value)
-                except Exception:
-                    return 1
-                return max(1, text.count("\n") + 1)
 
-            for r in range(1, ws_wm.max_row + 1):
-                try:
-                    max_lines = 1
-                    for c in range(1, ws_wm.max_column + 1):
-                        v = ws_wm.cell(row=r, column=c).value
-                        max_lines = max(max_lines, _line_count(v))
-                    ws_wm.row_dimensions[r].height = max(
-                        1, base_line_height * max_lines
-                    )
-                except Exception:
-                    continue
+def _pregenerate_exports(project_identifier: str) -> None:
+    with _export_cache_guard:
+        _export_pregenerate_timers.pop(project_identifier, None)
+    try:
+        db_path = project_db.resolve_project_db_path(project_identifier)
+    except (FileNotFoundError, ValueError):
+        return
+    for kind in _EXPORT_MEDIA_TYPES:
+        try:
+            _ensure_export_artifact(project_identifier, db_path, kind)
         except Exception:
-            pass
+            # Best effort only; the download request regenerates on a miss.
+            continue
 
-        summary_ws.append(["Report_WM", int(len(df_wm_precheck.index))])
 
-        # Family list (tree, as shown in app) + assigned standard items under each node.
-        df_family_raw = _read_df(
-            "SELECT id, parent_id, sequence_number, name, item_type, description, created_at FROM family_list ORDER BY id"
-        )
-        df_family_assignments = _read_df(
-            """
-            SELECT
-              g.id AS assignment_id,
-              g.family_list_id,
-              g.standard_item_id,
-              si.name AS standard_item_name,
-              si.type AS standard_item_type,
-              g.formula,
-              g.description AS assignment_description,
-              g.assigned_at,
-              g.created_at
-            FROM gwm_family_assign g
-            LEFT JOIN standard_items si ON si.id = g.standard_item_id
-            ORDER BY g.family_list_id, si.type, si.name, g.id
-            """
+def schedule_export_pregeneration(project_identifier: str) -> None:
+    """Debounced: regenerate cached exports once the project has been quiet for a while."""
+
+    if EXPORT_PREGENERATE_DELAY_SECONDS <= 0:
+        return
+    with _export_cache_guard:
+        timer = _export_pregenerate_timers.pop(project_identifier, None)
+        if timer is not None:
+            timer.cancel()
+        timer = threading.Timer(
+            EXPORT_PREGENERATE_DELAY_SECONDS,
+            _pregenerate_exports,
+            args=(project_identifier,),
         )
+        timer.daemon = True
+        _export_pregenerate_timers[project_identifier] = timer
+        timer.start()
 
-        # Project abbreviation (for derived item name formatting)
-        pjt_abbr = None
-        try:
-            df_meta = _read_df(
-                "SELECT pjt_abbr FROM project_metadata ORDER BY id LIMIT 1"
-            )
-            if df_meta is not None and not df_meta.empty:
-                raw_abbr = df_meta.iloc[0].get("pjt_abbr")
-                if raw_abbr is not None:
-                    abbr = str(raw_abbr).strip()
-                    pjt_abbr = abbr or None
-        except Exception:
-            pjt_abbr = None
 
-        # Standard item hierarchy (for indentation of assigned items)
-        df_standard_items_hier = _read_df(
-            "SELECT id, parent_id, derive_from, name AS standard_item_name, type AS standard_item_type FROM standard_items"
-        )
-        standard_item_name_by_id = {}
-        standard_item_type_by_id = {}
-        standard_item_parent_by_id = {}
-        standard_item_derive_from_by_id = {}
-        if df_standard_items_hier is not None and not df_standard_items_hier.empty:
-            for _, r in df_standard_items_hier.iterrows():
-                sid = r.get("id")
-                try:
-                    sid_int = int(sid) if sid is not None else None
-                except Exception:
-                    sid_int = None
-                if sid_int is None:
-                    continue
-                standard_item_name_by_id[sid_int] = r.get("standard_item_name")
-                standard_item_type_by_id[sid_int] = r.get("standard_item_type")
-                pid = r.get("parent_id")
-                try:
-                    pid_int = int(pid) if pid is not None else None
-                except Exception:
-                    pid_int = None
-                standard_item_parent_by_id[sid_int] = pid_int
+def schedule_export_pregeneration_for_path(path: str) -> None:
+    """Called after a successful mutating request; picks the project from the route."""
 
-                derive_from = r.get("derive_from")
-                try:
-                    derive_from_int = (
-                        int(derive_from) if derive_from is not None else None
-                    )
-                except Exception:
-                    derive_from_int = None
-                standard_item_derive_from_by_id[sid_int] = derive_from_int
+    if path.rstrip("/").endswith("/exports"):
+        # export job submission does not change project data
+        return
+    match = _PROJECT_ROUTE_PATTERN.search(path)
+    if match:
+        schedule_export_pregeneration(unquote(match.group(1)))
 
-        # Apply derived item naming: sourceName [abbr]::baseName
-        if standard_item_derive_from_by_id:
-            for sid_int, source_id in list(standard_item_derive_from_by_id.items()):
-                if source_id is None:
-                    continue
-                base_name = standard_item_name_by_id.get(sid_int)
-                source_name = standard_item_name_by_id.get(source_id)
-                if not base_name or not source_name:
-                    continue
-                base_name = str(base_name).replace("\u00a0", " ").strip()
-                source_name = str(source_name).replace("\u00a0", " ").strip()
-                if not base_name or not source_name:
-                    continue
-                if pjt_abbr:
-                    formatted = f"{source_name} [{pjt_abbr}]::{base_name}"
-                else:
-                    formatted = f"{source_name}::{base_name}"
-
-                # Enforce no whitespace after '::'
-                while ":: " in formatted:
-                    formatted = formatted.replace(":: ", "::")
-                formatted = formatted.replace("::\u00a0", "::")
-                standard_item_name_by_id[sid_int] = formatted
-        assignments_by_family_id = {}
-        if df_family_assignments is not None and not df_family_assignments.empty:
-            for _, r in df_family_assignments.iterrows():
-                fid = r.get("family_list_id")
-                try:
-                    fid_int = int(fid) if fid is not None else None
-                except Exception:
-                    fid_int = None
-                if fid_int is None:
-                    continue
-                assignments_by_family_id.setdefault(fid_int, []).append(
-                    {
-                        "assignment_id": r.get("assignment_id"),
-                        "standard_item_id": r.get("standard_item_id"),
-                        "standard_item_name": r.get("standard_item_name"),
-                        "standard_item_type": r.get("standard_item_type"),
-                        "formula": r.get("formula"),
-                        "assignment_description": r.get("assignment_description"),
-                        "assigned_at": r.get("assigned_at"),
-                        "created_at": r.get("created_at"),
-                    }
-                )
 
-        family_rows = _build_family_tree_rows(
-            df_family_raw.to_dict(orient="records") if not df_family_raw.empty else [],
-            assignments_by_family_id=assignments_by_family_id,
-            standard_item_name_by_id=standard_item_name_by_id,
-            standard_item_type_by_id=standard_item_type_by_id,
-            standard_item_parent_by_id=standard_item_parent_by_id,
-        )
-        df_family_tree = pd.DataFrame(family_rows)
-        if df_family_tree is not None and not df_family_tree.empty:
-            df_family_tree = df_family_tree.drop(
-                columns=["created_at"], errors="ignore"
-            )
-            preferred_cols = [
-                "level",
-                "sequence_number",
-                "name",
-                "item_type",
-                "id",
-                "parent_id",
-                "formula",
-                "description",
-            ]
-            existing = [c for c in preferred_cols if c in df_family_tree.columns]
-            remainder = [
-                c
-                for c in df_family_tree.columns
-                if c not in set(existing) and c != "created_at"
-            ]
-            df_family_tree = df_family_tree[existing + remainder]
+# ===================
+#  Export jobs
+# ===================
+EXPORT_JOB_MAX_WORKERS = 2
+EXPORT_JOB_RETENTION_SECONDS = 60 * 60
+_EXPORT_JOB_ACTIVE_STATUSES = ("queued", "running")
+_export_job_executor = ThreadPoolExecutor(
+    max_workers=EXPORT_JOB_MAX_WORKERS, thread_name_prefix="export-job"
+)
+_export_jobs = {}
+_export_jobs_guard = threading.Lock()
 
-        family_ws = _write_sheet_from_df("Report_FamilyList", df_family_tree)
-        if family_ws and df_family_tree is not None and not df_family_tree.empty:
-            headers = [cell.value for cell in family_ws[1]]
-            try:
-                level_col = headers.index("level") + 1
-                name_col = headers.index("name") + 1
-            except ValueError:
-                level_col = None
-                name_col = None
-
-            if level_col and name_col:
-                for row_idx in range(2, family_ws.max_row + 1):
-                    level_value = family_ws.cell(row=row_idx, column=level_col).value
-                    try:
-                        indent_level = int(level_value or 0)
-                    except Exception:
-                        indent_level = 0
-                    name_cell = family_ws.cell(row=row_idx, column=name_col)
-                    name_cell.alignment = Alignment(indent=indent_level, wrap_text=True)
-        summary_ws.append(["Report_FamilyList", int(len(df_family_tree.index))])
 
-        df_buildings = _read_df(
-            "SELECT id, name AS building_name, created_at FROM building_list ORDER BY id"
+def _prune_export_jobs() -> None:
+    # caller holds _export_jobs_guard
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(
+        seconds=EXPORT_JOB_RETENTION_SECONDS
+    )
+    for job_id in [
+        job_id
+        for job_id, job in _export_jobs.items()
+        if job["finished_at"] is not None and job["finished_at"] < cutoff
+    ]:
+        del _export_jobs[job_id]
+
+
+def _get_export_job(job_id: str) -> dict:
+    with _export_jobs_guard:
+        job = _export_jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Export job not found")
+        return dict(job)
+
+
+def _export_job_response(request: Request, job: dict) -> schemas.ExportJob:
+    download_url = None
+    if job["status"] == "done":
+        download_url = str(
+            request.url_for("download_export_job", job_id=job["job_id"])
         )
-        _write_sheet_from_df("Buildings", df_buildings)
-        summary_ws.append(["Buildings", int(len(df_buildings.index))])
+    return schemas.ExportJob.model_validate({**job, "download_url": download_url})
 
-        df_standard_items = _read_df(
-            "SELECT id, name AS standard_item_name, type AS standard_item_type, parent_id, derive_from FROM standard_items ORDER BY id"
-        )
-        _write_sheet_from_df("StandardItems", df_standard_items)
-        summary_ws.append(["StandardItems", int(len(df_standard_items.index))])
 
-        df_work_masters = _read_df(
-            "SELECT id, discipline, work_master_code, cat_large_code, cat_large_desc, cat_mid_code, cat_mid_desc, cat_small_code, cat_small_desc, attr1_code, attr1_spec, attr2_code, attr2_spec, attr3_code, attr3_spec, attr4_code, attr4_spec, attr5_code, attr5_spec, attr6_code, attr6_spec, uom1, uom2, work_group_code, new_old_code, add_spec, gauge FROM work_masters ORDER BY id"
-        )
-        _write_sheet_from_df("WorkMasters", df_work_masters)
-        summary_ws.append(["WorkMasters", int(len(df_work_masters.index))])
+def _run_export_job(job_id: str) -> None:
+    with _export_jobs_guard:
+        job = _export_jobs[job_id]
+        job["status"] = "running"
 
-        df_selected = _read_df(
-            """
-            SELECT
-              sel.id,
-              sel.standard_item_id,
-              si.name AS standard_item_name,
-              si.type AS standard_item_type,
-              sel.work_master_id,
-              wm.work_master_code,
-              wm.cat_large_code,
-              wm.cat_mid_code,
-              wm.cat_small_code,
-              sel.created_at,
-              sel.updated_at
-            FROM standard_item_work_master_select sel
-            LEFT JOIN standard_items si ON si.id = sel.standard_item_id
-            LEFT JOIN work_masters wm ON wm.id = sel.work_master_id
-            ORDER BY sel.standard_item_id
-            """
-        )
-        _write_sheet_from_df("StandardItemSelections", df_selected)
-        summary_ws.append(["StandardItemSelections", int(len(df_selected.index))])
+    def _progress(sheet_name, sheet_index, sheet_count, rows_written):
+        with _export_jobs_guard:
+            job.update(
+                sheet_name=sheet_name,
+                sheet_index=sheet_index,
+                sheet_count=sheet_count,
+                rows_written=rows_written,
+            )
 
-        df_gwm_assign = _read_df(
-            """
-            SELECT
-              g.id,
-              g.family_list_id,
-              fl.name AS family_name,
-              g.standard_item_id,
-              si.name AS standard_item_name,
-              si.type AS standard_item_type,
-              g.formula,
-              g.description,
-              g.assigned_at,
-              g.created_at
-            FROM gwm_family_assign g
-            LEFT JOIN family_list fl ON fl.id = g.family_list_id
-            LEFT JOIN standard_items si ON si.id = g.standard_item_id
-            ORDER BY g.id
-            """
+    try:
+        cache_path, _ = _ensure_export_artifact(
+            job["project_identifier"], job["db_path"], job["kind"], progress=_progress
         )
-        if not df_gwm_assign.empty and "formula" in df_gwm_assign.columns:
-            df_gwm_assign["formula"] = df_gwm_assign["formula"].map(
-                _excel_escape_formula
+    except Exception as exc:
+        detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+        with _export_jobs_guard:
+            job.update(
+                status="failed",
+                error=str(detail),
+                finished_at=datetime.datetime.utcnow(),
             )
-        _write_sheet_from_df("GwmFamilyAssign", df_gwm_assign)
-        summary_ws.append(["GwmFamilyAssign", int(len(df_gwm_assign.index))])
-
-        df_revit_types = _read_df(
-            """
-            SELECT
-              frt.id,
-              frt.family_list_id,
-              fl.name AS family_name,
-              frt.type_name,
-              frt.building_name,
-              frt.created_at
-            FROM family_revit_type frt
-            LEFT JOIN family_list fl ON fl.id = frt.family_list_id
-            ORDER BY frt.id
-            """
+        return
+    with _export_jobs_guard:
+        job.update(
+            status="done",
+            cache_path=cache_path,
+            finished_at=datetime.datetime.utcnow(),
         )
-        _write_sheet_from_df("FamilyRevitTypes", df_revit_types)
-        summary_ws.append(["FamilyRevitTypes", int(len(df_revit_types.index))])
 
-        df_calc = _read_df(
-            """
-            SELECT
-              c.id,
-              c.family_list_id,
-              fl.name AS family_name,
-              c.calc_code,
-              c.symbol_key,
-              c.symbol_value,
-              c.created_at
-            FROM calc_dictionary c
-            LEFT JOIN family_list fl ON fl.id = c.family_list_id
-            WHERE COALESCE(c.is_deleted, 0) = 0
-            ORDER BY c.id
-            """
-        )
-        _write_sheet_from_df("CalcDictionary", df_calc)
-        summary_ws.append(["CalcDictionary", int(len(df_calc.index))])
 
-        # Cart entries (flattened for review)
-        df_cart_raw = _read_df(
-            "SELECT id AS cart_entry_id, payload, created_at FROM workmaster_cart_entries ORDER BY id DESC"
-        )
-        std_name_by_id = (
-            df_standard_items.set_index("id")["standard_item_name"].to_dict()
-            if not df_standard_items.empty and "id" in df_standard_items.columns
-            else {}
-        )
-        std_type_by_id = (
-            df_standard_items.set_index("id")["standard_item_type"].to_dict()
-            if not df_standard_items.empty and "id" in df_standard_items.columns
-            else {}
+@router.post(
+    "/project/{project_identifier}/exports",
+    response_model=schemas.ExportJob,
+    status_code=202,
+    tags=["Project Data"],
+)
+def create_export_job(
+    project_identifier: str, payload: schemas.ExportJobCreate, request: Request
+):
+    """Excel/Dynamo 내보내기를 백그라운드 작업으로 실행.
+
+    같은 프로젝트·종류의 작업이 이미 대기/실행 중이면 새 작업을 만들지 않고 그 작업을 반환한다.
+    """
+
+    if payload.kind not in _EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"kind must be one of: {', '.join(_EXPORT_MEDIA_TYPES)}",
         )
-        sel_by_std_id = {}
-        if not df_selected.empty and "standard_item_id" in df_selected.columns:
-            for _, r in df_selected.iterrows():
-                sid = r.get("standard_item_id")
-                if sid is None:
-                    continue
-                sel_by_std_id[int(sid)] = {
-                    "selected_work_master_id": r.get("work_master_id"),
-                    "selected_work_master_code": r.get("work_master_code"),
-                }
+    try:
+        db_path = project_db.resolve_project_db_path(project_identifier)
+    except (FileNotFoundError, ValueError) as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    project_db.ensure_extra_tables_once(db_path)
 
-        cart_rows = []
-        for _, r in df_cart_raw.iterrows():
-            raw_payload = r.get("payload")
-            try:
-                payload = json.loads(raw_payload or "{}")
-            except Exception:
-                payload = {}
-            normalized = _normalize_cart_payload(
-                payload if isinstance(payload, dict) else {}
-            )
-            revit_types = normalized.get("revit_types") or []
-            assignment_ids = normalized.get("assignment_ids") or []
-            standard_item_ids = normalized.get("standard_item_ids") or []
-            building_names = normalized.get("building_names") or []
+    prefix, suffix = ("DB", ".xlsx") if payload.kind == "db-excel" else ("Bnote", ".json")
+    filename = _export_download_filename(
+        prefix, project_identifier, _read_pjt_abbr_from_path(db_path), suffix
+    )
 
-            standard_item_id = None
-            try:
-                standard_item_id = (
-                    int(standard_item_ids[0]) if standard_item_ids else None
-                )
-            except Exception:
-                standard_item_id = None
+    with _export_jobs_guard:
+        _prune_export_jobs()
+        for job in _export_jobs.values():
+            if (
+                job["db_path"] == db_path
+                and job["kind"] == payload.kind
+                and job["status"] in _EXPORT_JOB_ACTIVE_STATUSES
+            ):
+                return _export_job_response(request, dict(job))
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "project_identifier": project_identifier,
+            "kind": payload.kind,
+            "status": "queued",
+            "sheet_index": 0,
+            "sheet_count": 0,
+            "sheet_name": None,
+            "rows_written": 0,
+            "error": None,
+            "created_at": datetime.datetime.utcnow(),
+            "finished_at": None,
+            "db_path": db_path,
+            "filename": filename,
+            "cache_path": None,
+        }
+        _export_jobs[job["job_id"]] = job
+        snapshot = dict(job)
+    _export_job_executor.submit(_run_export_job, snapshot["job_id"])
+    return _export_job_response(request, snapshot)
 
-            sel = (
-                sel_by_std_id.get(standard_item_id)
-                if standard_item_id is not None
-                else None
-            )
-            cart_rows.append(
-                {
-                    "cart_entry_id": r.get("cart_entry_id"),
-                    "created_at": r.get("created_at"),
-                    "building_name": (building_names[0] if building_names else None),
-                    "standard_item_id": standard_item_id,
-                    "standard_item_name": std_name_by_id.get(standard_item_id),
-                    "standard_item_type": std_type_by_id.get(standard_item_id),
-                    "assignment_id": (assignment_ids[0] if assignment_ids else None),
-                    "revit_type": (revit_types[0] if revit_types else None),
-                    "formula": _excel_escape_formula(normalized.get("formula")),
-                    "selected_work_master_id": (
-                        sel.get("selected_work_master_id") if sel else None
-                    ),
-                    "selected_work_master_code": (
-                        sel.get("selected_work_master_code") if sel else None
-                    ),
-                    "building_names_json": json.dumps(
-                        building_names, ensure_ascii=False
-                    ),
-                    "standard_item_ids_json": json.dumps(
-                        standard_item_ids, ensure_ascii=False
-                    ),
-                    "assignment_ids_json": json.dumps(
-                        assignment_ids, ensure_ascii=False
-                    ),
-                    "revit_types_json": json.dumps(revit_types, ensure_ascii=False),
-                }
-            )
-        df_cart = pd.DataFrame(cart_rows)
-        _write_sheet_from_df("CartEntries", df_cart)
-        summary_ws.append(["CartEntries", int(len(df_cart.index))])
-        try:
-            cur = conn.cursor()
-            cur.execute("SELECT pjt_abbr FROM project_metadata ORDER BY id LIMIT 1")
-            row = cur.fetchone()
-            if row and row[0]:
-                pjt_abbr = str(row[0]).strip() or None
-        except Exception:
-            pjt_abbr = None
-    finally:
-        conn.close()
 
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
+@router.get(
+    "/exports/{job_id}",
+    response_model=schemas.ExportJob,
+    tags=["Project Data"],
+)
+def get_export_job(job_id: str, request: Request):
+    return _export_job_response(request, _get_export_job(job_id))
 
-    now = datetime.datetime.now()
-    stamp = now.strftime("%Y%m%d_%H%M%S")
-    safe_abbr = (pjt_abbr or project_identifier or "project").strip()
-    safe_abbr = (
-        safe_abbr.replace("\\", "_")
-        .replace("/", "_")
-        .replace(":", "_")
-        .replace("*", "_")
-        .replace("?", "_")
-        .replace('"', "_")
-        .replace("<", "_")
-        .replace(">", "_")
-        .replace("|", "_")
-    )
-    filename = f"DB_{safe_abbr}_{stamp}.xlsx"
-    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers=headers,
+
+@router.get(
+    "/exports/{job_id}/download",
+    tags=["Project Data"],
+)
+def download_export_job(job_id: str):
+    job = _get_export_job(job_id)
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Export job is {job['status']}")
+    cache_path = job["cache_path"]
+    if cache_path is None or not cache_path.exists():
+        # superseded by a newer revision or evicted; submit a new job
+        raise HTTPException(status_code=410, detail="Export artifact expired")
+    return FileResponse(
+        cache_path,
+        media_type=_EXPORT_MEDIA_TYPES[job["kind"]],
+        headers={"Content-Disposition": f'attachment; filename="{job["filename"]}"'},
     )
 
 
@@ -4010,11 +5957,7 @@ def read_project_db_revision(
     except (FileNotFoundError, ValueError) as exc:
         raise HTTPException(status_code=404, detail=str(exc))
 
-    stat = os.stat(db_path)
-    mtime_ns = int(getattr(stat, "st_mtime_ns", int(stat.st_mtime * 1_000_000_000)))
-    size = int(stat.st_size)
-    revision = f"{mtime_ns}:{size}"
-    return {"revision": revision, "mtime_ns": mtime_ns, "size": size}
+    return _project_db_stat(db_path)
 
 
 @router.delete(
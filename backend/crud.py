@@ -1,10 +1,11 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, delete
+from sqlalchemy import or_, delete, text
 from typing import Optional, List, Dict, Any
 from string import ascii_uppercase
 from datetime import datetime
 from . import models, schemas
 from . import security
+from .database import WORK_MASTER_FTS_TABLE, WORK_MASTER_SEARCH_COLUMNS
 
 
 def get_project(db: Session, project_id: int):
@@ -94,9 +95,15 @@ def update_work_master_fields(
     return db_work_master
 
 
-def create_work_master(db: Session, work_master: schemas.WorkMasterCreate):
-    db_work_master = models.WorkMaster(**work_master.dict())
+def create_work_master(
+    db: Session, work_master: schemas.WorkMasterCreate, commit: bool = True
+):
+    db_work_master = models.WorkMaster(**work_master.model_dump())
     db.add(db_work_master)
+    if not commit:
+        # 호출자가 같은 트랜잭션에서 후속 작업 후 커밋한다 (id만 채운다)
+        db.flush()
+        return db_work_master
     db.commit()
     db.refresh(db_work_master)
     return db_work_master
@@ -223,27 +230,99 @@ def update_work_master(
     return db_work_master
 
 
-def get_work_masters(db: Session, skip: int = 0, limit: int = None, search: str = None):
+# 검색어(search)가 있을 때 limit 을 주지 않으면 적용되는 기본 건수 (전체 목록 조회는 제한 없음)
+WORK_MASTER_SEARCH_DEFAULT_LIMIT = 200
+# trigram 색인은 3글자 이상 검색어만 매칭 가능 (더 짧으면 ILIKE)
+WORK_MASTER_FTS_MIN_TERM_LENGTH = 3
+# 목록 조회에서 일치(=) 조건으로 거를 수 있는 컬럼
+WORK_MASTER_FILTER_COLUMNS = (
+    "discipline",
+    "cat_large_code",
+    "cat_mid_code",
+    "cat_small_code",
+    "new_old_code",
+)
+
+
+def _work_master_fts_available(db: Session) -> bool:
+    if db.get_bind().dialect.name != "sqlite":
+        return False
+    row = db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": WORK_MASTER_FTS_TABLE},
+    ).first()
+    return row is not None
+
+
+def _search_work_masters_fts(
+    db: Session, search: str, skip: int, limit: int, filters: Dict[str, str]
+):
+    """FTS5 trigram substring search over the same columns as the ILIKE path, best match first."""
+
+    # 검색어 전체를 하나의 구문(phrase)으로 → 부분 문자열 매칭, FTS 연산자 해석 안 함
+    phrase = '"' + search.replace('"', '""') + '"'
+    params = {"phrase": phrase, "limit": limit, "skip": skip or 0}
+    join_sql = ""
+    filter_sql = ""
+    if filters:
+        join_sql = f"JOIN work_masters wm ON wm.id = {WORK_MASTER_FTS_TABLE}.rowid"
+        for column, value in filters.items():
+            filter_sql += f" AND wm.{column} = :f_{column}"
+            params[f"f_{column}"] = value
+    ids = [
+        row[0]
+        for row in db.execute(
+            text(
+                f"SELECT {WORK_MASTER_FTS_TABLE}.rowid FROM {WORK_MASTER_FTS_TABLE} {join_sql} "
+                f"WHERE {WORK_MASTER_FTS_TABLE} MATCH :phrase{filter_sql} "
+                f"ORDER BY rank, {WORK_MASTER_FTS_TABLE}.rowid LIMIT :limit OFFSET :skip"
+            ),
+            params,
+        )
+    ]
+    if not ids:
+        return []
+    by_id = {
+        wm.id: wm
+        for wm in db.query(models.WorkMaster).filter(models.WorkMaster.id.in_(ids))
+    }
+    return [by_id[wm_id] for wm_id in ids if wm_id in by_id]
+
+
+def get_work_masters(
+    db: Session,
+    skip: int = 0,
+    limit: int = None,
+    search: str = None,
+    filters: Optional[Dict[str, str]] = None,
+):
+    filters = {
+        column: value
+        for column, value in (filters or {}).items()
+        if column in WORK_MASTER_FILTER_COLUMNS and value is not None
+    }
+    if search and limit is None:
+        limit = WORK_MASTER_SEARCH_DEFAULT_LIMIT
+
+    if (
+        search
+        and len(search) >= WORK_MASTER_FTS_MIN_TERM_LENGTH
+        and _work_master_fts_available(db)
+    ):
+        return _search_work_masters_fts(db, search, skip, limit, filters)
+
     query = db.query(models.WorkMaster)
+    for column, value in filters.items():
+        query = query.filter(getattr(models.WorkMaster, column) == value)
 
     if search:
         search_term = f"%{search}%"
         query = query.filter(
             or_(
-                models.WorkMaster.discipline.ilike(search_term),
-                models.WorkMaster.cat_large_code.ilike(search_term),
-                models.WorkMaster.cat_large_desc.ilike(search_term),
-                models.WorkMaster.cat_mid_code.ilike(search_term),
-                models.WorkMaster.cat_mid_desc.ilike(search_term),
-                models.WorkMaster.cat_small_code.ilike(search_term),
-                models.WorkMaster.cat_small_desc.ilike(search_term),
-                models.WorkMaster.attr1_code.ilike(search_term),
-                models.WorkMaster.attr1_spec.ilike(search_term),
-                models.WorkMaster.attr2_code.ilike(search_term),
-                models.WorkMaster.attr2_spec.ilike(search_term),
-                models.WorkMaster.attr3_code.ilike(search_term),
-                models.WorkMaster.attr3_spec.ilike(search_term),
-                models.WorkMaster.work_master_code.ilike(search_term),
+                *(
+                    getattr(models.WorkMaster, column).ilike(search_term)
+                    for column in WORK_MASTER_SEARCH_COLUMNS
+                )
             )
         )
 
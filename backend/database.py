@@ -2,6 +2,8 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from pathlib import Path
+import datetime
+import logging
 import os
 
 from sqlalchemy.exc import OperationalError
@@ -22,9 +24,15 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+logger = logging.getLogger(__name__)
+
+# Returned by a migration step that could not apply on this database (e.g. SQLite
+# without FTS5/trigram). The step is not recorded, so it is retried on the next run.
+MIGRATION_SKIPPED = "skipped"
+
 
 def ensure_family_list_columns(engine):
-    with engine.connect() as conn:
+    with engine.begin() as conn:
         try:
             columns = conn.execute(text("PRAGMA table_info('family_list')")).fetchall()
         except OperationalError:
@@ -39,7 +47,7 @@ def ensure_family_list_columns(engine):
 
 
 def ensure_calc_dictionary_columns(engine):
-    with engine.connect() as conn:
+    with engine.begin() as conn:
         try:
             columns = conn.execute(
                 text("PRAGMA table_info('calc_dictionary')")
@@ -114,7 +122,7 @@ def ensure_calc_dictionary_columns(engine):
 
 
 def ensure_gwm_family_assign_columns(engine):
-    with engine.connect() as conn:
+    with engine.begin() as conn:
         try:
             columns = conn.execute(
                 text("PRAGMA table_info('gwm_family_assign')")
@@ -139,7 +147,7 @@ def ensure_gwm_family_assign_columns(engine):
 
 
 def ensure_work_master_columns(engine):
-    with engine.connect() as conn:
+    with engine.begin() as conn:
         try:
             columns = conn.execute(text("PRAGMA table_info('work_masters')")).fetchall()
         except OperationalError:
@@ -156,7 +164,7 @@ def ensure_work_master_columns(engine):
 
 def ensure_standard_item_columns(engine):
     """Ensure legacy standard_items tables have the derive_from column."""
-    with engine.connect() as conn:
+    with engine.begin() as conn:
         try:
             columns = conn.execute(
                 text("PRAGMA table_info('standard_items')")
@@ -171,7 +179,7 @@ def ensure_standard_item_columns(engine):
 
 
 def ensure_family_revit_type_columns(engine):
-    with engine.connect() as conn:
+    with engine.begin() as conn:
         try:
             columns = conn.execute(
                 text("PRAGMA table_info('family_revit_type')")
@@ -198,3 +206,121 @@ def ensure_family_revit_type_columns(engine):
             conn.execute(
                 text("ALTER TABLE family_revit_type ADD COLUMN building_name TEXT")
             )
+
+
+# ===================
+#  Work Master search index
+# ===================
+# `crud.get_work_masters(search=...)` 가 검색하는 컬럼. trigram 토크나이저라 한글 부분 문자열도 매칭된다.
+WORK_MASTER_SEARCH_COLUMNS = (
+    "discipline",
+    "cat_large_code",
+    "cat_large_desc",
+    "cat_mid_code",
+    "cat_mid_desc",
+    "cat_small_code",
+    "cat_small_desc",
+    "attr1_code",
+    "attr1_spec",
+    "attr2_code",
+    "attr2_spec",
+    "attr3_code",
+    "attr3_spec",
+    "work_master_code",
+)
+WORK_MASTER_FTS_TABLE = "work_masters_fts"
+
+
+def _work_master_fts_statements():
+    cols = ", ".join(WORK_MASTER_SEARCH_COLUMNS)
+    new_cols = ", ".join(f"new.{col}" for col in WORK_MASTER_SEARCH_COLUMNS)
+    old_cols = ", ".join(f"old.{col}" for col in WORK_MASTER_SEARCH_COLUMNS)
+    fts = WORK_MASTER_FTS_TABLE
+    insert_new = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols});"
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});"
+    )
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {cols}, content='work_masters', content_rowid='id', tokenize='trigram'
+        )
+        """,
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON work_masters BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON work_masters BEGIN {delete_old} END",
+        # 검색 컬럼이 SET 에 있을 때만 재색인 (add_spec/gauge 등 갱신은 건너뜀)
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON work_masters "
+        f"BEGIN {delete_old} {insert_new} END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+WORK_MASTER_FTS_STATEMENTS = _work_master_fts_statements()
+
+
+def ensure_work_master_search_index(engine):
+    """FTS5 trigram index over the Work Master search columns.
+
+    Not applicable on non-SQLite engines. SQLite builds without FTS5/trigram return
+    MIGRATION_SKIPPED; `crud.get_work_masters` keeps using ILIKE until it applies.
+    """
+
+    if engine.dialect.name != "sqlite":
+        return None
+    try:
+        with engine.begin() as conn:
+            for stmt in WORK_MASTER_FTS_STATEMENTS:
+                conn.execute(text(stmt))
+    except OperationalError:
+        return MIGRATION_SKIPPED
+    return None
+
+
+# Ordered, named migration steps for the main DB. Applied names are recorded in
+# `schema_migrations`; `PRAGMA user_version` is left alone because this DB is the
+# template that project DBs are copied from (project_db owns that ledger).
+SCHEMA_MIGRATIONS = [
+    ("family_list_columns", ensure_family_list_columns),
+    ("calc_dictionary_columns", ensure_calc_dictionary_columns),
+    ("gwm_family_assign_columns", ensure_gwm_family_assign_columns),
+    ("work_master_columns", ensure_work_master_columns),
+    ("standard_item_columns", ensure_standard_item_columns),
+    ("family_revit_type_columns", ensure_family_revit_type_columns),
+    ("work_master_search_index", ensure_work_master_search_index),
+]
+
+
+def run_schema_migrations(engine):
+    """Apply unrecorded SCHEMA_MIGRATIONS; returns the names of skipped steps."""
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    name TEXT PRIMARY KEY,
+                    applied_at TEXT NOT NULL
+                )
+                """
+            )
+        )
+        applied = {
+            row[0]
+            for row in conn.execute(text("SELECT name FROM schema_migrations"))
+        }
+    skipped = []
+    for name, migrate in SCHEMA_MIGRATIONS:
+        if name in applied:
+            continue
+        if migrate(engine) == MIGRATION_SKIPPED:
+            logger.warning("schema migration %s skipped; it will be retried on next start", name)
+            skipped.append(name)
+            continue
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO schema_migrations (name, applied_at) VALUES (:name, :applied_at)"
+                ),
+                {"name": name, "applied_at": datetime.datetime.utcnow().isoformat()},
+            )
+    return skipped
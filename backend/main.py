@@ -1,16 +1,9 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from .api import router
-from .database import (
-    engine,
-    Base,
-    ensure_family_list_columns,
-    ensure_calc_dictionary_columns,
-    ensure_gwm_family_assign_columns,
-    ensure_work_master_columns,
-    ensure_standard_item_columns,
-    ensure_family_revit_type_columns,
-)
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
+from .api import router, schedule_export_pregeneration_for_path
+from .database import engine, Base, run_schema_migrations
 
 # 데이터베이스 테이블 생성
 tables_to_create = [
@@ -19,12 +12,7 @@ tables_to_create = [
     if name != "family_revit_type"
 ]
 Base.metadata.create_all(bind=engine, tables=tables_to_create)
-ensure_family_list_columns(engine)
-ensure_calc_dictionary_columns(engine)
-ensure_gwm_family_assign_columns(engine)
-ensure_work_master_columns(engine)
-ensure_standard_item_columns(engine)
-ensure_family_revit_type_columns(engine)
+run_schema_migrations(engine)
 
 app = FastAPI(
     title="B-note API",
@@ -41,10 +29,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # 모든 HTTP 메소드 허용
     allow_headers=["*"],  # 모든 HTTP 헤더 허용
+    expose_headers=[
+        "Content-Disposition",
+        "ETag",
+        "X-Total-Count",
+        "X-Next-Cursor",
+    ],
+)
+
+# JSON 응답 gzip 압축 (xlsx 는 이미 zip 이라 제외)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=1024,
+    compresslevel=6,
+    exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES
+    + ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",),
 )
 
 app.include_router(router, prefix="/api/v1")
 
+_MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+# 프로젝트 데이터 변경 후 조용해지면 내보내기 파일(Excel/Dynamo JSON)을 미리 생성
+@app.middleware("http")
+async def pregenerate_exports_after_mutation(request: Request, call_next):
+    response = await call_next(request)
+    if request.method in _MUTATING_METHODS and response.status_code < 400:
+        schedule_export_pregeneration_for_path(request.url.path)
+    return response
+
 
 @app.get("/")
 def read_root():
@@ -1,10 +1,22 @@
 import json
+import logging
+import os
 import re
 import shutil
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from .database import MIGRATION_SKIPPED, WORK_MASTER_FTS_STATEMENTS
+
+logger = logging.getLogger(__name__)
 
 PROJECT_DIR = Path(__file__).resolve().parent
 PROJECT_DB_DIR = PROJECT_DIR / "pjt_db"
@@ -13,6 +25,16 @@ MANIFEST_PATH = PROJECT_DB_DIR / "project_db_manifest.json"
 TEMPLATE_DB = PROJECT_DIR / "b-note-dev.db"
 ADMIN_KEY = "HECBIM"
 BACKUP_DIR = PROJECT_DB_DIR / "backup"
+EXPORT_CACHE_DIR = PROJECT_DB_DIR / "export_cache"
+EXPORT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+EXPORT_CACHE_SUFFIXES = {"db-excel": ".xlsx", "dynamo-json": ".json"}
+# Excel/Dynamo JSON 출력 형식을 바꾸면 올린다. 캐시 파일 이름과 ETag 에 들어가므로
+# DB 가 그대로인 프로젝트도 배포 후 첫 요청에서 새 형식으로 다시 생성된다.
+EXPORT_FORMAT_VERSION = 1
+
+# Pooled engine registry for project DB files (keyed by resolved path).
+PROJECT_ENGINE_CACHE_SIZE = 16
+PROJECT_ENGINE_IDLE_SECONDS = 600
 
 FILENAME_PATTERN = re.compile(r'^[^<>:"/\\|\?\*\x00-\x1F]+\.db$', re.IGNORECASE)
 EXTRA_TABLE_STATEMENTS = [
@@ -307,154 +329,815 @@ def promote_backup_to_project_db(backup_file_name: str) -> Dict[str, str]:
     target_path = _next_available_path(display_name)
     # Move file first (atomic on same volume) then ensure extra tables + register.
     backup_path.rename(target_path)
-    ensure_extra_tables(target_path)
+    dispose_project_engine(target_path)
+    purge_export_cache(target_path)
+    ensure_extra_tables_once(target_path)
     _register_entry(target_path.name, target_path.stem)
     return _entry_from_path(target_path.name, _metadata_for(target_path.name))
 
 
-def ensure_extra_tables(db_path: Path) -> None:
-    conn = sqlite3.connect(db_path.as_posix())
-    try:
-        cursor = conn.cursor()
-        for stmt in EXTRA_TABLE_STATEMENTS:
-            cursor.execute(stmt)
+def _migrate_extra_tables(cursor: sqlite3.Cursor) -> None:
+    for stmt in EXTRA_TABLE_STATEMENTS:
+        cursor.execute(stmt)
+
+    cursor.execute("PRAGMA table_info(calc_result)")
+    calc_result_columns = {row[1] for row in cursor.fetchall()}
+    if "rev_key" not in calc_result_columns:
+        cursor.execute("ALTER TABLE calc_result ADD COLUMN rev_key TEXT")
+    if "gauge" not in calc_result_columns:
+        cursor.execute("ALTER TABLE calc_result ADD COLUMN gauge TEXT")
+
+    cursor.execute("PRAGMA table_info(family_revit_type)")
+    frt_columns = {row[1] for row in cursor.fetchall()}
+    if "building_name" not in frt_columns:
+        cursor.execute("ALTER TABLE family_revit_type ADD COLUMN building_name TEXT")
+
+    cursor.execute("PRAGMA table_info(work_master_precheck)")
+    wmp_columns = {row[1] for row in cursor.fetchall()}
+    if "other_opinion" not in wmp_columns:
+        cursor.execute("ALTER TABLE work_master_precheck ADD COLUMN other_opinion TEXT")
+
+    cursor.execute("PRAGMA table_info(work_masters)")
+    wm_columns = {row[1] for row in cursor.fetchall()}
+    if "add_spec" not in wm_columns:
+        cursor.execute("ALTER TABLE work_masters ADD COLUMN add_spec TEXT")
+    if "gauge" not in wm_columns:
+        cursor.execute("ALTER TABLE work_masters ADD COLUMN gauge TEXT")
+    cursor.execute("PRAGMA table_info(project_metadata)")
+    meta_columns = {row[1] for row in cursor.fetchall()}
+    if "pjt_abbr" not in meta_columns:
+        cursor.execute("ALTER TABLE project_metadata ADD COLUMN pjt_abbr TEXT")
+    if "pjt_description" not in meta_columns:
+        cursor.execute("ALTER TABLE project_metadata ADD COLUMN pjt_description TEXT")
+    cursor.execute("PRAGMA table_info(standard_items)")
+    std_columns = {row[1] for row in cursor.fetchall()}
+    if "derive_from" not in std_columns:
+        cursor.execute("ALTER TABLE standard_items ADD COLUMN derive_from INTEGER")
+
+
+def _migrate_performance_indexes(cursor: sqlite3.Cursor) -> None:
+    # WorkMaster equality join/lookup (used in calc_result join + duplication flows)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_work_masters_work_master_code ON work_masters (work_master_code)"
+    )
 
-        cursor.execute("PRAGMA table_info(calc_result)")
-        calc_result_columns = {row[1] for row in cursor.fetchall()}
-        if "rev_key" not in calc_result_columns:
-            cursor.execute("ALTER TABLE calc_result ADD COLUMN rev_key TEXT")
-        if "gauge" not in calc_result_columns:
-            cursor.execute("ALTER TABLE calc_result ADD COLUMN gauge TEXT")
+    # Association table has no PK/index by default; add FK indexes for joins/deletes.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_siwma_standard_item_id ON standard_item_work_master_association (standard_item_id)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_siwma_work_master_id ON standard_item_work_master_association (work_master_id)"
+    )
 
-        cursor.execute("PRAGMA table_info(family_revit_type)")
-        frt_columns = {row[1] for row in cursor.fetchall()}
-        if "building_name" not in frt_columns:
-            cursor.execute(
-                "ALTER TABLE family_revit_type ADD COLUMN building_name TEXT"
-            )
+    # Deletes / lookups by work_master_id happen frequently.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_siwms_work_master_id ON standard_item_work_master_select (work_master_id)"
+    )
 
-        cursor.execute("PRAGMA table_info(work_master_precheck)")
-        wmp_columns = {row[1] for row in cursor.fetchall()}
-        if "other_opinion" not in wmp_columns:
-            cursor.execute(
-                "ALTER TABLE work_master_precheck ADD COLUMN other_opinion TEXT"
-            )
+    # Family-related lookups
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_calc_dictionary_family_list_id ON calc_dictionary (family_list_id)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_family_revit_type_family_list_id ON family_revit_type (family_list_id)"
+    )
 
-        cursor.execute("PRAGMA table_info(work_masters)")
-        wm_columns = {row[1] for row in cursor.fetchall()}
-        if "add_spec" not in wm_columns:
-            cursor.execute("ALTER TABLE work_masters ADD COLUMN add_spec TEXT")
-        if "gauge" not in wm_columns:
-            cursor.execute("ALTER TABLE work_masters ADD COLUMN gauge TEXT")
-        cursor.execute("PRAGMA table_info(project_metadata)")
-        meta_columns = {row[1] for row in cursor.fetchall()}
-        if "pjt_abbr" not in meta_columns:
-            cursor.execute("ALTER TABLE project_metadata ADD COLUMN pjt_abbr TEXT")
-        if "pjt_description" not in meta_columns:
-            cursor.execute(
-                "ALTER TABLE project_metadata ADD COLUMN pjt_description TEXT"
-            )
-        cursor.execute("PRAGMA table_info(standard_items)")
-        std_columns = {row[1] for row in cursor.fetchall()}
-        if "derive_from" not in std_columns:
-            cursor.execute("ALTER TABLE standard_items ADD COLUMN derive_from INTEGER")
+    # Calc result browsing & deletes (building_name/rev_key filters)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_calc_result_building_name ON calc_result (building_name)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_calc_result_rev_key ON calc_result (rev_key)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_calc_result_building_rev ON calc_result (building_name, rev_key)"
+    )
 
-        # --- Performance indexes (safe to apply repeatedly) ---
-        # WorkMaster equality join/lookup (used in calc_result join + duplication flows)
+
+def _migrate_calc_dictionary(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("PRAGMA table_info(calc_dictionary)")
+    calc_cols = cursor.fetchall()
+    if not calc_cols:
+        return
+    col_names = {row[1] for row in calc_cols}
+    notnull_by_name = {row[1]: row[3] for row in calc_cols}
+    if "is_deleted" not in col_names:
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS ix_work_masters_work_master_code ON work_masters (work_master_code)"
+            "ALTER TABLE calc_dictionary ADD COLUMN is_deleted INTEGER NOT NULL DEFAULT 0"
         )
+        col_names.add("is_deleted")
 
-        # Association table has no PK/index by default; add FK indexes for joins/deletes.
+    family_notnull = int(notnull_by_name.get("family_list_id", 0) or 0)
+    if family_notnull == 1:
+        cursor.execute("ALTER TABLE calc_dictionary RENAME TO calc_dictionary_old")
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS ix_siwma_standard_item_id ON standard_item_work_master_association (standard_item_id)"
+            """
+            CREATE TABLE calc_dictionary (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                family_list_id INTEGER,
+                calc_code TEXT,
+                symbol_key TEXT NOT NULL,
+                symbol_value TEXT NOT NULL,
+                is_deleted INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                FOREIGN KEY(family_list_id) REFERENCES family_list(id)
+            )
+            """
         )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS ix_siwma_work_master_id ON standard_item_work_master_association (work_master_id)"
+        cursor.execute("PRAGMA table_info(calc_dictionary_old)")
+        old_cols = cursor.fetchall()
+        old_names = {row[1] for row in old_cols}
+        calc_code_expr = "calc_code" if "calc_code" in old_names else "NULL"
+        is_deleted_expr = (
+            "COALESCE(is_deleted, 0)" if "is_deleted" in old_names else "0"
         )
-
-        # Deletes / lookups by work_master_id happen frequently.
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS ix_siwms_work_master_id ON standard_item_work_master_select (work_master_id)"
+            f"""
+            INSERT INTO calc_dictionary (id, family_list_id, calc_code, symbol_key, symbol_value, is_deleted, created_at)
+            SELECT id, family_list_id, {calc_code_expr}, symbol_key, symbol_value, {is_deleted_expr}, created_at
+            FROM calc_dictionary_old
+            """
         )
-
-        # Family-related lookups
+        cursor.execute("DROP TABLE calc_dictionary_old")
+        # The rebuilt table lost its index; recreate it.
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS ix_calc_dictionary_family_list_id ON calc_dictionary (family_list_id)"
         )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS ix_family_revit_type_family_list_id ON family_revit_type (family_list_id)"
+
+    # Legacy behavior: NULL calc_code rows were treated as deleted.
+    cursor.execute("UPDATE calc_dictionary SET is_deleted = 0 WHERE is_deleted IS NULL")
+    cursor.execute(
+        "UPDATE calc_dictionary SET is_deleted = 1 WHERE is_deleted = 0 AND calc_code IS NULL"
+    )
+
+
+# calc_result rows that only carry a work_master_code get the lowest matching
+# WorkMaster id, so readers can use a plain `wm.id = cr.work_master_id` join.
+# {scope} narrows the rows (e.g. to newly created codes); empty for the migration.
+CALC_RESULT_UNRESOLVED_WORK_MASTER_WHERE = """
+    work_master_id IS NULL
+      AND work_master_code IS NOT NULL
+      AND EXISTS (
+        SELECT 1 FROM work_masters wm
+        WHERE wm.work_master_code = calc_result.work_master_code
+      ) {scope}
+"""
+CALC_RESULT_WORK_MASTER_ID_BACKFILL_TEMPLATE = (
+    """
+    UPDATE calc_result
+    SET work_master_id = (
+        SELECT MIN(wm.id) FROM work_masters wm
+        WHERE wm.work_master_code = calc_result.work_master_code
+    )
+    WHERE"""
+    + CALC_RESULT_UNRESOLVED_WORK_MASTER_WHERE
+)
+CALC_RESULT_WORK_MASTER_ID_BACKFILL_SQL = CALC_RESULT_WORK_MASTER_ID_BACKFILL_TEMPLATE.format(
+    scope=""
+)
+
+
+def _migrate_calc_result_work_master_ids(cursor: sqlite3.Cursor) -> None:
+    cursor.execute(CALC_RESULT_WORK_MASTER_ID_BACKFILL_SQL)
+
+
+# Per-(rev_key, building) BOQ totals maintained alongside calc_result so report reads
+# scale with the number of work masters instead of the number of result rows.
+# NULL-able calc_result columns are stored as ''/0 so they can be part of the key;
+# work_master_code only distinguishes rows whose work_master_id is unresolved (0).
+CALC_RESULT_SUMMARY_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS calc_result_summary (
+        rev_key TEXT NOT NULL,
+        building_name TEXT NOT NULL DEFAULT '',
+        work_master_id INTEGER NOT NULL DEFAULT 0,
+        work_master_code TEXT NOT NULL DEFAULT '',
+        gauge TEXT NOT NULL DEFAULT '',
+        unit TEXT NOT NULL DEFAULT '',
+        qty REAL NOT NULL DEFAULT 0,
+        row_count INTEGER NOT NULL DEFAULT 0,
+        last_calc_result_id INTEGER NOT NULL,
+        category TEXT,
+        detail_classification TEXT,
+        PRIMARY KEY (rev_key, building_name, work_master_id, work_master_code, gauge, unit)
+    )
+"""
+
+# category/detail_classification are bare columns next to MAX(cr.id), so SQLite takes
+# them from the latest row of each group.
+CALC_RESULT_SUMMARY_AGGREGATE_SQL = """
+    SELECT
+        cr.rev_key AS rev_key,
+        TRIM(COALESCE(cr.building_name, '')) AS building_name,
+        COALESCE(cr.work_master_id, 0) AS work_master_id,
+        TRIM(COALESCE(cr.work_master_code, '')) AS work_master_code,
+        TRIM(COALESCE(cr.gauge, '')) AS gauge,
+        COALESCE(cr.unit, '') AS unit,
+        SUM(COALESCE(cr.result, 0)) AS qty,
+        COUNT(*) AS row_count,
+        MAX(cr.id) AS last_calc_result_id,
+        cr.category AS category,
+        cr.detail_classification AS detail_classification
+    FROM calc_result cr
+    WHERE cr.rev_key IS NOT NULL {scope}
+    GROUP BY 1, 2, 3, 4, 5, 6
+"""
+
+_CALC_RESULT_SUMMARY_COLUMNS = (
+    "rev_key, building_name, work_master_id, work_master_code, gauge, unit, "
+    "qty, row_count, last_calc_result_id, category, detail_classification"
+)
+
+CALC_RESULT_SUMMARY_SCOPE_DELETE_SQL = (
+    "DELETE FROM calc_result_summary WHERE rev_key = :rev_key AND building_name = :building_name"
+)
+CALC_RESULT_SUMMARY_SCOPE_INSERT_SQL = (
+    f"INSERT INTO calc_result_summary ({_CALC_RESULT_SUMMARY_COLUMNS}) "
+    + CALC_RESULT_SUMMARY_AGGREGATE_SQL.format(
+        scope="AND cr.rev_key = :rev_key AND TRIM(COALESCE(cr.building_name, '')) = :building_name"
+    )
+)
+CALC_RESULT_SUMMARY_REBUILD_SQL = [
+    "DELETE FROM calc_result_summary",
+    f"INSERT INTO calc_result_summary ({_CALC_RESULT_SUMMARY_COLUMNS}) "
+    + CALC_RESULT_SUMMARY_AGGREGATE_SQL.format(scope=""),
+]
+
+
+def rebuild_calc_result_summary(cursor: sqlite3.Cursor) -> int:
+    """Recompute calc_result_summary from scratch. Returns the number of summary rows."""
+
+    for stmt in CALC_RESULT_SUMMARY_REBUILD_SQL:
+        cursor.execute(stmt)
+    return int(cursor.execute("SELECT COUNT(*) FROM calc_result_summary").fetchone()[0])
+
+
+def check_calc_result_summary(
+    cursor: sqlite3.Cursor, tolerance: float = 1e-6, sample_limit: int = 50
+) -> Dict[str, object]:
+    """Compare calc_result_summary with a fresh aggregate of calc_result."""
+
+    key_len = 6
+    expected = {
+        tuple(row[:key_len]): row[key_len:]
+        for row in cursor.execute(CALC_RESULT_SUMMARY_AGGREGATE_SQL.format(scope=""))
+    }
+    actual = {
+        tuple(row[:key_len]): row[key_len:]
+        for row in cursor.execute(
+            f"SELECT {_CALC_RESULT_SUMMARY_COLUMNS} FROM calc_result_summary"
         )
+    }
+
+    missing = [key for key in expected if key not in actual]
+    extra = [key for key in actual if key not in expected]
+    mismatched = []
+    for key, exp in expected.items():
+        act = actual.get(key)
+        if act is None:
+            continue
+        if (
+            abs(float(exp[0] or 0) - float(act[0] or 0)) > tolerance
+            or int(exp[1]) != int(act[1])
+            or int(exp[2]) != int(act[2])
+            or tuple(exp[3:]) != tuple(act[3:])
+        ):
+            mismatched.append(key)
+
+    def _keys(keys):
+        return [list(key) for key in keys[:sample_limit]]
+
+    return {
+        "ok": not (missing or extra or mismatched),
+        "expected_rows": len(expected),
+        "summary_rows": len(actual),
+        "missing": len(missing),
+        "extra": len(extra),
+        "mismatched": len(mismatched),
+        "missing_keys": _keys(missing),
+        "extra_keys": _keys(extra),
+        "mismatched_keys": _keys(mismatched),
+    }
+
 
-        # Calc result browsing & deletes (building_name/rev_key filters)
+def _migrate_calc_result_summary(cursor: sqlite3.Cursor) -> None:
+    cursor.execute(CALC_RESULT_SUMMARY_TABLE_SQL)
+    rebuild_calc_result_summary(cursor)
+
+
+# WorkMaster cart entry lists, one row per list element (position keeps the list order).
+# These tables and workmaster_cart_entries.formula are the only record of an entry;
+# payload is left as CART_ENTRY_EMPTY_PAYLOAD (builds that still read payload see
+# empty lists). Legacy payloads are folded in once by _migrate_cart_entry_payload_lists.
+# (normalized payload key, table, value column, value type)
+CART_ENTRY_LINK_TABLES = (
+    ("revit_types", "cart_entry_revit_type", "revit_type", "TEXT"),
+    ("assignment_ids", "cart_entry_assignment", "assignment_id", "INTEGER"),
+    ("standard_item_ids", "cart_entry_standard_item", "standard_item_id", "INTEGER"),
+    ("building_names", "cart_entry_building", "building_name", "TEXT"),
+)
+CART_ENTRY_EMPTY_PAYLOAD = "{}"
+
+
+def normalize_cart_payload(raw_payload) -> dict:
+    def _ensure_list(value):
+        return value if isinstance(value, list) else []
+
+    revit_types = raw_payload.get("revitTypes") or raw_payload.get("revit_types") or []
+    assignment_ids = (
+        raw_payload.get("assignmentIds") or raw_payload.get("assignment_ids") or []
+    )
+    standard_item_ids = (
+        raw_payload.get("standardItemIds") or raw_payload.get("standard_item_ids") or []
+    )
+    building_names = (
+        raw_payload.get("buildingNames") or raw_payload.get("building_names") or []
+    )
+    formula = raw_payload.get("formula")
+    return {
+        "revit_types": _ensure_list(revit_types),
+        "assignment_ids": _ensure_list(assignment_ids),
+        "standard_item_ids": _ensure_list(standard_item_ids),
+        "building_names": _ensure_list(building_names),
+        "formula": formula,
+    }
+
+
+def cart_entry_link_rows(entry_id: int, normalized: dict) -> Dict[str, list]:
+    """table -> [(cart_entry_id, position, value)] for one normalized cart payload."""
+
+    out = {}
+    for key, table, _column, _type in CART_ENTRY_LINK_TABLES:
+        rows = []
+        for position, value in enumerate(normalized.get(key) or []):
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, ensure_ascii=False)
+            rows.append((int(entry_id), position, value))
+        out[table] = rows
+    return out
+
+
+def _migrate_cart_entry_links(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("PRAGMA table_info(workmaster_cart_entries)")
+    cart_columns = {row[1] for row in cursor.fetchall()}
+    if "formula" not in cart_columns:
+        cursor.execute("ALTER TABLE workmaster_cart_entries ADD COLUMN formula TEXT")
+    for _key, table, column, value_type in CART_ENTRY_LINK_TABLES:
+        # 엔트리 삭제 시 링크 행은 api._delete_cart_entries 가 같이 지운다
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS ix_calc_result_building_name ON calc_result (building_name)"
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                cart_entry_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                {column} {value_type},
+                PRIMARY KEY (cart_entry_id, position)
+            ) WITHOUT ROWID
+            """
         )
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS ix_calc_result_rev_key ON calc_result (rev_key)"
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})"
         )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS ix_calc_result_building_rev ON calc_result (building_name, rev_key)"
+
+
+def _migrate_cart_entry_payload_lists(cursor: sqlite3.Cursor) -> None:
+    """Fold legacy payload JSON into the formula column and cart_entry_* rows.
+
+    Only entries whose payload is not CART_ENTRY_EMPTY_PAYLOAD are touched (their
+    link rows are rebuilt, then the payload is cleared), so this is idempotent.
+    Also drops the payload-sync triggers an earlier build of this step created.
+    """
+
+    for name in ("insert", "update", "delete"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS cart_entry_links_{name}")
+
+    # payload JSON -> formula 컬럼 + link 테이블
+    entries = cursor.execute(
+        "SELECT id, payload FROM workmaster_cart_entries WHERE payload != ?",
+        (CART_ENTRY_EMPTY_PAYLOAD,),
+    ).fetchall()
+    if not entries:
+        return
+    formulas = []
+    link_rows = {table: [] for _key, table, _column, _type in CART_ENTRY_LINK_TABLES}
+    for entry_id, payload_raw in entries:
+        try:
+            payload = json.loads(payload_raw or "{}")
+        except json.JSONDecodeError:
+            payload = {}
+        normalized = normalize_cart_payload(payload if isinstance(payload, dict) else {})
+        formulas.append((normalized["formula"], CART_ENTRY_EMPTY_PAYLOAD, int(entry_id)))
+        for table, rows in cart_entry_link_rows(entry_id, normalized).items():
+            link_rows[table].extend(rows)
+    entry_ids = [(int(entry_id),) for entry_id, _payload in entries]
+    for _key, table, column, _type in CART_ENTRY_LINK_TABLES:
+        cursor.executemany(f"DELETE FROM {table} WHERE cart_entry_id = ?", entry_ids)
+        cursor.executemany(
+            f"INSERT INTO {table} (cart_entry_id, position, {column}) VALUES (?, ?, ?)",
+            link_rows[table],
         )
+    cursor.executemany(
+        "UPDATE workmaster_cart_entries SET formula = ?, payload = ? WHERE id = ?",
+        formulas,
+    )
 
-        # calc_dictionary migrations
-        cursor.execute("PRAGMA table_info(calc_dictionary)")
-        calc_cols = cursor.fetchall()
-        if calc_cols:
-            col_names = {row[1] for row in calc_cols}
-            notnull_by_name = {row[1]: row[3] for row in calc_cols}
-            if "is_deleted" not in col_names:
-                cursor.execute(
-                    "ALTER TABLE calc_dictionary ADD COLUMN is_deleted INTEGER NOT NULL DEFAULT 0"
-                )
-                col_names.add("is_deleted")
 
-            family_notnull = int(notnull_by_name.get("family_list_id", 0) or 0)
-            if family_notnull == 1:
-                cursor.execute(
-                    "ALTER TABLE calc_dictionary RENAME TO calc_dictionary_old"
-                )
-                cursor.execute(
-                    """
-                    CREATE TABLE calc_dictionary (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        family_list_id INTEGER,
-                        calc_code TEXT,
-                        symbol_key TEXT NOT NULL,
-                        symbol_value TEXT NOT NULL,
-                        is_deleted INTEGER NOT NULL DEFAULT 0,
-                        created_at TEXT NOT NULL,
-                        FOREIGN KEY(family_list_id) REFERENCES family_list(id)
-                    )
-                    """
-                )
-                cursor.execute("PRAGMA table_info(calc_dictionary_old)")
-                old_cols = cursor.fetchall()
-                old_names = {row[1] for row in old_cols}
-                calc_code_expr = "calc_code" if "calc_code" in old_names else "NULL"
-                is_deleted_expr = (
-                    "COALESCE(is_deleted, 0)" if "is_deleted" in old_names else "0"
+# calc-result manual update dirty tracking. Triggers record what changed since the
+# last manual update of each rev_key; each (kind, ref) keeps one row whose seq is
+# bumped by INSERT OR REPLACE, so the table stays as small as the set of changed refs.
+#   cart_entry  ref = workmaster_cart_entries.id
+#   calc_family ref = calc_dictionary.family_list_id
+#   building    ref = building name (building_list, or manual calc_result rows deleted)
+#   all         ref = ''  (assignments, family/standard trees, selected WorkMasters)
+CALC_MANUAL_CHANGE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS calc_manual_change (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        ref TEXT NOT NULL DEFAULT '',
+        UNIQUE (kind, ref)
+    )
+"""
+CALC_MANUAL_UPDATE_STATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS calc_manual_update_state (
+        rev_key TEXT PRIMARY KEY,
+        last_seq INTEGER NOT NULL,
+        updated_at TEXT NOT NULL
+    )
+"""
+CALC_MANUAL_MANUAL_GUID = "수동항목"
+
+# (table, kind, ref expression over {row}, events, extra WHEN condition over {row})
+_CALC_MANUAL_CHANGE_SOURCES = (
+    ("workmaster_cart_entries", "cart_entry", "{row}.id", ("INSERT", "UPDATE", "DELETE"), None),
+    ("calc_dictionary", "calc_family", "{row}.family_list_id", ("INSERT", "UPDATE", "DELETE"), None),
+    ("building_list", "building", "TRIM({row}.name)", ("INSERT", "UPDATE", "DELETE"), None),
+    # INSERT OR REPLACE 의 충돌 삭제는 recursive_triggers 가 꺼져 있어 여기 걸리지 않는다
+    (
+        "calc_result",
+        "building",
+        "TRIM({row}.building_name)",
+        ("DELETE",),
+        f"{{row}}.guid = '{CALC_MANUAL_MANUAL_GUID}'",
+    ),
+    ("gwm_family_assign", "all", None, ("INSERT", "UPDATE", "DELETE"), None),
+    ("family_list", "all", None, ("INSERT", "UPDATE", "DELETE"), None),
+    ("standard_items", "all", None, ("INSERT", "UPDATE", "DELETE"), None),
+    ("standard_item_work_master_select", "all", None, ("INSERT", "UPDATE", "DELETE"), None),
+    ("work_masters", "all", None, ("UPDATE", "DELETE"), None),
+)
+
+# 'all' 이 이미 모든 rev_key 의 마지막 갱신 이후로 기록돼 있으면 다시 쓰지 않는다 (대량 갱신 대비)
+_CALC_MANUAL_ALL_PENDING_SQL = (
+    "NOT EXISTS (SELECT 1 FROM calc_manual_change WHERE kind = 'all' AND ref = '' "
+    "AND seq > (SELECT COALESCE(MAX(last_seq), 0) FROM calc_manual_update_state))"
+)
+
+
+def _calc_manual_change_trigger_statements() -> List[Tuple[str, str]]:
+    """(table, CREATE TRIGGER sql) for every tracked table/event."""
+
+    statements = []
+    for table, kind, ref_expr, events, condition in _CALC_MANUAL_CHANGE_SOURCES:
+        for event in events:
+            rows = {"INSERT": ("new",), "DELETE": ("old",), "UPDATE": ("old", "new")}[event]
+            if ref_expr is None:
+                rows = rows[:1]
+            body = []
+            for row in rows:
+                ref_sql = (
+                    f"COALESCE(CAST({ref_expr.format(row=row)} AS TEXT), '')"
+                    if ref_expr
+                    else "''"
                 )
-                cursor.execute(
-                    f"""
-                    INSERT INTO calc_dictionary (id, family_list_id, calc_code, symbol_key, symbol_value, is_deleted, created_at)
-                    SELECT id, family_list_id, {calc_code_expr}, symbol_key, symbol_value, {is_deleted_expr}, created_at
-                    FROM calc_dictionary_old
-                    """
+                body.append(
+                    f"INSERT OR REPLACE INTO calc_manual_change (kind, ref) VALUES ('{kind}', {ref_sql});"
                 )
-                cursor.execute("DROP TABLE calc_dictionary_old")
+            conditions = [c.format(row=rows[0]) for c in (condition,) if c]
+            if ref_expr is None:
+                conditions.append(_CALC_MANUAL_ALL_PENDING_SQL)
+            when_sql = f" WHEN {' AND '.join(conditions)}" if conditions else ""
+            statements.append((
+                table,
+                f"CREATE TRIGGER IF NOT EXISTS calc_manual_change_{table}_{event.lower()} "
+                f"AFTER {event} ON {table}{when_sql} BEGIN {' '.join(body)} END",
+            ))
+    return statements
+
+
+def _migrate_calc_manual_change_tracking(cursor: sqlite3.Cursor) -> None:
+    cursor.execute(CALC_MANUAL_CHANGE_TABLE_SQL)
+    cursor.execute(CALC_MANUAL_UPDATE_STATE_TABLE_SQL)
+    existing = {
+        row[0]
+        for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    for table, stmt in _calc_manual_change_trigger_statements():
+        if table in existing:
+            cursor.execute(stmt)
 
+
+def _migrate_work_master_search_index(cursor: sqlite3.Cursor) -> Optional[str]:
+    # FTS5/trigram 미지원 SQLite 면 건너뜀 (검색은 ILIKE 로 동작, 다음 열기에서 재시도)
+    cursor.execute("SAVEPOINT work_master_fts")
+    try:
+        for stmt in WORK_MASTER_FTS_STATEMENTS:
+            cursor.execute(stmt)
+    except sqlite3.OperationalError:
+        cursor.execute("ROLLBACK TO work_master_fts")
+        cursor.execute("RELEASE work_master_fts")
+        return MIGRATION_SKIPPED
+    cursor.execute("RELEASE work_master_fts")
+    return None
+
+
+# Ordered schema migrations for project DBs. Step N stamps `PRAGMA user_version = N`,
+# so append new steps at the end and never reorder or remove existing ones.
+PROJECT_SCHEMA_MIGRATIONS = [
+    _migrate_extra_tables,
+    _migrate_performance_indexes,
+    _migrate_calc_dictionary,
+    _migrate_calc_result_work_master_ids,
+    _migrate_calc_result_summary,
+    _migrate_work_master_search_index,
+    _migrate_cart_entry_links,
+    _migrate_calc_manual_change_tracking,
+    _migrate_cart_entry_payload_lists,
+]
+PROJECT_SCHEMA_VERSION = len(PROJECT_SCHEMA_MIGRATIONS)
+
+# A step that returns MIGRATION_SKIPPED still gets its version stamped (later steps
+# must run), but is listed here and retried every time the DB is ensured.
+PROJECT_SCHEMA_SKIPPED_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS project_schema_skipped (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        skipped_at TEXT NOT NULL
+    )
+"""
+
+
+def _apply_project_step(cursor: sqlite3.Cursor, step_version: int, retry: bool) -> None:
+    migrate = PROJECT_SCHEMA_MIGRATIONS[step_version - 1]
+    if migrate(cursor) == MIGRATION_SKIPPED:
+        logger.warning(
+            "project schema step %s (%s) skipped; it will be retried on next open",
+            step_version,
+            migrate.__name__,
+        )
+        if not retry:
+            cursor.execute(PROJECT_SCHEMA_SKIPPED_TABLE_SQL)
             cursor.execute(
-                "UPDATE calc_dictionary SET is_deleted = 0 WHERE is_deleted IS NULL"
-            )
-            cursor.execute(
-                "UPDATE calc_dictionary SET is_deleted = 1 WHERE is_deleted = 0 AND calc_code IS NULL"
+                "INSERT OR REPLACE INTO project_schema_skipped (version, name, skipped_at) "
+                "VALUES (?, ?, ?)",
+                (step_version, migrate.__name__, datetime.utcnow().isoformat()),
             )
-        conn.commit()
+    elif retry:
+        cursor.execute(
+            "DELETE FROM project_schema_skipped WHERE version = ?", (step_version,)
+        )
+
+
+def ensure_extra_tables(db_path: Path) -> None:
+    """Bring a project DB up to `PROJECT_SCHEMA_VERSION`.
+
+    A DB that is already current costs a `PRAGMA user_version` read plus a
+    sqlite_master lookup for previously skipped steps.
+    """
+
+    conn = sqlite3.connect(db_path.as_posix())
+    try:
+        cursor = conn.cursor()
+        version = int(cursor.execute("PRAGMA user_version").fetchone()[0] or 0)
+        has_skipped = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'project_schema_skipped'"
+        ).fetchone()
+        if has_skipped:
+            for (step_version,) in cursor.execute(
+                "SELECT version FROM project_schema_skipped ORDER BY version"
+            ).fetchall():
+                if 0 < step_version <= min(version, PROJECT_SCHEMA_VERSION):
+                    _apply_project_step(cursor, int(step_version), retry=True)
+                    conn.commit()
+        for step_version in range(version + 1, PROJECT_SCHEMA_VERSION + 1):
+            _apply_project_step(cursor, step_version, retry=False)
+            cursor.execute(f"PRAGMA user_version = {int(step_version)}")
+            conn.commit()
     finally:
         conn.close()
 
 
+_project_engines: "OrderedDict[str, Dict[str, object]]" = OrderedDict()
+_ensured_signatures: Dict[str, Tuple[int, int]] = {}
+_project_engines_lock = threading.RLock()
+# 경로별 마이그레이션 잠금: 큰 프로젝트의 첫 마이그레이션이 다른 프로젝트를 막지 않게
+_ensure_locks: Dict[str, threading.Lock] = {}
+
+
+def _file_signature(db_path: Path) -> Tuple[int, int]:
+    stat = db_path.stat()
+    return (int(stat.st_dev), int(stat.st_ino))
+
+
+def _ensure_lock(key: str) -> threading.Lock:
+    with _project_engines_lock:
+        return _ensure_locks.setdefault(key, threading.Lock())
+
+
+def ensure_extra_tables_once(db_path: Path) -> None:
+    """Run `ensure_extra_tables` once per physical file.
+
+    The file is re-checked only when its inode changes (file replaced by a
+    copy/promote) or after `dispose_project_engine` dropped the cached state.
+    Single-flight per path: concurrent callers for the same file wait for the
+    running migration; the registry lock is only held for the bookkeeping.
+    """
+
+    key = db_path.resolve().as_posix()
+    signature = _file_signature(db_path)
+    with _project_engines_lock:
+        if _ensured_signatures.get(key) == signature:
+            return
+    with _ensure_lock(key):
+        with _project_engines_lock:
+            if _ensured_signatures.get(key) == signature:
+                return
+        ensure_extra_tables(db_path)
+        with _project_engines_lock:
+            _ensured_signatures[key] = signature
+
+
+def _dispose_entry(entry: Dict[str, object]) -> None:
+    try:
+        entry["engine"].dispose()
+    except Exception:
+        pass
+
+
+def _evict_idle_engines(now: float) -> None:
+    for key in [
+        k
+        for k, entry in _project_engines.items()
+        if now - float(entry["last_used"]) > PROJECT_ENGINE_IDLE_SECONDS
+    ]:
+        _dispose_entry(_project_engines.pop(key))
+    while len(_project_engines) > PROJECT_ENGINE_CACHE_SIZE:
+        _, entry = _project_engines.popitem(last=False)
+        _dispose_entry(entry)
+
+
+def get_project_sessionmaker(db_path: Path) -> sessionmaker:
+    """Return a cached session factory bound to a pooled engine for `db_path`.
+
+    Engines are kept in a bounded LRU; idle ones are disposed on access.
+    """
+
+    key = db_path.resolve().as_posix()
+    signature = _file_signature(db_path)
+    now = time.monotonic()
+    with _project_engines_lock:
+        entry = _project_engines.get(key)
+        current = entry is not None and entry["signature"] == signature
+    if not current:
+        # 마이그레이션은 레지스트리 잠금 밖에서 (경로별 single-flight)
+        ensure_extra_tables_once(db_path)
+    with _project_engines_lock:
+        entry = _project_engines.get(key)
+        if entry is not None and entry["signature"] != signature:
+            _dispose_entry(_project_engines.pop(key))
+            entry = None
+        if entry is None:
+            engine = create_engine(
+                f"sqlite:///{key}",
+                connect_args={"check_same_thread": False},
+            )
+            entry = {
+                "engine": engine,
+                "session_factory": sessionmaker(
+                    autocommit=False, autoflush=False, bind=engine
+                ),
+                "signature": signature,
+                "last_used": now,
+            }
+            _project_engines[key] = entry
+        entry["last_used"] = now
+        _project_engines.move_to_end(key)
+        _evict_idle_engines(now)
+        return entry["session_factory"]
+
+
+def connect_project_db_read_only(db_path: Path) -> sqlite3.Connection:
+    """Open a read-only sqlite3 connection (one per worker thread for exports)."""
+
+    uri = f"{db_path.resolve().as_uri()}?mode=ro"
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+
+def _export_cache_prefix(db_path: Path, kind: str) -> str:
+    return f"{db_path.stem}__{kind}__"
+
+
+def export_cache_path(db_path: Path, kind: str, revision: str) -> Path:
+    """Cached export artifact for (project, export kind, `mtime_ns:size` revision).
+
+    The name also carries EXPORT_FORMAT_VERSION, so artifacts written by a build
+    with another output format are never served; `store_export_artifact` removes
+    them with the other stale revisions.
+    """
+
+    suffix = EXPORT_CACHE_SUFFIXES[kind]
+    safe_revision = revision.replace(":", "-")
+    return EXPORT_CACHE_DIR / (
+        f"{_export_cache_prefix(db_path, kind)}{safe_revision}"
+        f"-f{EXPORT_FORMAT_VERSION}{suffix}"
+    )
+
+
+def touch_export_cache(path: Path) -> None:
+    """Mark a cache hit; mtime is the LRU clock for eviction."""
+
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def store_export_artifact(tmp_path: Path, cache_path: Path) -> None:
+    """Move a finished artifact into the cache and drop older revisions of it."""
+
+    os.replace(tmp_path, cache_path)
+    prefix = cache_path.stem.rsplit("__", 1)[0] + "__"
+    for path in EXPORT_CACHE_DIR.iterdir():
+        if (
+            path != cache_path
+            and path.name.startswith(prefix)
+            and path.suffix == cache_path.suffix
+        ):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+    evict_export_cache(keep=cache_path)
+
+
+def evict_export_cache(
+    max_bytes: int = EXPORT_CACHE_MAX_BYTES, keep: Optional[Path] = None
+) -> int:
+    """Delete least recently used artifacts until the cache fits in `max_bytes`."""
+
+    entries = []
+    for path in EXPORT_CACHE_DIR.iterdir():
+        if path.suffix not in EXPORT_CACHE_SUFFIXES.values():
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        if keep is not None and path == keep:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def purge_export_cache(db_path: Path) -> None:
+    """Drop every cached artifact of a project (DB renamed/deleted/replaced)."""
+
+    if not EXPORT_CACHE_DIR.exists():
+        return
+    prefixes = tuple(_export_cache_prefix(db_path, kind) for kind in EXPORT_CACHE_SUFFIXES)
+    for path in EXPORT_CACHE_DIR.iterdir():
+        if not path.name.startswith(prefixes):
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def dispose_project_engine(db_path: Path) -> None:
+    """Close pooled connections for `db_path` and forget its schema state.
+
+    Must run before the file is renamed/deleted (open handles block this on Windows).
+    """
+
+    key = db_path.resolve().as_posix()
+    # 진행 중인 마이그레이션이 끝난 뒤에 파일을 놓아준다
+    with _ensure_lock(key):
+        with _project_engines_lock:
+            entry = _project_engines.pop(key, None)
+            _ensured_signatures.pop(key, None)
+    if entry is not None:
+        _dispose_entry(entry)
+
+
 def create_project_db(display_name: str) -> Dict[str, str]:
     if not display_name.strip():
         raise ValueError("DB 이름을 입력하세요.")
@@ -462,7 +1145,8 @@ def create_project_db(display_name: str) -> Dict[str, str]:
         raise FileNotFoundError("기준 DB 파일을 찾을 수 없습니다.")
     target_path = _next_available_path(display_name)
     shutil.copy(TEMPLATE_DB, target_path)
-    ensure_extra_tables(target_path)
+    dispose_project_engine(target_path)
+    ensure_extra_tables_once(target_path)
     _register_entry(target_path.name, target_path.stem)
     return _entry_from_path(target_path.name, _metadata_for(target_path.name))
 
@@ -478,7 +1162,8 @@ def copy_project_db(
         raise ValueError("복사할 이름을 입력하세요.")
     target_path = _next_available_path(new_display)
     shutil.copy(source_path, target_path)
-    ensure_extra_tables(target_path)
+    dispose_project_engine(target_path)
+    ensure_extra_tables_once(target_path)
     _register_entry(target_path.name, target_path.stem)
     return _entry_from_path(target_path.name, _metadata_for(target_path.name))
 
@@ -494,6 +1179,8 @@ def rename_project_db(source_file: str, new_display_name: str) -> Dict[str, str]
         return _entry_from_path(source_file, _metadata_for(source_file))
     metadata = _metadata_for(source_file)
     created_at = metadata.get("created_at") or datetime.utcnow().isoformat()
+    dispose_project_engine(source_path)
+    purge_export_cache(source_path)
     source_path.rename(dest_path)
     _remove_entry(source_file)
     _register_entry(dest_path.name, dest_path.stem, created_at)
@@ -502,6 +1189,8 @@ def rename_project_db(source_file: str, new_display_name: str) -> Dict[str, str]
 
 def delete_project_db(file_name: str) -> None:
     target_path = _resolve_path(file_name)
+    dispose_project_engine(target_path)
+    purge_export_cache(target_path)
     target_path.unlink()
     _remove_entry(file_name)
 
@@ -571,7 +1260,7 @@ def _fetch_metadata_row(conn: sqlite3.Connection):
 
 
 def read_project_metadata(db_path: Path) -> Dict[str, Optional[str]]:
-    ensure_extra_tables(db_path)
+    ensure_extra_tables_once(db_path)
     conn = sqlite3.connect(db_path.as_posix())
     try:
         row = _fetch_metadata_row(conn)
@@ -585,7 +1274,7 @@ def read_project_metadata(db_path: Path) -> Dict[str, Optional[str]]:
 def update_project_metadata(
     db_path: Path, updates: Dict[str, Optional[str]]
 ) -> Dict[str, Optional[str]]:
-    ensure_extra_tables(db_path)
+    ensure_extra_tables_once(db_path)
     conn = sqlite3.connect(db_path.as_posix())
     try:
         row = _fetch_metadata_row(conn)
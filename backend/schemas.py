@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 import datetime
 
 from .models import StandardItemType
@@ -99,6 +99,39 @@ class WorkMasterBrief(BaseModel):
     uom2: Optional[str] = None
 
 
+class WorkMasterListRow(BaseModel):
+    """WorkMaster list row; only the requested `fields` are set (served with exclude_unset)."""
+
+    id: int
+    discipline: Optional[str] = None
+    cat_large_code: Optional[str] = None
+    cat_large_desc: Optional[str] = None
+    cat_mid_code: Optional[str] = None
+    cat_mid_desc: Optional[str] = None
+    cat_small_code: Optional[str] = None
+    cat_small_desc: Optional[str] = None
+    attr1_code: Optional[str] = None
+    attr1_spec: Optional[str] = None
+    attr2_code: Optional[str] = None
+    attr2_spec: Optional[str] = None
+    attr3_code: Optional[str] = None
+    attr3_spec: Optional[str] = None
+    attr4_code: Optional[str] = None
+    attr4_spec: Optional[str] = None
+    attr5_code: Optional[str] = None
+    attr5_spec: Optional[str] = None
+    attr6_code: Optional[str] = None
+    attr6_spec: Optional[str] = None
+    uom1: Optional[str] = None
+    uom2: Optional[str] = None
+    work_group_code: Optional[str] = None
+    work_master_code: Optional[str] = None
+    new_old_code: Optional[str] = None
+    add_spec: Optional[str] = None
+    gauge: Optional[str] = None
+    standard_items: Optional[List[_StandardItemWithoutRelations]] = None
+
+
 # WorkMaster cart schemas
 class WorkMasterCartEntryBase(BaseModel):
     revit_types: List[str]
@@ -127,6 +160,25 @@ class WorkMasterCartEntry(WorkMasterCartEntryBase):
     calc_dictionary_entries: List["CalcDictionarySymbol"] = Field(default_factory=list)
 
 
+class WorkMasterCartBatchUpdate(WorkMasterCartEntryUpdate):
+    id: int
+
+
+class WorkMasterCartBatchRequest(BaseModel):
+    """Cart mutations applied in one transaction: deletes, then updates, then creates."""
+
+    creates: List[WorkMasterCartEntryCreate] = Field(default_factory=list)
+    updates: List[WorkMasterCartBatchUpdate] = Field(default_factory=list)
+    deletes: List[int] = Field(default_factory=list)
+
+
+class WorkMasterCartBatchResponse(BaseModel):
+    created_ids: List[int] = Field(default_factory=list)
+    created: List[WorkMasterCartEntry] = Field(default_factory=list)
+    updated: List[WorkMasterCartEntry] = Field(default_factory=list)
+    deleted: int = 0
+
+
 class DynamoWorkMasterCartEntry(BaseModel):
     """Export-only cart row shape for Dynamo JSON.
 
@@ -236,6 +288,7 @@ class WorkMasterSummaryResponse(BaseModel):
 class DynamoProjectExportPayload(BaseModel):
     """Dynamo 테스트용으로 프로젝트 DB 내용을 JSON으로 추출하기 위한 페이로드."""
 
+    # 생성 시각(UTC). 캐시된 내보내기 파일은 생성 당시 값을 그대로 돌려준다
     exported_at: datetime.datetime = Field(default_factory=datetime.datetime.utcnow)
     project_identifier: str
     buildings: List["BuildingItem"] = Field(default_factory=list)
@@ -245,6 +298,38 @@ class DynamoProjectExportPayload(BaseModel):
     wm_selection_summary: Optional[WorkMasterSummaryResponse] = None
 
 
+class ExportJobCreate(BaseModel):
+    kind: str = "db-excel"  # "db-excel" | "dynamo-json"
+
+
+class ExportJob(BaseModel):
+    """비동기 내보내기 작업 상태 (queued → running → done | failed)."""
+
+    job_id: str
+    project_identifier: str
+    kind: str
+    status: str
+    sheet_index: int = 0
+    sheet_count: int = 0
+    sheet_name: Optional[str] = None
+    rows_written: int = 0
+    error: Optional[str] = None
+    created_at: datetime.datetime
+    finished_at: Optional[datetime.datetime] = None
+    download_url: Optional[str] = None
+
+
+class CalcResultImportChunk(BaseModel):
+    index: int
+    rows: int
+    elapsed_ms: float
+
+
+class CalcResultImportRejectedRow(BaseModel):
+    index: int
+    reason: str
+
+
 class CalcResultImportResponse(BaseModel):
     project_identifier: str
     building_name: Optional[str] = None
@@ -252,6 +337,9 @@ class CalcResultImportResponse(BaseModel):
     mode: Optional[str] = None
     deleted: int = 0
     inserted: int = 0
+    rejected: int = 0
+    rejected_rows: List[CalcResultImportRejectedRow] = Field(default_factory=list)
+    chunks: List[CalcResultImportChunk] = Field(default_factory=list)
 
 
 class CalcResultDeleteResponse(BaseModel):
@@ -264,6 +352,7 @@ class CalcResultDeleteResponse(BaseModel):
 class CalcResultManualUpdateResponse(BaseModel):
     project_identifier: str
     rev_key: str
+    mode: str = "full"
     buildings: int = 0
     cart_entries_scanned: int = 0
     manual_entries_matched: int = 0
@@ -273,7 +362,7 @@ class CalcResultManualUpdateResponse(BaseModel):
 
 class CalcResultRow(BaseModel):
     id: int
-    created_at: str
+    created_at: Optional[str] = None
     building_name: Optional[str] = None
     rev_key: Optional[str] = None
 
@@ -299,6 +388,26 @@ class CalcResultRow(BaseModel):
     unit: Optional[str] = None
 
 
+class CalcResultBoqRow(BaseModel):
+    wm_code: str
+    gauge: str = ""
+    description: str = ""
+    spec: str = ""
+    add_spec: str = ""
+    uom: str = ""
+    cat_large_desc: str = ""
+    cat_mid_desc: str = ""
+    total: float = 0.0
+    values: List[float] = Field(default_factory=list)
+
+
+class CalcResultBoqResponse(BaseModel):
+    rev_key: str
+    buildings: List[str] = Field(default_factory=list)
+    rows: List[CalcResultBoqRow] = Field(default_factory=list)
+    mid_order: Dict[str, List[str]] = Field(default_factory=dict)
+
+
 class DerivedStandardItemCreate(BaseModel):
     suffix_description: str
     work_master_id: Optional[int] = None
@@ -590,4 +699,5 @@ FamilyListItem.model_rebuild()
 CalcDictionaryEntry.model_rebuild()
 FamilyRevitType.model_rebuild()
 WorkMasterCartEntry.model_rebuild()
+WorkMasterCartBatchResponse.model_rebuild()
 DynamoWorkMasterCartEntry.model_rebuild()
@@ -42,6 +42,9 @@ const deriveEntryBuildingNames = (entry, knownBuildings = []) => {
   return Array.from(new Set(inferred));
 };
 
+// 서버에 저장된 항목만 정수 id 를 가진다 (로컬 임시 항목은 'cart-...')
+const isServerCartId = (id) => Number.isInteger(id) && id > 0;
+
 const normalizeCartEntry = (entry) => ({
   id: entry?.id ?? `cart-${Date.now()}`,
   revitTypes: entry?.revitTypes ?? entry?.revit_types ?? [],
@@ -623,32 +626,32 @@ export default function ProjectFamilyAssign({ apiBaseUrl }) {
     }
 
     try {
-      const results = await Promise.allSettled(
-        entriesToSave.map(async (entry) => {
-          const res = await fetch(`${apiBaseUrl}/workmaster-cart`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-              revit_types: entry.revitTypes,
-              assignment_ids: entry.assignmentIds,
-              standard_item_ids: entry.standardItemIds,
-              building_names: entry.buildingNames,
-              formula: entry.formula,
-            }),
-          });
-          if (!res.ok) throw new Error('save failed');
-          const payload = await res.json();
-          const saved = normalizeCartEntry(payload);
-          setSavedCartEntries((prev) => [saved, ...prev.filter((e) => e.id !== entry.id)]);
-          return saved;
-        })
-      );
-      const anyRejected = results.some((r) => r.status === 'rejected');
-      if (anyRejected) {
-        setCartStatusMessage('일부 항목이 로컬에만 저장되었습니다. 다시 시도하세요.');
-      } else {
-        setCartStatusMessage('장바구니에 저장되었습니다.');
-      }
+      // 한 번의 batch 요청(단일 트랜잭션)으로 저장, created 는 요청 순서와 같다
+      const res = await fetch(`${apiBaseUrl}/workmaster-cart/batch`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          creates: entriesToSave.map((entry) => ({
+            revit_types: entry.revitTypes,
+            assignment_ids: entry.assignmentIds,
+            standard_item_ids: entry.standardItemIds,
+            building_names: entry.buildingNames,
+            formula: entry.formula,
+          })),
+        }),
+      });
+      if (!res.ok) throw new Error('save failed');
+      const payload = await res.json();
+      const savedById = new Map();
+      (Array.isArray(payload?.created) ? payload.created : []).forEach((created, index) => {
+        const localEntry = entriesToSave[index];
+        if (localEntry) savedById.set(localEntry.id, normalizeCartEntry(created));
+      });
+      setSavedCartEntries((prev) => {
+        const saved = entriesToSave.map((entry) => savedById.get(entry.id)).filter(Boolean);
+        return [...saved, ...prev.filter((e) => !savedById.has(e.id))];
+      });
+      setCartStatusMessage('장바구니에 저장되었습니다.');
     } catch (error) {
       setCartStatusMessage('장바구니를 로컬에만 저장했습니다. 다시 시도하세요.');
     }
@@ -1059,17 +1062,14 @@ export default function ProjectFamilyAssign({ apiBaseUrl }) {
     setSavedCartEntries((prev) =>
       prev.map((entry) => (targetIds.includes(entry.id) ? { ...entry, formula: value } : entry))
     );
-    if (!apiBaseUrl) return;
+    const serverIds = targetIds.filter(isServerCartId);
+    if (!apiBaseUrl || !serverIds.length) return;
     try {
-      await Promise.all(
-        targetIds.map((id) =>
-          fetch(`${apiBaseUrl}/workmaster-cart/${id}`, {
-            method: 'PATCH',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ formula: value }),
-          }).catch(() => null)
-        )
-      );
+      await fetch(`${apiBaseUrl}/workmaster-cart/batch`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ updates: serverIds.map((id) => ({ id, formula: value })) }),
+      }).catch(() => null);
     } catch (error) {
       // swallow errors; UI already updated
     }
@@ -1078,13 +1078,14 @@ export default function ProjectFamilyAssign({ apiBaseUrl }) {
   const handleDeleteCartEntry = async (entryIds) => {
     const targets = Array.isArray(entryIds) ? entryIds : [entryIds];
     setSavedCartEntries((prev) => prev.filter((entry) => !targets.includes(entry.id)));
-    if (!apiBaseUrl) return;
+    const serverIds = targets.filter(isServerCartId);
+    if (!apiBaseUrl || !serverIds.length) return;
     try {
-      await Promise.all(
-        targets.map((id) =>
-          fetch(`${apiBaseUrl}/workmaster-cart/${id}`, { method: 'DELETE' }).catch(() => null)
-        )
-      );
+      await fetch(`${apiBaseUrl}/workmaster-cart/batch`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ deletes: serverIds }),
+      }).catch(() => null);
     } catch (error) {
       // ignore network errors; optimistic update already applied
     }
@@ -8,6 +8,9 @@ const INTERIOR_ITEM_ASSIGNMENT_MAP = {
   422: 948,
 };
 
+// 셀 토글을 모아 저장하기까지 기다리는 시간(ms)
+const CART_BATCH_DELAY_MS = 300;
+
 const SECTION_ORDER = {
   floor: 0,
   skirt: 1,
@@ -372,6 +375,11 @@ export default function ProjectInteriorMatrix({ apiBaseUrl }) {
     return result;
   }, [buildings]);
 
+  // 셀 토글은 모아서 한 번의 /workmaster-cart/batch 요청으로 저장 (연속 클릭/선택 복사 시 요청 수 감소)
+  const pendingCartOpsRef = useRef({ creates: new Map(), deletes: new Set() });
+  const cartFlushTimerRef = useRef(null);
+  const flushCartOpsRef = useRef(null);
+
   const reloadCartEntries = async ({ showOverlay = false } = {}) => {
     if (!apiBaseUrl) return;
     try {
@@ -816,6 +824,35 @@ export default function ProjectInteriorMatrix({ apiBaseUrl }) {
     return [];
   };
 
+  const flushCartOps = async () => {
+    if (cartFlushTimerRef.current) {
+      clearTimeout(cartFlushTimerRef.current);
+      cartFlushTimerRef.current = null;
+    }
+    const { creates, deletes } = pendingCartOpsRef.current;
+    if (!apiBaseUrl || (!creates.size && !deletes.size)) return;
+    pendingCartOpsRef.current = { creates: new Map(), deletes: new Set() };
+    await fetch(`${apiBaseUrl}/workmaster-cart/batch`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ creates: [...creates.values()], deletes: [...deletes] }),
+    }).catch(() => null);
+    await reloadCartEntries({ showOverlay: false });
+  };
+  flushCartOpsRef.current = flushCartOps;
+
+  const scheduleCartFlush = () => {
+    if (cartFlushTimerRef.current) clearTimeout(cartFlushTimerRef.current);
+    cartFlushTimerRef.current = setTimeout(() => {
+      flushCartOps().catch(() => {});
+    }, CART_BATCH_DELAY_MS);
+  };
+
+  useEffect(() => () => {
+    // 언마운트 시 대기 중인 변경을 바로 저장
+    flushCartOpsRef.current?.().catch(() => {});
+  }, []);
+
   const handleToggle = (itemKey, standardItemId, roomKey) => {
     if (isInitialDbSyncing) return;
     if (!selectedBuilding) return;
@@ -847,44 +884,41 @@ export default function ProjectInteriorMatrix({ apiBaseUrl }) {
       cartEntries.find((entry) => matchEntry(entry, { requireBuilding: true }))
       || cartEntries.find((entry) => matchEntry(entry, { requireBuilding: false }));
 
-    const saveEntry = async () => {
+    const buildCreatePayload = () => {
       const buildingName = targetBuilding;
       let baseRoom = parsedTarget.label || roomKey;
       if (buildingName && roomKey.startsWith(`${buildingName}\t`)) {
         baseRoom = roomKey.slice(buildingName.length + 1).trim();
       }
-      const payload = {
+      return {
         revit_types: [baseRoom],
         building_names: buildingName ? [buildingName] : [],
         assignment_ids: entryAssignmentIds(standardItemId),
         standard_item_ids: [standardItemId],
         formula: '=A',
       };
-      await fetch(`${apiBaseUrl}/workmaster-cart`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(payload),
-      }).catch(() => null);
-      await reloadCartEntries({ showOverlay: false });
-    };
-
-    const deleteEntry = async (entryId) => {
-      await fetch(`${apiBaseUrl}/workmaster-cart/${entryId}`, { method: 'DELETE' }).catch(() => null);
-      await reloadCartEntries({ showOverlay: false });
     };
 
-    if (existing?.id) {
+    const pending = pendingCartOpsRef.current;
+    const pendingKey = `${targetBuilding}|${standardItemId}|${targetNorm}`;
+    // 아직 저장 전인 추가를 다시 누르면 요청 없이 취소
+    const cancelsPending = pending.creates.has(pendingKey);
+    const removes = cancelsPending || Boolean(existing?.id);
+    if (cancelsPending) {
+      pending.creates.delete(pendingKey);
+    } else if (existing?.id) {
       // Optimistic removal for immediate UI update
       setCartEntries((prev) => prev.filter((entry) => entry.id !== existing.id));
-      deleteEntry(existing.id).catch(() => {});
+      pending.deletes.add(existing.id);
     } else {
-      saveEntry().catch(() => {});
+      pending.creates.set(pendingKey, buildCreatePayload());
     }
+    scheduleCartFlush();
 
     setSelectionByBuilding((prev) => {
       const bucket = prev[selectedBuilding] ? new Map(prev[selectedBuilding]) : new Map();
       const roomSet = new Set(bucket.get(itemKey) || []);
-      if (existing?.id) {
+      if (removes) {
         roomSet.delete(roomKey);
       } else {
         roomSet.add(roomKey);
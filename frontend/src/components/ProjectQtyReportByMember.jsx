@@ -1,8 +1,43 @@
-import React, { useCallback, useEffect, useMemo, useState } from 'react';
+import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 
 const safeText = (value) => (value == null ? '' : String(value));
 const normalizeKey = (value) => safeText(value).trim();
 
+// 20만 행 단위 리비전도 부드럽게: 커서 페이지 조회 + 보이는 행만 렌더링
+const PAGE_SIZE = 5000;
+const ROW_HEIGHT = 28;
+const OVERSCAN_ROWS = 20;
+const LIST_FIELDS = [
+  'rev_key',
+  'building_name',
+  'category',
+  'standard_type_number',
+  'standard_type_name',
+  'classification',
+  'gui',
+  'guid',
+  'description',
+  'wm_code',
+  'gauge',
+  'spec',
+  'add_spec',
+  'formula',
+  'substituted_formula',
+  'result',
+  'result_log',
+  'unit',
+].join(',');
+
+const cellStyle = { padding: '0 8px', height: ROW_HEIGHT, whiteSpace: 'nowrap' };
+const wideCellStyle = (width) => ({
+  ...cellStyle,
+  width,
+  minWidth: width,
+  maxWidth: width,
+  overflow: 'hidden',
+  textOverflow: 'ellipsis',
+});
+
 const extractBuildingNameFromJson = (payload) => {
   if (!payload || typeof payload !== 'object') return '';
   const info = payload.project_info;
@@ -14,6 +49,12 @@ export default function ProjectQtyReportByMember({ apiBaseUrl }) {
   const [rows, setRows] = useState([]);
   const [loadError, setLoadError] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [totalCount, setTotalCount] = useState(null);
+  const fetchSeqRef = useRef(0);
+
+  const scrollRef = useRef(null);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [viewportHeight, setViewportHeight] = useState(600);
 
   const [deleteArmed, setDeleteArmed] = useState(false);
   const [deleteConfirmText, setDeleteConfirmText] = useState('');
@@ -64,23 +105,47 @@ export default function ProjectQtyReportByMember({ apiBaseUrl }) {
     const params = new URLSearchParams();
     if (buildingName) params.set('building_name', buildingName);
     if (revKey) params.set('rev_key', revKey);
-    params.set('limit', '20000');
+    params.set('limit', String(PAGE_SIZE));
+    params.set('fields', LIST_FIELDS);
+
+    // 선택이 바뀌면 이전 조회 루프는 중단
+    const seq = fetchSeqRef.current + 1;
+    fetchSeqRef.current = seq;
 
     setLoading(true);
     setLoadError(null);
+    setTotalCount(null);
     try {
-      const res = await fetch(`${apiBaseUrl}/calc-result?${params.toString()}`);
-      if (!res.ok) {
-        const body = await res.json().catch(() => null);
-        throw new Error(body?.detail || 'calc_result 조회 실패');
-      }
-      const data = await res.json();
-      setRows(Array.isArray(data) ? data : []);
+      let cursor = null;
+      let first = true;
+      do {
+        if (cursor) params.set('cursor', cursor);
+        const res = await fetch(`${apiBaseUrl}/calc-result?${params.toString()}`);
+        if (!res.ok) {
+          const body = await res.json().catch(() => null);
+          throw new Error(body?.detail || 'calc_result 조회 실패');
+        }
+        const data = await res.json();
+        if (fetchSeqRef.current !== seq) return;
+
+        const page = Array.isArray(data) ? data : [];
+        const totalHeader = res.headers.get('X-Total-Count');
+        if (totalHeader != null) setTotalCount(Number(totalHeader));
+        if (first) {
+          first = false;
+          setRows(page);
+          setLoading(false);
+        } else {
+          setRows((prev) => prev.concat(page));
+        }
+        cursor = res.headers.get('X-Next-Cursor');
+      } while (cursor);
     } catch (e) {
+      if (fetchSeqRef.current !== seq) return;
       setRows([]);
       setLoadError(e instanceof Error ? e.message : '조회 실패');
     } finally {
-      setLoading(false);
+      if (fetchSeqRef.current === seq) setLoading(false);
     }
   }, [apiBaseUrl]);
 
@@ -143,6 +208,24 @@ export default function ProjectQtyReportByMember({ apiBaseUrl }) {
     });
   }, [filters, rows, searchText]);
 
+  useEffect(() => {
+    const el = scrollRef.current;
+    if (!el) return undefined;
+    const update = () => setViewportHeight(el.clientHeight || 600);
+    update();
+    if (typeof ResizeObserver === 'undefined') return undefined;
+    const observer = new ResizeObserver(update);
+    observer.observe(el);
+    return () => observer.disconnect();
+  }, []);
+
+  const visibleStart = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN_ROWS);
+  const visibleEnd = Math.min(
+    filteredRows.length,
+    Math.ceil((scrollTop + viewportHeight) / ROW_HEIGHT) + OVERSCAN_ROWS,
+  );
+  const visibleRows = filteredRows.slice(visibleStart, visibleEnd);
+
   const clearFilters = () => {
     setFilters({
       category: '',
@@ -300,9 +383,21 @@ export default function ProjectQtyReportByMember({ apiBaseUrl }) {
     clearPendingImport();
     setLoadError(null);
     try {
-      const text = await file.text();
-      const payload = JSON.parse(text);
-      const nextBuildingName = extractBuildingNameFromJson(payload);
+      const isNdjson = /\.(ndjson|jsonl)$/i.test(file.name || '');
+      let nextBuildingName = '';
+      if (isNdjson) {
+        // NDJSON: optional first line {"project_info": {...}}; avoid reading the whole file.
+        const head = await file.slice(0, 64 * 1024).text();
+        const firstLine = head.split('\n').find((line) => line.trim()) || '';
+        try {
+          nextBuildingName = extractBuildingNameFromJson(JSON.parse(firstLine));
+        } catch {
+          nextBuildingName = '';
+        }
+      } else {
+        const text = await file.text();
+        nextBuildingName = extractBuildingNameFromJson(JSON.parse(text));
+      }
 
       let existingKeys = await fetchRevKeys(nextBuildingName);
       if (!existingKeys.length) {
@@ -331,7 +426,7 @@ export default function ProjectQtyReportByMember({ apiBaseUrl }) {
         <div style={{ fontWeight: 700, fontSize: 16 }}>Qty Report by Member</div>
         <label style={{ marginLeft: 'auto', display: 'flex', alignItems: 'center', gap: 8, fontSize: 12 }}>
           <span style={{ color: '#6b7280' }}>건물별 다이나모 산출결과 불러오기</span>
-          <input type="file" accept="application/json" onChange={handleFileChange} disabled={!apiBaseUrl || loading} />
+          <input type="file" accept="application/json,.json,.ndjson,.jsonl" onChange={handleFileChange} disabled={!apiBaseUrl || loading} />
         </label>
       </div>
 
@@ -423,7 +518,9 @@ export default function ProjectQtyReportByMember({ apiBaseUrl }) {
         </button>
 
         <div style={{ marginLeft: 'auto', fontSize: 12, color: '#6b7280' }}>
-          {loading ? 'Loading…' : `Rows: ${filteredRows.length}`}
+          {loading
+            ? 'Loading…'
+            : `Rows: ${filteredRows.length}${totalCount != null && rows.length < totalCount ? ` (loaded ${rows.length} / ${totalCount})` : ''}`}
         </div>
       </div>
 
@@ -555,6 +652,8 @@ export default function ProjectQtyReportByMember({ apiBaseUrl }) {
       )}
 
       <div
+        ref={scrollRef}
+        onScroll={(e) => setScrollTop(e.currentTarget.scrollTop)}
         style={{
           flex: '1 1 auto',
           minHeight: 0,
@@ -605,27 +704,40 @@ export default function ProjectQtyReportByMember({ apiBaseUrl }) {
             </tr>
           </thead>
           <tbody>
-            {filteredRows.map((row, i) => (
-              <tr key={row.id ?? `${row.wm_code}-${i}`} style={{ borderBottom: '1px solid #f1f5f9' }}>
-                <td style={{ padding: '6px 8px', whiteSpace: 'nowrap' }}>{i + 1}</td>
-                <td style={{ padding: '6px 8px', whiteSpace: 'nowrap' }}>{safeText(row.rev_key) || '—'}</td>
-                <td style={{ padding: '6px 8px', whiteSpace: 'nowrap' }}>{safeText(row.category) || '—'}</td>
-                <td style={{ padding: '6px 8px', whiteSpace: 'nowrap' }}>{safeText(row.standard_type_number) || '—'}</td>
-                <td style={{ padding: '6px 8px', whiteSpace: 'nowrap' }}>{safeText(row.standard_type_name) || '—'}</td>
-                <td style={{ padding: '6px 8px', whiteSpace: 'nowrap' }}>{safeText(row.classification) || '—'}</td>
-                <td style={{ padding: '6px 8px', whiteSpace: 'nowrap' }}>{safeText(row.gui) || safeText(row.guid) || '—'}</td>
-                <td style={{ padding: '6px 8px', whiteSpace: 'nowrap' }}>{safeText(row.description) || '—'}</td>
-                <td style={{ padding: '6px 8px', whiteSpace: 'nowrap' }}>{safeText(row.wm_code) || '—'}</td>
-                <td style={{ padding: '6px 8px', whiteSpace: 'nowrap' }}>{safeText(row.gauge) || '—'}</td>
-                <td style={{ padding: '6px 8px', minWidth: 180 }}>{safeText(row.spec) || '—'}</td>
-                <td style={{ padding: '6px 8px', minWidth: 180 }}>{safeText(row.add_spec) || '—'}</td>
-                <td style={{ padding: '6px 8px', minWidth: 220 }}>{safeText(row.formula) || '—'}</td>
-                <td style={{ padding: '6px 8px', minWidth: 240 }}>{safeText(row.substituted_formula) || '—'}</td>
-                <td style={{ padding: '6px 8px', whiteSpace: 'nowrap' }}>{row.result ?? '—'}</td>
-                <td style={{ padding: '6px 8px', minWidth: 320 }}>{safeText(row.result_log) || '—'}</td>
-                <td style={{ padding: '6px 8px', whiteSpace: 'nowrap' }}>{safeText(row.unit) || '—'}</td>
+            {visibleStart > 0 && (
+              <tr style={{ height: visibleStart * ROW_HEIGHT }}>
+                <td colSpan={17} style={{ padding: 0 }} />
               </tr>
-            ))}
+            )}
+            {visibleRows.map((row, offset) => {
+              const i = visibleStart + offset;
+              return (
+                <tr key={row.id ?? `${row.wm_code}-${i}`} style={{ height: ROW_HEIGHT, borderBottom: '1px solid #f1f5f9' }}>
+                  <td style={cellStyle}>{i + 1}</td>
+                  <td style={cellStyle}>{safeText(row.rev_key) || '—'}</td>
+                  <td style={cellStyle}>{safeText(row.category) || '—'}</td>
+                  <td style={cellStyle}>{safeText(row.standard_type_number) || '—'}</td>
+                  <td style={cellStyle}>{safeText(row.standard_type_name) || '—'}</td>
+                  <td style={cellStyle}>{safeText(row.classification) || '—'}</td>
+                  <td style={cellStyle}>{safeText(row.gui) || safeText(row.guid) || '—'}</td>
+                  <td style={cellStyle}>{safeText(row.description) || '—'}</td>
+                  <td style={cellStyle}>{safeText(row.wm_code) || '—'}</td>
+                  <td style={cellStyle}>{safeText(row.gauge) || '—'}</td>
+                  <td style={wideCellStyle(180)} title={safeText(row.spec)}>{safeText(row.spec) || '—'}</td>
+                  <td style={wideCellStyle(180)} title={safeText(row.add_spec)}>{safeText(row.add_spec) || '—'}</td>
+                  <td style={wideCellStyle(220)} title={safeText(row.formula)}>{safeText(row.formula) || '—'}</td>
+                  <td style={wideCellStyle(240)} title={safeText(row.substituted_formula)}>{safeText(row.substituted_formula) || '—'}</td>
+                  <td style={cellStyle}>{row.result ?? '—'}</td>
+                  <td style={wideCellStyle(320)} title={safeText(row.result_log)}>{safeText(row.result_log) || '—'}</td>
+                  <td style={cellStyle}>{safeText(row.unit) || '—'}</td>
+                </tr>
+              );
+            })}
+            {visibleEnd < filteredRows.length && (
+              <tr style={{ height: (filteredRows.length - visibleEnd) * ROW_HEIGHT }}>
+                <td colSpan={17} style={{ padding: 0 }} />
+              </tr>
+            )}
             {!filteredRows.length && !loading && (
               <tr>
                 <td colSpan={17} style={{ padding: 14, color: '#6b7280' }}>
@@ -71,127 +71,56 @@ export default function ProjectQtyReportToTotalBOQ({ apiBaseUrl }) {
 
     setLoading(true);
 
-    const qs = `?rev_key=${encodeURIComponent(selectedRevKey)}&limit=20000`;
-    fetch(`${apiBaseUrl}/calc-result${qs}`)
+    // 서버에서 (WM code, gauge) x 건물 로 집계된 결과만 받아온다.
+    const qs = `?rev_key=${encodeURIComponent(selectedRevKey)}`;
+    fetch(`${apiBaseUrl}/calc-result/boq${qs}`)
       .then(res => {
-        if (!res.ok) return [];
-        return res.json().catch(() => []);
+        if (!res.ok) return null;
+        return res.json().catch(() => null);
       })
       .then(data => {
-          const rows = Array.isArray(data) ? data : [];
-          // collect available buildings for this selected rev
-          try {
-            const bset = new Set();
-            for (const r of rows) {
-              if (r && r.building_name) bset.add(r.building_name);
-            }
-            setAvailableBuildings(Array.from(bset));
-          } catch (e) {
-            setAvailableBuildings([]);
-          }
-          // reset building filter when rev changes
-          setSelectedBuilding('');
-        // aggregate by wm_code + gauge
-        const map = new Map();
-        for (const r of rows) {
-          const code = (r.wm_code || '').trim();
-          // skip rows without Work Master Code
-          if (!code) continue;
-          const gauge = (r.gauge || '').trim();
-          const key = `${code}||${gauge}`;
-          const building = r.building_name || '';
-          const qty = Number(r.result) || 0;
-          const cat = (r.cat_large_desc || r.category || '').trim();
-          if (!map.has(key)) {
-            map.set(key, {
-              wm_code: code,
-              gauge: gauge,
-              description: r.description || '',
-              spec: r.spec || '',
-              add_spec: r.add_spec || '',
-              // reference column intentionally left empty
-              reference_to: '',
-              uom: r.unit || r.uom || '',
-              total: 0,
-              byBuilding: {},
-              cat_large_desc: cat,
-            });
-          }
-          const item = map.get(key);
-          item.total = (item.total || 0) + qty;
-          item.byBuilding[building] = (item.byBuilding[building] || 0) + qty;
-        }
+        const buildings = Array.isArray(data?.buildings) ? data.buildings : [];
+        const rows = Array.isArray(data?.rows) ? data.rows : [];
+        setAvailableBuildings(buildings);
+        // reset building filter when rev changes
+        setSelectedBuilding('');
+        if (data?.mid_order && typeof data.mid_order === 'object') setMidOrder(data.mid_order);
 
-        const out = Array.from(map.values());
+        const out = rows.map((r) => {
+          const byBuilding = {};
+          buildings.forEach((b, i) => {
+            byBuilding[b] = Number(r.values?.[i]) || 0;
+          });
+          return {
+            wm_code: r.wm_code || '',
+            gauge: r.gauge || '',
+            description: r.description || '',
+            spec: r.spec || '',
+            add_spec: r.add_spec || '',
+            // reference column intentionally left empty
+            reference_to: '',
+            uom: r.uom || '',
+            total: Number(r.total) || 0,
+            byBuilding,
+            cat_large_desc: r.cat_large_desc || '',
+            cat_mid_desc: r.cat_mid_desc || '',
+          };
+        });
         // sort by wm_code
         out.sort((a, b) => (a.wm_code || '').localeCompare(b.wm_code || ''));
-        // try to enrich items with cat_large_desc by looking up work_masters
-        const normalize = (s) => (s || '').toString().trim();
-        fetch(`${apiBaseUrl}/work-masters/`)
-          .then((r) => (r.ok ? r.json().catch(() => []) : []))
-          .then((wms) => {
-            const wmMap = new Map();
-            const largeMidMap = new Map();
-            if (Array.isArray(wms)) {
-              for (const wm of wms) {
-                const key = `${normalize(wm.work_master_code)}||${normalize(wm.gauge)}`;
-                wmMap.set(key, wm);
-                const large = normalize(wm.cat_large_desc || wm.cat_large_code || '');
-                const mid = normalize(wm.cat_mid_desc || wm.cat_mid_code || '');
-                if (!largeMidMap.has(large)) largeMidMap.set(large, new Set());
-                if (mid) largeMidMap.get(large).add(mid);
-              }
-              // convert largeMidMap to plain object with ordered arrays
-              const midOrderObj = {};
-              for (const [large, mids] of largeMidMap.entries()) {
-                midOrderObj[large] = Array.from(mids);
-              }
-              setMidOrder(midOrderObj);
-            }
 
-            for (const item of out) {
-              const key = `${normalize(item.wm_code)}||${normalize(item.gauge)}`;
-              let wm = wmMap.get(key);
-              if (!wm) {
-                // try uppercase gauge fallback
-                wm = wmMap.get(`${normalize(item.wm_code)}||${normalize(item.gauge).toUpperCase()}`) || wmMap.get(`${normalize(item.wm_code).toUpperCase()}||${normalize(item.gauge).toUpperCase()}`);
-              }
-              item.cat_large_desc = (wm && (wm.cat_large_desc || wm.cat_large_code || '')) || item.cat_large_desc || '';
-              // also populate mid category from work_masters
-              item.cat_mid_desc = (wm && (wm.cat_mid_desc || wm.cat_mid_code || '')) || item.cat_mid_desc || '';
-              // Use work_masters.cat_small_desc as Description when available
-              if (wm && (wm.cat_small_desc || wm.cat_small_code)) {
-                item.description = wm.cat_small_desc || wm.cat_small_code || item.description || '';
-              }
-              // Use work_masters.add_spec as Additional Spec. when available
-              if (wm && wm.add_spec) {
-                item.add_spec = wm.add_spec || item.add_spec || '';
-              }
-            }
-
-            const grouped = new Map();
-            for (const item of out) {
-              const g = item.cat_large_desc || '';
-              if (!grouped.has(g)) grouped.set(g, []);
-              grouped.get(g).push(item);
-            }
-            setAggregatedRows(Array.from(grouped.entries()));
-          })
-          .catch(() => {
-            const grouped = new Map();
-            for (const item of out) {
-              const g = item.cat_large_desc || '';
-              if (!grouped.has(g)) grouped.set(g, []);
-              grouped.get(g).push(item);
-            }
-            setAggregatedRows(Array.from(grouped.entries()));
-          })
-          .finally(() => {
-            setLoading(false);
-          });
+        const grouped = new Map();
+        for (const item of out) {
+          const g = item.cat_large_desc || '';
+          if (!grouped.has(g)) grouped.set(g, []);
+          grouped.get(g).push(item);
+        }
+        setAggregatedRows(Array.from(grouped.entries()));
       })
       .catch(() => {
         setAggregatedRows([]);
+      })
+      .finally(() => {
         setLoading(false);
       });
   }, [apiBaseUrl, selectedRevKey]);
@@ -1,4 +1,5 @@
 import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
+import { fetchWorkMasterPages } from '../utils/workMasterList';
 
 const isDebugPrecheckEnabled = () => {
   try {
@@ -658,7 +659,7 @@ export default function ProjectWmPrecheck({ apiBaseUrl }) {
     try {
       const isProjectContext = apiBaseUrl.includes('/project/');
       const [wmData, precheckData] = await Promise.all([
-        fetch(`${apiBaseUrl}/work-masters/`).then(handleResponse),
+        fetchWorkMasterPages(apiBaseUrl),
         fetch(`${apiBaseUrl}/work-masters/precheck`).then(handleResponse),
       ]);
 
@@ -1,5 +1,25 @@
 import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import { API_BASE_URL } from '../apiConfig';
+import { fetchWorkMasterPages } from '../utils/workMasterList';
+
+// 목록 표에 쓰는 필드만 조회
+const MANAGER_LIST_FIELDS = [
+    'id',
+    'discipline',
+    'cat_large_desc',
+    'cat_mid_desc',
+    'cat_small_desc',
+    'attr1_spec',
+    'attr2_spec',
+    'attr3_spec',
+    'attr4_spec',
+    'attr5_spec',
+    'attr6_spec',
+    'uom1',
+    'work_master_code',
+    'new_old_code',
+    'gauge',
+];
 
 // DB headers from discipline through new_old_code
 const WORK_MASTER_CREATE_COLUMNS = [
@@ -53,11 +73,27 @@ function WorkMasterManager({ apiBaseUrl = API_BASE_URL, selectedFamilyNode = nul
 
     const fetchWorkMasters = async (query = '') => {
         try {
-            const url = query ? `${apiBaseUrl}/work-masters/?search=${query}` : `${apiBaseUrl}/work-masters/`;
-            const response = await fetch(url);
-            if (!response.ok) throw new Error('Network response was not ok');
-            const data = await response.json();
-            setWorkMasters(data);
+            if (query) {
+                const params = new URLSearchParams({ search: query, fields: MANAGER_LIST_FIELDS.join(',') });
+                const response = await fetch(`${apiBaseUrl}/work-masters/?${params.toString()}`);
+                if (!response.ok) throw new Error('Network response was not ok');
+                const data = await response.json();
+                setWorkMasters(data);
+            } else {
+                // 첫 페이지부터 바로 표시하고 나머지는 이어 붙임
+                let first = true;
+                await fetchWorkMasterPages(apiBaseUrl, {
+                    fields: MANAGER_LIST_FIELDS,
+                    onPage: (page) => {
+                        if (first) {
+                            first = false;
+                            setWorkMasters(page);
+                        } else {
+                            setWorkMasters((prev) => prev.concat(page));
+                        }
+                    },
+                });
+            }
             setMessage(query ? `'${query}'에 대한 검색 결과를 포함하여 목록을 업데이트했습니다.` : 'WorkMaster 목록을 성공적으로 불러왔습니다.');
         } catch (error) {
             setMessage(`목록 조회 실패: ${error.message}`);
@@ -161,7 +197,9 @@ function WorkMasterManager({ apiBaseUrl = API_BASE_URL, selectedFamilyNode = nul
             const data = await response.json();
             if (!response.ok) throw new Error(data.detail || '업로드 실패');
             
-            setMessage(`업로드 성공: 생성 ${data.created}건, 업데이트 ${data.updated}건`);
+            setMessage(
+                `업로드 성공: 생성 ${data.created}건, 업데이트 ${data.updated}건, 변경 없음 ${data.unchanged ?? 0}건`
+            );
             fetchWorkMasters(); // 업로드 후 목록을 새로고침합니다.
         } catch (error) {
             setMessage(`업로드 실패: ${error.message}`);
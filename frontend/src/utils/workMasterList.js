@@ -0,0 +1,68 @@
+// WorkMaster 목록을 커서 페이지로 나눠 조회 (X-Next-Cursor 가 없을 때까지)
+export const WORK_MASTER_PAGE_SIZE = 2000;
+
+export const WORK_MASTER_LIST_FIELDS = [
+  'id',
+  'discipline',
+  'cat_large_code',
+  'cat_large_desc',
+  'cat_mid_code',
+  'cat_mid_desc',
+  'cat_small_code',
+  'cat_small_desc',
+  'attr1_code',
+  'attr1_spec',
+  'attr2_code',
+  'attr2_spec',
+  'attr3_code',
+  'attr3_spec',
+  'attr4_code',
+  'attr4_spec',
+  'attr5_code',
+  'attr5_spec',
+  'attr6_code',
+  'attr6_spec',
+  'uom1',
+  'uom2',
+  'work_group_code',
+  'work_master_code',
+  'new_old_code',
+  'add_spec',
+  'gauge',
+];
+
+export async function fetchWorkMasterPages(apiBaseUrl, {
+  fields = WORK_MASTER_LIST_FIELDS,
+  filters = {},
+  pageSize = WORK_MASTER_PAGE_SIZE,
+  onPage,
+  isCancelled = () => false,
+} = {}) {
+  const params = new URLSearchParams();
+  params.set('limit', String(pageSize));
+  params.set('fields', fields.join(','));
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value != null && value !== '') params.set(key, value);
+  });
+
+  const rows = [];
+  let cursor = null;
+  do {
+    if (cursor) params.set('cursor', cursor);
+    const res = await fetch(`${apiBaseUrl}/work-masters/?${params.toString()}`);
+    if (!res.ok) {
+      const body = await res.json().catch(() => null);
+      throw new Error(body?.detail || 'WorkMaster 목록 조회 실패');
+    }
+    const data = await res.json();
+    if (isCancelled()) return rows;
+    const page = Array.isArray(data) ? data : [];
+    rows.push(...page);
+    if (onPage) {
+      const totalHeader = res.headers.get('X-Total-Count');
+      onPage(page, { loaded: rows.length, total: totalHeader != null ? Number(totalHeader) : null });
+    }
+    cursor = res.headers.get('X-Next-Cursor');
+  } while (cursor);
+  return rows;
+}
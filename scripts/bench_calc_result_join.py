@@ -0,0 +1,167 @@
+"""Benchmark the calc_result -> work_masters join used by GET /calc-result.
+
+Compares the legacy OR-join (id, or code when id is NULL) against the indexed
+equi-join on work_master_id after the one-time backfill, on a synthetic
+project DB. Prints EXPLAIN QUERY PLAN and median latency per scenario.
+
+    python scripts/bench_calc_result_join.py --rows 100000
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.project_db import (  # noqa: E402
+    CALC_RESULT_WORK_MASTER_ID_BACKFILL_SQL,
+    EXTRA_TABLE_STATEMENTS,
+)
+
+SELECT_COLUMNS = """
+    cr.id, cr.rev_key, cr.building_name, cr.result,
+    COALESCE(wm.work_master_code, cr.work_master_code) AS wm_code,
+    COALESCE(cr.gauge, wm.gauge) AS gauge,
+    wm.add_spec, wm.cat_large_desc, wm.attr1_spec
+"""
+
+OR_JOIN = """
+    LEFT JOIN work_masters wm
+      ON (wm.id = cr.work_master_id)
+      OR (cr.work_master_id IS NULL AND wm.work_master_code = cr.work_master_code)
+"""
+
+EQUI_JOIN = "LEFT JOIN work_masters wm ON wm.id = cr.work_master_id"
+
+SCENARIOS = [
+    ("first page (limit 2000)", "", "LIMIT 2000", {}),
+    (
+        "building+rev (limit 20000)",
+        "WHERE cr.building_name = :building_name AND cr.rev_key = :rev_key",
+        "LIMIT 20000",
+        {"building_name": "B1", "rev_key": "R1"},
+    ),
+    ("full table", "", "", {}),
+]
+
+
+def build_db(path: Path, rows: int, work_masters: int, code_only_ratio: float):
+    rng = random.Random(42)
+    conn = sqlite3.connect(path.as_posix())
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE work_masters (
+            id INTEGER PRIMARY KEY,
+            work_master_code TEXT,
+            gauge TEXT,
+            add_spec TEXT,
+            cat_large_desc TEXT,
+            attr1_spec TEXT
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX ix_work_masters_work_master_code ON work_masters (work_master_code)"
+    )
+    for stmt in EXTRA_TABLE_STATEMENTS:
+        if "calc_result (" in stmt:
+            cur.execute(stmt)
+    cur.execute("CREATE INDEX ix_calc_result_building_rev ON calc_result (building_name, rev_key)")
+    cur.execute("CREATE INDEX ix_calc_result_rev_key ON calc_result (rev_key)")
+
+    # Roughly one in ten codes also has a gauge variant (duplicate code).
+    wm_rows = []
+    for i in range(1, work_masters + 1):
+        code = f"WM{(i if i % 10 else i - 1):06d}"
+        wm_rows.append((i, code, "A" if i % 10 else "B", f"add {i}", "Large", f"attr {i}"))
+    cur.executemany("INSERT INTO work_masters VALUES (?, ?, ?, ?, ?, ?)", wm_rows)
+
+    now = "2024-01-01T00:00:00"
+    cr_rows = []
+    for i in range(rows):
+        wm_id = rng.randint(1, work_masters)
+        code = wm_rows[wm_id - 1][1]
+        code_only = rng.random() < code_only_ratio
+        cr_rows.append(
+            (
+                f"k{i}",
+                f"R{i % 4}",
+                f"B{i % 5}",
+                None if code_only else wm_id,
+                code,
+                float(i),
+                now,
+            )
+        )
+    cur.executemany(
+        """
+        INSERT INTO calc_result (key, rev_key, building_name, work_master_id, work_master_code, result, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        cr_rows,
+    )
+    conn.commit()
+    cur.execute("ANALYZE")
+    return conn
+
+
+def run_scenarios(conn, join_sql: str, repeat: int):
+    out = []
+    for label, where_sql, limit_sql, params in SCENARIOS:
+        sql = f"SELECT {SELECT_COLUMNS} FROM calc_result cr {join_sql} {where_sql} ORDER BY cr.id DESC {limit_sql}"
+        plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        timings = []
+        count = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            count = len(conn.execute(sql, params).fetchall())
+            timings.append((time.perf_counter() - start) * 1000.0)
+        out.append((label, plan, count, statistics.median(timings)))
+    return out
+
+
+def print_results(title: str, results):
+    print(f"\n== {title}")
+    for label, plan, count, median_ms in results:
+        print(f"-- {label}: {count} rows, median {median_ms:.1f} ms")
+        for line in plan:
+            print(f"     {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--work-masters", type=int, default=4_000)
+    parser.add_argument("--code-only-ratio", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_db(
+            Path(tmp) / "bench.db", args.rows, args.work_masters, args.code_only_ratio
+        )
+        try:
+            print(
+                f"calc_result={args.rows} work_masters={args.work_masters} "
+                f"code_only_ratio={args.code_only_ratio}"
+            )
+            print_results("OR-join (before backfill)", run_scenarios(conn, OR_JOIN, args.repeat))
+
+            start = time.perf_counter()
+            updated = conn.execute(CALC_RESULT_WORK_MASTER_ID_BACKFILL_SQL).rowcount
+            conn.commit()
+            print(f"\nbackfill: {updated} rows in {(time.perf_counter() - start) * 1000.0:.1f} ms")
+
+            print_results("equi-join (after backfill)", run_scenarios(conn, EQUI_JOIN, args.repeat))
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Benchmark reading WorkMaster cart entries from the cart_entry_* link tables.
+
+Creates a temporary project DB with --entries seeded cart entries (payload JSON
+only, like a DB from before the link tables) and times the previous read
+(json.loads + normalize per row). Then runs the migration steps that create the
+link tables and fold the payloads into them, and times `api._load_cart_entries`
+(set-based reads of the link tables) for all lists and for the id lists only
+(what calc-result manual update reads). Both full reads must return the same
+entries.
+
+    python scripts/bench_cart_entries.py
+    python scripts/bench_cart_entries.py --entries 50000 --repeat 5
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend import api, project_db  # noqa: E402
+
+
+def synthetic_payloads(count: int, seed: int):
+    rng = random.Random(seed)
+    buildings = [f"{n}동" for n in range(101, 121)]
+    for entry_no in range(count):
+        payload = {
+            "revit_types": [f"Type {rng.randint(1, 400)}" for _ in range(rng.randint(1, 4))],
+            "assignment_ids": [rng.randint(1, 20_000) for _ in range(rng.randint(1, 3))],
+            "standard_item_ids": [rng.randint(1, 3_000) for _ in range(rng.randint(1, 2))],
+            "building_names": rng.sample(buildings, rng.randint(0, 3)),
+            "formula": f"L*{rng.randint(1, 9)}" if rng.random() < 0.6 else None,
+        }
+        if entry_no % 7 == 0:
+            # camelCase keys from older clients
+            payload = {
+                "revitTypes": payload["revit_types"],
+                "assignmentIds": payload["assignment_ids"],
+                "standardItemIds": payload["standard_item_ids"],
+                "buildingNames": payload["building_names"],
+                "formula": payload["formula"],
+            }
+        yield json.dumps(payload, ensure_ascii=False), f"2024-01-01T00:00:{entry_no % 60:02d}"
+
+
+def legacy_load(db_path: Path) -> list:
+    conn = sqlite3.connect(db_path.as_posix())
+    try:
+        out = []
+        for entry_id, payload_raw, created_raw in conn.execute(
+            "SELECT id, payload, created_at FROM workmaster_cart_entries ORDER BY id DESC"
+        ):
+            try:
+                payload = json.loads(payload_raw or "{}")
+            except json.JSONDecodeError:
+                payload = {}
+            out.append((int(entry_id), created_raw, project_db.normalize_cart_payload(payload)))
+        return out
+    finally:
+        conn.close()
+
+
+def linked_load(db_path: Path, keys=None) -> list:
+    conn = project_db.connect_project_db_read_only(db_path)
+    try:
+        return api._load_cart_entries(conn, keys=keys)
+    finally:
+        conn.close()
+
+
+def timed(fn, repeat: int):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench_cart.db"
+        conn = sqlite3.connect(db_path.as_posix())
+        try:
+            cursor = conn.cursor()
+            for stmt in project_db.EXTRA_TABLE_STATEMENTS:
+                cursor.execute(stmt)
+            cursor.executemany(
+                "INSERT INTO workmaster_cart_entries (payload, created_at) VALUES (?, ?)",
+                synthetic_payloads(args.entries, args.seed),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        legacy_ms, legacy = timed(lambda: legacy_load(db_path), args.repeat)
+
+        conn = sqlite3.connect(db_path.as_posix())
+        try:
+            cursor = conn.cursor()
+            started = time.perf_counter()
+            project_db._migrate_cart_entry_links(cursor)
+            project_db._migrate_cart_entry_payload_lists(cursor)
+            conn.commit()
+            migrate_ms = (time.perf_counter() - started) * 1000.0
+        finally:
+            conn.close()
+
+        linked_ms, linked = timed(lambda: linked_load(db_path), args.repeat)
+        ids_ms, _ = timed(
+            lambda: linked_load(db_path, keys=("assignment_ids", "standard_item_ids")),
+            args.repeat,
+        )
+
+    same = legacy == linked
+    print(
+        f"entries={args.entries} migrate={migrate_ms:.0f} ms | "
+        f"json payload read median={legacy_ms:.0f} ms | "
+        f"link table read median={linked_ms:.0f} ms (ids only {ids_ms:.0f} ms) | "
+        f"{'same' if same else 'MISMATCH'}"
+    )
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Benchmark (and dump) the Dynamo JSON export for --entries cart entries.
+
+Without a project the seeded synthetic DB from dynamo_export_fixture.py is built
+with --entries cart entries. With a project identifier the project DB is copied
+to a temp dir and workmaster_cart_entries is padded to --entries rows by cycling
+the existing entries. Then rendering the export JSON is timed (first chunk and
+total). The export cache is not involved; this measures a cache miss.
+
+    python scripts/bench_dynamo_export.py --entries 20000
+    python scripts/bench_dynamo_export.py test1 --entries 20000 --dump out.json
+
+Output regressions are checked by scripts/check_dynamo_export_golden.py, which
+exits non-zero on any byte difference from the committed golden export.
+
+Target: the whole export (DB reads + rendering) under 1 s for 20k cart entries.
+The run prints the median against the target and exits 1 when it is missed.
+"""
+
+import argparse
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend import api, project_db  # noqa: E402
+from dynamo_export_fixture import build_fixture_db  # noqa: E402
+
+TARGET_MS = 1000.0
+
+
+def pad_cart_entries(db_path: Path, target: int) -> int:
+    conn = sqlite3.connect(db_path.as_posix())
+    try:
+        rows = conn.execute(
+            "SELECT id, payload, formula, created_at FROM workmaster_cart_entries ORDER BY id"
+        ).fetchall()
+        if not rows:
+            raise SystemExit("project DB has no workmaster_cart_entries to cycle")
+        missing = max(0, target - len(rows))
+        last_id = conn.execute("SELECT MAX(id) FROM workmaster_cart_entries").fetchone()[0]
+        conn.executemany(
+            "INSERT INTO workmaster_cart_entries (payload, formula, created_at) VALUES (?, ?, ?)",
+            (rows[i % len(rows)][1:] for i in range(missing)),
+        )
+        new_ids = [
+            row[0]
+            for row in conn.execute(
+                "SELECT id FROM workmaster_cart_entries WHERE id > ? ORDER BY id", (last_id,)
+            )
+        ]
+        # cart_entry_* link rows copied from the cycled source entries
+        for _key, table, column, _type in project_db.CART_ENTRY_LINK_TABLES:
+            source = {}
+            for entry_id, position, value in conn.execute(
+                f"SELECT cart_entry_id, position, {column} FROM {table}"
+            ):
+                source.setdefault(entry_id, []).append((position, value))
+            conn.executemany(
+                f"INSERT INTO {table} (cart_entry_id, position, {column}) VALUES (?, ?, ?)",
+                (
+                    (new_id, position, value)
+                    for i, new_id in enumerate(new_ids)
+                    for position, value in source.get(rows[i % len(rows)][0], [])
+                ),
+            )
+        conn.commit()
+        return len(rows) + missing
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "project",
+        nargs="?",
+        help="project identifier or .db file name (default: the synthetic fixture DB)",
+    )
+    parser.add_argument("--entries", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dump", help="write the last rendered JSON here")
+    args = parser.parse_args()
+
+    project = args.project or "fixture"
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.project:
+            source = project_db.resolve_project_db_path(args.project)
+            db_path = Path(tmp) / source.name
+            shutil.copyfile(source, db_path)
+            project_db.ensure_extra_tables(db_path)
+            total = pad_cart_entries(db_path, args.entries)
+        else:
+            db_path = build_fixture_db(Path(tmp) / "fixture.db", entries=args.entries)
+            total = args.entries
+
+        SessionLocal = project_db.get_project_sessionmaker(db_path)
+        timings = []
+        first_byte = []
+        body = b""
+        for _ in range(args.repeat):
+            db = SessionLocal()
+            try:
+                started = time.perf_counter()
+                _, chunks = api._dynamo_export_stream(project, db)
+                parts = []
+                for chunk in chunks:
+                    if not parts:
+                        first_byte.append(time.perf_counter() - started)
+                    parts.append(chunk)
+                body = b"".join(parts)
+                timings.append(time.perf_counter() - started)
+            finally:
+                db.close()
+        project_db.dispose_project_engine(db_path)
+
+    print(
+        f"entries={total} bytes={len(body)} "
+        f"median={statistics.median(timings) * 1000.0:.0f} ms "
+        f"min={min(timings) * 1000.0:.0f} ms"
+    )
+    print(f"first chunk median={statistics.median(first_byte) * 1000.0:.0f} ms")
+    median_ms = statistics.median(timings) * 1000.0
+    print(
+        f"target <{TARGET_MS:.0f} ms for {total} entries: "
+        f"{'met' if median_ms < TARGET_MS else 'MISSED'}"
+    )
+    if args.dump:
+        Path(args.dump).write_bytes(body)
+    return 0 if median_ms < TARGET_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
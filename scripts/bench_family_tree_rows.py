@@ -0,0 +1,127 @@
+"""Benchmark Report_FamilyList row building on a synthetic family tree.
+
+Generates a seeded family tree (--nodes), a standard item forest and
+--assignments gwm_family_assign rows, then times `_build_family_tree_rows`
+(the helper behind the Report_FamilyList sheet of /export/db-excel).
+
+    python scripts/bench_family_tree_rows.py
+    python scripts/bench_family_tree_rows.py --nodes 50000 --assignments 200000 --dump rows.json
+
+Two --dump files taken before/after a change should be identical.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend import api  # noqa: E402
+
+
+def synthetic_inputs(nodes: int, assignments: int, standard_items: int, seed: int):
+    rng = random.Random(seed)
+
+    items = []
+    sequence_by_id = {}
+    for node_id in range(1, nodes + 1):
+        parent_id = rng.randint(max(1, node_id - 200), node_id - 1) if node_id > 1 else None
+        if node_id > 20 and rng.random() < 0.02:
+            parent_id = None
+        kind = rng.random()
+        if parent_id is not None and kind < 0.7:
+            child_no = rng.randint(0, 30)
+            sequence = f"{sequence_by_id.get(parent_id) or rng.randint(1, 9)}.{child_no}"
+            if rng.random() < 0.1:
+                sequence += rng.choice("abc")
+            name = f"Family {node_id}"
+        elif kind < 0.85:
+            sequence = None
+            name = f"{rng.randint(1, 40)}.{rng.randint(0, 9)} Family {node_id}"
+        elif kind < 0.97:
+            sequence = None
+            name = rng.choice(["Wall", "Slab", "Door", "Beam"]) + f" Type {rng.randint(1, 300)}"
+        else:
+            sequence = None
+            name = ""
+        sequence_by_id[node_id] = sequence
+        items.append(
+            {
+                "id": node_id,
+                "parent_id": parent_id,
+                "sequence_number": sequence,
+                "name": name,
+                "item_type": rng.choice(["CATEGORY", "FAMILY", "SEQUENCE"]),
+                "description": None,
+                "created_at": "2024-01-01T00:00:00",
+            }
+        )
+
+    name_by_id = {}
+    type_by_id = {}
+    parent_by_id = {}
+    for sid in range(1, standard_items + 1):
+        parent = None
+        if sid > 50:
+            parent = rng.randint(1, sid - 1) if rng.random() < 0.9 else None
+        parent_by_id[sid] = parent
+        type_by_id[sid] = rng.choice(["GWM", "SWM", "GWM", "DERIVED"])
+        name_by_id[sid] = f"Std {rng.randint(1, 500)} item {sid}"
+
+    assignments_by_family_id = {}
+    for assignment_id in range(1, assignments + 1):
+        family_id = rng.randint(1, nodes)
+        assignments_by_family_id.setdefault(family_id, []).append(
+            {
+                "assignment_id": assignment_id,
+                "standard_item_id": rng.randint(1, standard_items),
+                "formula": f"=L*{rng.randint(1, 9)}" if rng.random() < 0.5 else None,
+                "assignment_description": None,
+                "assigned_at": "2024-01-02T00:00:00",
+                "created_at": "2024-01-02T00:00:00",
+            }
+        )
+
+    return items, {
+        "assignments_by_family_id": assignments_by_family_id,
+        "standard_item_name_by_id": name_by_id,
+        "standard_item_type_by_id": type_by_id,
+        "standard_item_parent_by_id": parent_by_id,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=50_000)
+    parser.add_argument("--assignments", type=int, default=200_000)
+    parser.add_argument("--standard-items", type=int, default=3_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dump", help="write the rows of the last run here (JSON)")
+    args = parser.parse_args()
+
+    items, maps = synthetic_inputs(
+        args.nodes, args.assignments, args.standard_items, args.seed
+    )
+    timings = []
+    rows = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        rows = api._build_family_tree_rows(items, **maps)
+        timings.append(time.perf_counter() - started)
+
+    print(
+        f"nodes={args.nodes} assignments={args.assignments} rows={len(rows)} "
+        f"median={statistics.median(timings) * 1000.0:.0f} ms "
+        f"min={min(timings) * 1000.0:.0f} ms"
+    )
+    if args.dump:
+        Path(args.dump).write_text(json.dumps(rows, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
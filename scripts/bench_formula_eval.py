@@ -0,0 +1,213 @@
+"""Benchmark formula evaluation: previous tree walk, compiled scalar, NumPy batch.
+
+Generates --formulas seeded formulas (arithmetic over calc-dictionary style
+symbols, plus invalid/unsafe ones) and evaluates each against --sets variable
+sets, the way calc-result manual update evaluates the same few hundred formulas
+for many entries. `api._safe_eval_numeric_expr` and `api._eval_numeric_exprs`
+(one NumPy batch per formula) must both return the same value (or None) as the
+previous evaluator for every pair.
+
+    python scripts/bench_formula_eval.py
+    python scripts/bench_formula_eval.py --formulas 300 --sets 5000 --repeat 3
+"""
+
+import argparse
+import ast
+import math
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend import api  # noqa: E402
+
+SYMBOLS = ["A", "B", "H", "L", "W", "T", "N", "QTY"]
+OPS = ["+", "-", "*", "/", "//", "%", "**"]
+UNSAFE = [
+    "__import__('os')",
+    "A if B else H",
+    "abs(A)",
+    "A < B",
+    "[A, B]",
+    "A @ B",
+    "'x' * 3",
+    "A +",
+    "",
+    "=",
+]
+
+
+def legacy_eval(expr: str, variables: dict):
+    """`_safe_eval_numeric_expr` before compiled formulas: parse + walk per call."""
+    expr = (expr or "").strip()
+    if expr.startswith("="):
+        expr = expr[1:].strip()
+    if not expr:
+        return None
+    direct = api._try_parse_float(expr)
+    if direct is not None:
+        return direct
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except Exception:
+        return None
+
+    def _eval(node):
+        if isinstance(node, ast.Expression):
+            return _eval(node.body)
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, (int, float)):
+                return float(node.value)
+            return None
+        if isinstance(node, ast.Name):
+            if node.id not in variables:
+                return None
+            return api._try_parse_float(variables.get(node.id))
+        if isinstance(node, ast.UnaryOp):
+            op = api._ALLOWED_UNARYOPS.get(type(node.op))
+            if not op:
+                return None
+            v = _eval(node.operand)
+            if v is None:
+                return None
+            return float(op(v))
+        if isinstance(node, ast.BinOp):
+            op = api._ALLOWED_BINOPS.get(type(node.op))
+            if not op:
+                return None
+            left = _eval(node.left)
+            right = _eval(node.right)
+            if left is None or right is None:
+                return None
+            try:
+                return float(op(left, right))
+            except Exception:
+                return None
+        return None
+
+    result = _eval(tree)
+    if result is None:
+        return None
+    if isinstance(result, float) and (result != result):
+        return None
+    return float(result)
+
+
+def random_term(rng: random.Random, depth: int) -> str:
+    if depth <= 0 or rng.random() < 0.3:
+        if rng.random() < 0.6:
+            return rng.choice(SYMBOLS)
+        return str(rng.choice([0, 1, 2, 0.5, 1.25, 100, 1e3]))
+    left = random_term(rng, depth - 1)
+    right = random_term(rng, depth - 1)
+    op = rng.choice(OPS if depth < 3 else OPS[:4])
+    term = f"{left} {op} {right}"
+    if rng.random() < 0.4:
+        term = f"({term})"
+    if rng.random() < 0.1:
+        term = f"-{term}"
+    return term
+
+
+def synthetic_formulas(count: int, seed: int):
+    rng = random.Random(seed)
+    formulas = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.05:
+            formulas.append(rng.choice(UNSAFE))
+        elif roll < 0.1:
+            formulas.append(f"={rng.uniform(0, 100):.3f}")
+        else:
+            formulas.append("=" + random_term(rng, rng.randint(1, 4)))
+    return formulas
+
+
+EDGE_VALUES = [0, 0.0, -0.0, None, "abc", "nan", "inf", "-inf", 1e308, -1e-308, True]
+
+
+def synthetic_variable_sets(count: int, seed: int):
+    rng = random.Random(seed + 1)
+    sets = []
+    for _ in range(count):
+        variables = {}
+        for name in SYMBOLS:
+            roll = rng.random()
+            if roll < 0.03:
+                variables[name] = rng.choice(EDGE_VALUES)
+            elif roll < 0.9:
+                variables[name] = rng.choice(
+                    [round(rng.uniform(-50, 50), 3), rng.randint(0, 10), f"{rng.uniform(0, 9):.2f}"]
+                )
+        sets.append(variables)
+    return sets
+
+
+def same(a, b) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+def timed(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--formulas", type=int, default=300)
+    parser.add_argument("--sets", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    formulas = synthetic_formulas(args.formulas, args.seed)
+    variable_sets = synthetic_variable_sets(args.sets, args.seed)
+
+    items = [(formula, variables) for formula in formulas for variables in variable_sets]
+    batched = api._eval_numeric_exprs(items)
+    mismatches = 0
+    for (formula, variables), batch_value in zip(items, batched):
+        expected = legacy_eval(formula, variables)
+        scalar_value = api._safe_eval_numeric_expr(formula, variables)
+        if not (same(scalar_value, expected) and same(batch_value, expected)):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"MISMATCH {formula!r} {variables}: {expected} {scalar_value} {batch_value}")
+
+    def run(evaluate):
+        for formula, variables in items:
+            evaluate(formula, variables)
+
+    legacy_ms = timed(lambda: run(legacy_eval), args.repeat)
+    compiled_ms = timed(lambda: run(api._safe_eval_numeric_expr), args.repeat)
+    batch_ms = timed(lambda: api._eval_numeric_exprs(items), args.repeat)
+    # manual update passes already-parsed float variables
+    parsed_items = [
+        (formula, {k: api._try_parse_float(v) for k, v in variables.items()})
+        for formula, variables in items
+    ]
+    parsed_compiled_ms = timed(
+        lambda: [api._safe_eval_numeric_expr(f, v) for f, v in parsed_items], args.repeat
+    )
+    parsed_batch_ms = timed(lambda: api._eval_numeric_exprs(parsed_items), args.repeat)
+    print(
+        f"formulas={len(formulas)} sets={len(variable_sets)} evaluations={len(items)} | "
+        f"parse+walk median={legacy_ms:.0f} ms | compiled median={compiled_ms:.0f} ms | "
+        f"numpy batch median={batch_ms:.0f} ms | float inputs: compiled "
+        f"{parsed_compiled_ms:.0f} ms, numpy batch {parsed_batch_ms:.0f} ms | "
+        f"{'same' if not mismatches else f'{mismatches} MISMATCHES'}"
+    )
+    return 0 if not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Benchmark Work Master typeahead search (FTS5 trigram vs ILIKE) as the master grows.
+
+Builds seeded synthetic work_masters tables (--sizes) in a temporary SQLite DB
+with the search index from `database.WORK_MASTER_FTS_STATEMENTS`, then times
+`crud.get_work_masters(search=...)` and the previous 14-column ILIKE scan for a
+set of typeahead terms. Both must return the same rows (as sets, no limit).
+
+    python scripts/bench_wm_search.py
+    python scripts/bench_wm_search.py --sizes 10000 100000 --repeat 5
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, or_, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from backend import crud, models  # noqa: E402
+from backend.database import (  # noqa: E402
+    WORK_MASTER_FTS_STATEMENTS,
+    WORK_MASTER_SEARCH_COLUMNS,
+)
+
+DISCIPLINES = ["건축", "토목", "기계", "전기", "조경"]
+WORDS = ["콘크리트", "철근", "거푸집", "방수", "미장", "타일", "도장", "배관", "덕트", "케이블"]
+TERMS = ["콘크리", "거푸집", "방수 ", "A12", "B3-", "25-24", "철근 가공", "없는검색어"]
+
+
+def synthetic_rows(count: int, seed: int):
+    rng = random.Random(seed)
+    for row_id in range(1, count + 1):
+        word = rng.choice(WORDS)
+        yield {
+            "id": row_id,
+            "discipline": rng.choice(DISCIPLINES),
+            "cat_large_code": f"{rng.choice('ABCDE')}{rng.randint(1, 40):02d}",
+            "cat_large_desc": f"{word} 공사",
+            "cat_mid_code": f"{rng.randint(1, 99):02d}",
+            "cat_mid_desc": f"{word} {rng.choice(['가공', '설치', '운반', '타설'])}",
+            "cat_small_code": f"{rng.randint(1, 999):03d}",
+            "cat_small_desc": rng.choice(WORDS) + f" {rng.randint(1, 500)}",
+            "attr1_code": f"{rng.randint(1, 9)}",
+            "attr1_spec": f"{rng.randint(18, 40)}-{rng.randint(18, 30)}-{rng.choice([80, 120, 150])}",
+            "attr2_code": None,
+            "attr2_spec": f"THK {rng.randint(5, 300)}mm" if rng.random() < 0.5 else None,
+            "attr3_code": None,
+            "attr3_spec": None,
+            "work_master_code": f"{rng.choice('ABCDE')}{rng.randint(1, 40)}-{row_id:06d}",
+        }
+
+
+def build_db(path: Path, count: int, seed: int):
+    engine = create_engine(f"sqlite:///{path.as_posix()}")
+    models.Base.metadata.tables["work_masters"].create(bind=engine)
+    with engine.begin() as conn:
+        for stmt in WORK_MASTER_FTS_STATEMENTS:
+            conn.execute(text(stmt))
+    columns = ["id", *WORK_MASTER_SEARCH_COLUMNS]
+    insert_sql = text(
+        f"INSERT INTO work_masters ({', '.join(columns)}) "
+        f"VALUES ({', '.join(':' + col for col in columns)})"
+    )
+    with engine.begin() as conn:
+        conn.execute(insert_sql, list(synthetic_rows(count, seed)))
+    return engine
+
+
+def ilike_ids(db, term: str, limit=None):
+    query = db.query(models.WorkMaster).filter(
+        or_(
+            *(
+                getattr(models.WorkMaster, column).ilike(f"%{term}%")
+                for column in WORK_MASTER_SEARCH_COLUMNS
+            )
+        )
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return [wm.id for wm in query]
+
+
+def timed(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            engine = build_db(Path(tmp) / f"wm_{size}.db", size, args.seed)
+            db = sessionmaker(bind=engine)()
+            fts_ms = []
+            ilike_ms = []
+            for term in TERMS:
+                expected = set(ilike_ids(db, term))
+                actual = {wm.id for wm in crud.get_work_masters(db, limit=size, search=term)}
+                if expected != actual:
+                    ok = False
+                    print(f"size={size} term={term!r}: MISMATCH {len(expected)} != {len(actual)}")
+                fts_ms.append(timed(lambda: crud.get_work_masters(db, search=term), args.repeat))
+                ilike_ms.append(
+                    timed(
+                        lambda: ilike_ids(db, term, crud.WORK_MASTER_SEARCH_DEFAULT_LIMIT),
+                        args.repeat,
+                    )
+                )
+            db.close()
+            engine.dispose()
+            print(
+                f"rows={size} terms={len(TERMS)} "
+                f"fts median={statistics.median(fts_ms):.1f} ms max={max(fts_ms):.1f} ms | "
+                f"ilike median={statistics.median(ilike_ms):.1f} ms max={max(ilike_ms):.1f} ms"
+            )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Rebuild or verify calc_result_summary in project DBs.
+
+    python scripts/calc_result_summary.py check            # every DB in backend/pjt_db
+    python scripts/calc_result_summary.py rebuild test1    # one project (name or file)
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend import project_db  # noqa: E402
+
+
+def iter_db_paths(identifiers):
+    if identifiers:
+        for identifier in identifiers:
+            yield project_db.resolve_project_db_path(identifier)
+        return
+    yield from sorted(project_db.PROJECT_DB_DIR.glob("*.db"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["rebuild", "check"])
+    parser.add_argument("projects", nargs="*", help="project identifiers (default: all)")
+    args = parser.parse_args()
+
+    failed = False
+    for db_path in iter_db_paths(args.projects):
+        project_db.ensure_extra_tables(db_path)
+        conn = sqlite3.connect(db_path.as_posix())
+        try:
+            cursor = conn.cursor()
+            if args.command == "rebuild":
+                rows = project_db.rebuild_calc_result_summary(cursor)
+                conn.commit()
+                print(f"{db_path.name}: rebuilt {rows} summary rows")
+            else:
+                report = project_db.check_calc_result_summary(cursor)
+                failed = failed or not report["ok"]
+                status = "ok" if report["ok"] else "MISMATCH"
+                print(f"{db_path.name}: {status}")
+                if not report["ok"]:
+                    print(json.dumps(report, ensure_ascii=False, indent=2))
+        finally:
+            conn.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
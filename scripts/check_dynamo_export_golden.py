@@ -0,0 +1,101 @@
+"""Check the Dynamo JSON export byte for byte against a committed golden file.
+
+    python scripts/check_dynamo_export_golden.py                    # fixture vs golden, exit 1 on drift
+    python scripts/check_dynamo_export_golden.py --update           # rewrite the golden file
+    python scripts/check_dynamo_export_golden.py --project test1    # a local project DB instead
+
+By default the export is rendered from the seeded synthetic project DB built by
+dynamo_export_fixture.py, so the committed golden (golden/dynamo_export_fixture.json)
+can be checked from a clean checkout. With --project the project DB is copied to
+a temp dir and migrated there (the original file is never opened for writing);
+its golden file is local (create it with --update).
+
+Rendering uses `_dynamo_export_stream`, the same chunks the export endpoint
+streams and caches. `exported_at` is the only value that changes between runs;
+it is replaced with a fixed stamp before comparing.
+"""
+
+import argparse
+import re
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend import api, project_db  # noqa: E402
+from dynamo_export_fixture import build_fixture_db  # noqa: E402
+
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+EXPORTED_AT_PATTERN = re.compile(rb'"exported_at":"[^"]*"')
+EXPORTED_AT_FIXED = b'"exported_at":"1970-01-01T00:00:00"'
+
+
+FIXTURE_PROJECT = "fixture"
+
+
+def render_export(project: str) -> bytes:
+    with tempfile.TemporaryDirectory() as tmp:
+        if project == FIXTURE_PROJECT:
+            db_path = build_fixture_db(Path(tmp) / "fixture.db")
+        else:
+            source = project_db.resolve_project_db_path(project)
+            db_path = Path(tmp) / source.name
+            shutil.copyfile(source, db_path)
+            project_db.ensure_extra_tables(db_path)
+        db = project_db.get_project_sessionmaker(db_path)()
+        try:
+            _, chunks = api._dynamo_export_stream(project, db)
+            body = b"".join(chunks)
+        finally:
+            db.close()
+            project_db.dispose_project_engine(db_path)
+    body, count = EXPORTED_AT_PATTERN.subn(EXPORTED_AT_FIXED, body, count=1)
+    if count != 1:
+        raise SystemExit("export has no exported_at stamp to normalize")
+    return body
+
+
+def first_difference(expected: bytes, actual: bytes) -> int:
+    for offset, (a, b) in enumerate(zip(expected, actual)):
+        if a != b:
+            return offset
+    return min(len(expected), len(actual))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--project",
+        default=FIXTURE_PROJECT,
+        help="project identifier or .db file name (default: the synthetic fixture DB)",
+    )
+    parser.add_argument("--golden", help="golden file (default: scripts/golden/dynamo_export_<project>.json)")
+    parser.add_argument("--update", action="store_true", help="rewrite the golden file")
+    args = parser.parse_args()
+
+    golden = Path(args.golden) if args.golden else GOLDEN_DIR / f"dynamo_export_{Path(args.project).stem}.json"
+    body = render_export(args.project)
+    if args.update:
+        golden.parent.mkdir(parents=True, exist_ok=True)
+        golden.write_bytes(body)
+        print(f"{golden}: written ({len(body)} bytes)")
+        return 0
+
+    expected = golden.read_bytes()
+    if body == expected:
+        print(f"{golden.name}: ok ({len(body)} bytes)")
+        return 0
+    offset = first_difference(expected, body)
+    print(
+        f"{golden.name}: MISMATCH at byte {offset} "
+        f"(golden {len(expected)} bytes, export {len(body)} bytes)"
+    )
+    print(f"golden: {expected[max(0, offset - 80):offset + 80]!r}")
+    print(f"export: {body[max(0, offset - 80):offset + 80]!r}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Check the streaming xlsx import readers against the previous parsing.
+
+    python scripts/check_xlsx_import_parity.py                  # synthetic workbooks
+    python scripts/check_xlsx_import_parity.py wm.xlsx db.xlsx  # plus real files
+
+For every workbook:
+- the WM upload frame (`_read_excel_str_frame`, header row 4) with the openpyxl
+  path and, when installed, the calamine engine must equal
+  `pd.read_excel(..., header=3, dtype=str)` (the synthetic sheet includes date,
+  time and duration cells);
+- if it has a Report_WM sheet, `_read_xlsx_sheet_values(..., data_only=False)`
+  must match the full-load `ws.cell(row, col)` values the importer used before.
+"""
+
+import argparse
+import datetime
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+from openpyxl import Workbook, load_workbook  # noqa: E402
+
+from backend import api  # noqa: E402
+
+
+def synthetic_wm_upload() -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "WM 마스터"
+    ws.append(["B-note Work Master"])
+    ws.append([])
+    ws.append(["작성일", datetime.date(2024, 5, 1)])
+    ws.append(["공종", "대분류코드", "대분류명", "중분류코드", "규격", "단위", "수량", "비고"])
+    ws.append(["건축", "A01", "콘크리트 공사", 10, "25-24-150", "M3", 1.5, None])
+    ws.append(["토목", "B02", None, 10.0, "NA", "㎡", 3, True])
+    ws.append([])  # blank row inside the data
+    ws.append(["기계", "C03", "배관", "0012", " 앞뒤 공백 ", "EA", -0.25, "=A5&B5"])
+    ws.append(["전기", "D04", "", 1e20, "#N/A", "M", datetime.datetime(2024, 1, 2, 3, 4), "N/A"])
+    # time / duration cells: durations must read as str(timedelta), e.g. "5:00:00"
+    ws.append(["설비", "E05", datetime.time(5, 30), datetime.timedelta(hours=5),
+               datetime.timedelta(hours=30, minutes=3, seconds=4.5), "S", datetime.time(0, 0),
+               datetime.timedelta(hours=-1)])
+    ws.append(["조경", "F06", datetime.time(23, 59, 59, 500000), datetime.timedelta(0),
+               datetime.datetime(2024, 1, 2, 3, 4, 5, 250000), "S", datetime.date(2024, 2, 29),
+               datetime.timedelta(days=2)])
+    for row in ws.iter_rows(min_row=ws.max_row - 1):
+        for cell in row:
+            if isinstance(cell.value, datetime.timedelta):
+                cell.number_format = "[h]:mm:ss"
+    ws.append([None, None, None, None, None, None, None, "끝"])
+    ws.append([])
+    ws.append([])  # trailing blank rows
+    ws["J20"] = None
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def synthetic_report_wm() -> bytes:
+    wb = Workbook()
+    wb.active.title = "SUMMARY"
+    ws = wb.create_sheet("Report_WM")
+    ws.append(["Standard Item", "WM Code", "Gauge", "Spec", "기타의견", "Work Master"])
+    ws.append(["벽체", "WM-001", "a ", "=\"규격\"&1", "검토 필요", "A\nB"])
+    ws.append(["슬래브", "WM-002", None, 250, None, None])
+    ws.append([])
+    ws.append([None, " WM-003 ", "B", None, "", None])
+    ws["E9"] = "떨어진 셀"
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def check_wm_upload_frame(name: str, contents: bytes) -> bool:
+    try:
+        expected = pd.read_excel(io.BytesIO(contents), header=3, dtype=str)
+    except Exception as exc:
+        print(f"{name}: skipped, the previous parser cannot read it ({exc})")
+        return True
+    engines = ["openpyxl"] + ([api._xlsx_fast_engine()] if api._xlsx_fast_engine() else [])
+    ok = True
+    for engine in engines:
+        actual = api._read_excel_str_frame(contents, header=3, engine=engine)
+        same = expected.equals(actual) and list(expected.columns) == list(actual.columns)
+        ok = ok and same
+        print(f"{name}: WM upload frame [{engine}] {'ok' if same else 'MISMATCH'}")
+        if not same:
+            print("expected:\n", expected.head(20), "\nactual:\n", actual.head(20))
+    return ok
+
+
+def check_report_wm(name: str, contents: bytes) -> bool:
+    try:
+        wb = load_workbook(io.BytesIO(contents), data_only=False)
+    except Exception:
+        return True
+    if "Report_WM" not in wb.sheetnames:
+        return True
+    ws = wb["Report_WM"]
+    rows = api._read_xlsx_sheet_values(contents, "Report_WM", data_only=False)
+    ok = True
+    for r in range(1, int(ws.max_row or 1) + 1):
+        values = rows[r - 1] if r - 1 < len(rows) else ()
+        for c in range(1, int(ws.max_column or 0) + 1):
+            expected = ws.cell(row=r, column=c).value
+            actual = values[c - 1] if c <= len(values) else None
+            if expected != actual:
+                ok = False
+                print(f"{name}: Report_WM {r},{c}: {expected!r} != {actual!r}")
+    print(f"{name}: Report_WM rows {'ok' if ok else 'MISMATCH'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="additional .xlsx files to check")
+    args = parser.parse_args()
+
+    workbooks = [
+        ("synthetic WM upload", synthetic_wm_upload()),
+        ("synthetic Report_WM", synthetic_report_wm()),
+    ]
+    workbooks += [(path, Path(path).read_bytes()) for path in args.files]
+
+    ok = True
+    for name, contents in workbooks:
+        ok = check_wm_upload_frame(name, contents) and ok
+        ok = check_report_wm(name, contents) and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""Seeded synthetic project DB for the Dynamo export scripts.
+
+`build_fixture_db(path, entries)` writes a small, fully deterministic project DB:
+StandardItem/FamilyListItem trees, assignments, selected WorkMasters,
+calc_dictionary symbols, buildings, a pjt_abbr and `entries` cart entries.
+Cart entries are stored as legacy payload JSON (like a DB from before the
+cart_entry_* link tables) and are folded by `project_db.ensure_extra_tables`,
+so the fixture exercises the migrations as well as the export. Values include
+the awkward cases the export has to handle: unknown and string ids, empty
+lists, quotes/backslashes/control characters in names and numeric formulas.
+
+Used by check_dynamo_export_golden.py and bench_dynamo_export.py so neither
+needs a real project DB (those are not in the repository).
+"""
+
+import json
+import random
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from backend import models, project_db  # noqa: E402
+
+FIXTURE_SEED = 20240601
+FIXTURE_CREATED_AT = "2024-06-01T09:00:00"
+
+_REVIT_TYPES = [
+    "Basic Wall: 내벽 200",
+    "Basic Wall: 외벽 \"CW\" 250",
+    "Floor: 슬래브 T=150",
+    "Ceiling: 천장\\석고보드",
+    "Door: D1 900x2100",
+    "Window: W-3\t(이중창)",
+    "  Column: C1 600x600  ",
+    "Beam: G1",
+    "Pipe:\x01배관",
+    "",
+]
+_FORMULAS = ["L*H", "A", "L*2+0.5", "(W+H)*2*L", "", None, 12.5, 3]
+
+
+def _seed_reference_rows(cursor: sqlite3.Cursor, rng: random.Random) -> list:
+    """Insert trees, assignments, WorkMasters and symbols; returns (aid, sid) pairs."""
+
+    cursor.execute(
+        "INSERT INTO project_metadata (key, value, pjt_abbr, pjt_description) VALUES (?, ?, ?, ?)",
+        ("project", "synthetic", "SYN", "Dynamo export fixture"),
+    )
+    for name in ("101동", "102동", "부속동"):
+        cursor.execute(
+            "INSERT INTO building_list (name, created_at) VALUES (?, ?)",
+            (name, FIXTURE_CREATED_AT),
+        )
+
+    # StandardItem: GWM 루트 > 중분류 > SWM 항목 (+ derive_from 파생 항목)
+    leaf_sids = []
+    for root_no in range(1, 4):
+        cursor.execute(
+            "INSERT INTO standard_items (name, type, parent_id, derive_from) VALUES (?, 'GWM', NULL, NULL)",
+            (f"{root_no:02d} 공종{root_no}",),
+        )
+        root_id = cursor.lastrowid
+        for mid_no in range(1, 4):
+            cursor.execute(
+                "INSERT INTO standard_items (name, type, parent_id, derive_from) VALUES (?, 'GWM', ?, NULL)",
+                (f"{root_no:02d}.{mid_no} 세부{mid_no}", root_id),
+            )
+            mid_id = cursor.lastrowid
+            for leaf_no in range(1, 4):
+                cursor.execute(
+                    "INSERT INTO standard_items (name, type, parent_id, derive_from) VALUES (?, 'SWM', ?, NULL)",
+                    (f"항목 {root_no}-{mid_no}-{leaf_no}", mid_id),
+                )
+                leaf_sids.append(cursor.lastrowid)
+    for source_sid in leaf_sids[::4]:
+        cursor.execute(
+            "INSERT INTO standard_items (name, type, parent_id, derive_from) "
+            "SELECT name || ' (파생)', type, parent_id, id FROM standard_items WHERE id = ?",
+            (source_sid,),
+        )
+        leaf_sids.append(cursor.lastrowid)
+
+    # FamilyListItem: 카테고리 루트 > 표준타입 > 패밀리
+    family_ids = []
+    for root_no, root_name in enumerate(("건축", "구조", "마감"), start=1):
+        cursor.execute(
+            "INSERT INTO family_list (name, item_type, parent_id, sequence_number, created_at) "
+            "VALUES (?, 'CATEGORY', NULL, ?, ?)",
+            (root_name, str(root_no), FIXTURE_CREATED_AT),
+        )
+        root_id = cursor.lastrowid
+        for type_no in range(1, 3):
+            # 번호가 이름에 붙은 옛 형식과 sequence_number 형식을 섞는다
+            name, seq = (
+                (f"{root_no}.{type_no} 표준타입{type_no}", None)
+                if type_no % 2
+                else (f"표준타입{type_no}", f"{root_no}.{type_no}")
+            )
+            cursor.execute(
+                "INSERT INTO family_list (name, item_type, parent_id, sequence_number, created_at) "
+                "VALUES (?, 'STANDARD_TYPE', ?, ?, ?)",
+                (name, root_id, seq, FIXTURE_CREATED_AT),
+            )
+            type_id = cursor.lastrowid
+            for family_no in range(1, 4):
+                cursor.execute(
+                    "INSERT INTO family_list (name, item_type, parent_id, sequence_number, created_at) "
+                    "VALUES (?, 'FAMILY', ?, ?, ?)",
+                    (f"F{root_no}{type_no}{family_no} 패밀리", type_id, str(family_no), FIXTURE_CREATED_AT),
+                )
+                family_ids.append(cursor.lastrowid)
+
+    pairs = []
+    for fid in family_ids:
+        for sid in rng.sample(leaf_sids, 3):
+            cursor.execute(
+                "INSERT INTO gwm_family_assign (family_list_id, standard_item_id, assigned_at, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (fid, sid, FIXTURE_CREATED_AT, FIXTURE_CREATED_AT),
+            )
+            pairs.append((cursor.lastrowid, sid))
+        for symbol_no in range(rng.randint(0, 6)):
+            cursor.execute(
+                "INSERT INTO calc_dictionary (family_list_id, calc_code, symbol_key, symbol_value, is_deleted, created_at) "
+                "VALUES (?, ?, ?, ?, 0, ?)",
+                (
+                    fid,
+                    f"C{fid:03d}" if symbol_no % 3 else None,
+                    f"K{symbol_no}",
+                    f"{rng.randint(1, 900) / 10}",
+                    FIXTURE_CREATED_AT,
+                ),
+            )
+
+    for wm_no in range(1, 31):
+        cursor.execute(
+            "INSERT INTO work_masters (discipline, cat_large_desc, cat_mid_desc, cat_small_desc, "
+            "uom1, uom2, work_master_code, gauge) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                ("건축", "구조", "기계")[wm_no % 3],
+                f"대분류{wm_no % 4}",
+                f"중분류{wm_no % 6}",
+                f"소분류 {wm_no}",
+                ("M2", "M3", "EA", None)[wm_no % 4],
+                "M" if wm_no % 5 == 0 else None,
+                f"WM{wm_no:04d}",
+                ("A", "B", None)[wm_no % 3],
+            ),
+        )
+    for sid in leaf_sids:
+        if rng.random() < 0.8:
+            cursor.execute(
+                "INSERT INTO standard_item_work_master_select "
+                "(standard_item_id, work_master_id, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (sid, rng.randint(1, 30), FIXTURE_CREATED_AT, FIXTURE_CREATED_AT),
+            )
+    return pairs
+
+
+def _cart_payloads(pairs: list, count: int, rng: random.Random):
+    buildings = ["101동", "102동", "부속동", " 101동 "]
+    for entry_no in range(count):
+        picked = rng.sample(pairs, 1 if rng.random() < 0.8 else 2)
+        assignment_ids = [aid for aid, _ in picked]
+        standard_item_ids = [sid for _, sid in picked]
+        roll = entry_no % 23
+        if roll == 3:
+            assignment_ids.insert(0, 99_999)  # 삭제된 할당
+        elif roll == 5:
+            assignment_ids = [str(assignment_ids[0]), "x"]
+        elif roll == 7:
+            standard_item_ids = []
+        elif roll == 11:
+            standard_item_ids.insert(0, f" {standard_item_ids[0]} ")
+        elif roll == 13:
+            assignment_ids = []
+        payload = {
+            "revit_types": rng.sample(_REVIT_TYPES, rng.randint(0, 2)),
+            "assignment_ids": assignment_ids,
+            "standard_item_ids": standard_item_ids,
+            "building_names": rng.sample(buildings, rng.randint(0, 2)),
+            "formula": rng.choice(_FORMULAS),
+        }
+        if entry_no % 7 == 0:
+            # camelCase keys from older clients
+            payload = {
+                "revitTypes": payload["revit_types"],
+                "assignmentIds": payload["assignment_ids"],
+                "standardItemIds": payload["standard_item_ids"],
+                "buildingNames": payload["building_names"],
+                "formula": payload["formula"],
+            }
+        microseconds = f".{entry_no % 1000:06d}" if entry_no % 2 else ""
+        created_at = (
+            f"2024-06-{1 + entry_no // 86_400 % 28:02d}T"
+            f"{entry_no // 3600 % 24:02d}:{entry_no // 60 % 60:02d}:{entry_no % 60:02d}{microseconds}"
+        )
+        yield json.dumps(payload, ensure_ascii=False), created_at
+
+
+def build_fixture_db(db_path: Path, entries: int = 300, seed: int = FIXTURE_SEED) -> Path:
+    """Create the fixture DB at db_path (must not exist) and migrate it."""
+
+    engine = create_engine(f"sqlite:///{db_path.as_posix()}")
+    try:
+        models.Base.metadata.create_all(engine)
+    finally:
+        engine.dispose()
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path.as_posix())
+    try:
+        cursor = conn.cursor()
+        for stmt in project_db.EXTRA_TABLE_STATEMENTS:
+            cursor.execute(stmt)
+        pairs = _seed_reference_rows(cursor, rng)
+        cursor.executemany(
+            "INSERT INTO workmaster_cart_entries (payload, created_at) VALUES (?, ?)",
+            _cart_payloads(pairs, entries, rng),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    project_db.ensure_extra_tables(db_path)
+    return db_path